@@ -2,7 +2,7 @@
 pragma solidity 0.6.12;
 pragma experimental ABIEncoderV2;
 
-import {BaseStrategy, VaultAPI} from "@yearnvaults/contracts/BaseStrategy.sol";
+import {BaseStrategy, StrategyParams, VaultAPI} from "@yearnvaults/contracts/BaseStrategy.sol";
 import {SafeERC20, SafeMath, IERC20, Address} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
 import {Math} from "@openzeppelin/contracts/math/Math.sol";
 
@@ -10,6 +10,7 @@ import {Math} from "@openzeppelin/contracts/math/Math.sol";
 import "../interfaces/inverse.sol";
 import "../interfaces/uniswap.sol";
 import "../interfaces/weth.sol";
+import "../interfaces/erc3156.sol";
 
 contract Strategy is BaseStrategy {
     using SafeERC20 for IERC20;
@@ -23,36 +24,150 @@ contract Strategy is BaseStrategy {
 
     uint private constant NO_ERROR = 0;
 
-    IUniswapV2Router02 public router;
-    VaultAPI public delegatedVault;
-
-    ComptrollerInterface private comptroller;
+    IWETH9 internal constant weth = IWETH9(0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2);
+    xInvCoreInterface public constant xInv = xInvCoreInterface(0x65b35d6Eb7006e0e607BC54EB2dFD459923476fE);
+    IERC20 public constant reward = IERC20(0x41D5D79431A913C4aE7d69a668ecdfE5fF9DFB68); // INV
 
+    // per-asset addresses are storage rather than immutables so minimal proxy clones can hold their own
+    VaultAPI public delegatedVault;
     CErc20Interface public cWant;
     CEther public cBorrowed;
-    CErc20Interface public cSupplied; // private market for Yearn, panDola
-    xInvCoreInterface public xInv;
-
     IERC20 public borrowed;
-    IERC20 public reward; // INV
-    IWETH9 internal weth = IWETH9(0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2);
+    uint public minRedeemPrecision;
 
-    address[] private borrowedWantPath;
-    address[] private rewardWantPath;
-    address[] private wethWantPath;
-    address[] private wantWethPath;
-    address[] private claimableMarkets;
+    bool public isOriginal = true;
+
+    IUniswapV2Router02 public router;
+    ComptrollerInterface private comptroller;
+    CErc20Interface public cSupplied; // private market for Yearn, panDola
+    IERC3156FlashLender public flashLender; // full unwinds go through a flash loan when set
 
-    uint public minRedeemPrecision;
     string private strategyName;
     address public inverseGovernance;
-    uint256 public collateralTolerance;
-    uint256 public borrowLimit; // borrow nothing until set
-    uint256 public percentRewardToSell; // sell nothing until set
+
+    // tunables share one slot so a harvest reads them with a single SLOAD
+    struct Config {
+        uint120 borrowLimit; // borrow nothing until set
+        uint64 collateralTolerance;
+        uint64 collateralFactor; // cached comptroller factor of cBorrowed, refreshed by syncCollateralFactor
+        uint8 percentRewardToSell; // sell nothing until set
+    }
+
+    Config private config;
+
+    // delegatedVault share price at the last rebalance, what re-levering earns is estimated from its growth since.
+    // yieldPerSecond is the growth measured up to the checkpoint, it stands in until the share price moves again.
+    struct SharePriceCheckpoint {
+        uint128 pricePerShare;
+        uint64 timestamp;
+        uint64 yieldPerSecond;
+    }
+
+    SharePriceCheckpoint private delegatedCheckpoint;
+
     uint256 internal constant dustLowerBound = 0.01 ether; // threshold for paying off borrowed dust
+    uint256 private constant SECONDS_PER_BLOCK = 13; // turns the market's per block borrow rate into one per second
     uint256 constant public max = type(uint256).max;
 
+    // Oracle prices of one entry point, each fetched on first use and reused by the helpers after
+    struct Context {
+        PriceOracle oracle;
+        uint256 wantPrice;
+        uint256 borrowedPrice;
+        uint256 suppliedPrice;
+        uint256 xInvPrice;
+    }
+
+    // Amounts a deleverage executes, computed up front by _planDeleverage
+    struct DeleveragePlan {
+        uint256 borrowedOwed;
+        uint256 borrowedToRepay;
+        uint256 shares; // delegatedVault shares to withdraw
+        uint256 wantToSwap; // want redeemed from cWant and sold for borrowed
+        uint256 minBorrowedOut;
+    }
+
+    // Everything keepers and monitoring poll, computed in one call
+    struct PositionSnapshot {
+        uint256 targetCollateralFactor;
+        uint256 balanceOfWant;
+        uint256 balanceOfReward;
+        uint256 balanceOfEth;
+        uint256 valueOfCWant;
+        uint256 valueOfCSupplied;
+        uint256 valueOfxInv;
+        uint256 valueOfTotalCollateral;
+        uint256 valueOfBorrowedOwed;
+        uint256 valueOfDelegated;
+        uint256 estimatedTotalAssets;
+        uint256 delegatedAssets;
+        uint256 vaultTotalAssets;
+        uint256 vaultLooseBalance;
+        uint256 vaultPricePerShare;
+        uint256 strategyTotalDebt;
+        uint256 strategyTotalGain;
+        uint256 strategyTotalLoss;
+    }
+
+    event Cloned(address indexed clone);
+
+    // position history for indexers, amounts only, the resulting collateral factor is read from positionSnapshot
+    event Borrowed(uint256 amount, uint256 delegated);
+    event Repaid(uint256 amount, uint256 sharesWithdrawn, uint256 wantSwapped);
+    event DelegatedProfitSold(uint256 borrowedSold, uint256 wantOut);
+    event LendingProfitRedeemed(uint256 wantRedeemed);
+    event RewardSold(uint256 rewardSold, uint256 wantOut);
+    event CollateralSupplied(uint256 cTokenAmount);
+    event CollateralRemoved(uint256 cTokenAmount);
+
     constructor(address _vault, address _cWant, address _cBorrowed, address _delegatedVault, string memory _name) public BaseStrategy(_vault) {
+        _initializeStrategy(_cWant, _cBorrowed, _delegatedVault, _name);
+    }
+
+    function initialize(
+        address _vault,
+        address _strategist,
+        address _rewards,
+        address _keeper,
+        address _cWant,
+        address _cBorrowed,
+        address _delegatedVault,
+        string memory _name
+    ) external {
+        // reverts if already initialized
+        _initialize(_vault, _strategist, _rewards, _keeper);
+        _initializeStrategy(_cWant, _cBorrowed, _delegatedVault, _name);
+    }
+
+    // EIP-1167 minimal proxy sharing this implementation, initialized for another asset in the same transaction
+    function cloneStrategy(
+        address _vault,
+        address _strategist,
+        address _rewards,
+        address _keeper,
+        address _cWant,
+        address _cBorrowed,
+        address _delegatedVault,
+        string memory _name
+    ) external returns (address newStrategy) {
+        require(isOriginal);
+        bytes20 addressBytes = bytes20(address(this));
+
+        assembly {
+            // EIP-1167 bytecode
+            let clone_code := mload(0x40)
+            mstore(clone_code, 0x3d602d80600a3d3981f3363d3d373d3d3d363d73000000000000000000000000)
+            mstore(add(clone_code, 0x14), addressBytes)
+            mstore(add(clone_code, 0x28), 0x5af43d82803e903d91602b57fd5bf30000000000000000000000000000000000)
+            newStrategy := create(0, clone_code, 0x37)
+        }
+
+        Strategy(payable(newStrategy)).initialize(_vault, _strategist, _rewards, _keeper, _cWant, _cBorrowed, _delegatedVault, _name);
+
+        emit Cloned(newStrategy);
+    }
+
+    function _initializeStrategy(address _cWant, address _cBorrowed, address _delegatedVault, string memory _name) internal {
         strategyName = _name;
         inverseGovernance = 0x926dF14a23BE491164dCF93f4c468A50ef659D5B; // Inverse Timelock
 
@@ -61,12 +176,10 @@ contract Strategy is BaseStrategy {
 
         cWant = CErc20Interface(_cWant);
         cBorrowed = CEther(_cBorrowed);
-        xInv = xInvCoreInterface(0x65b35d6Eb7006e0e607BC54EB2dFD459923476fE);
         // TODO temporarily Sushibar
         cSupplied = CErc20Interface(0xD60B06B457bFf7fc38AC5E7eCE2b5ad16B288326);
 
         borrowed = IERC20(delegatedVault.token());
-        reward = IERC20(0x41D5D79431A913C4aE7d69a668ecdfE5fF9DFB68);
 
         require(cWant.underlying() != address(borrowed));
         require(cWant.underlying() == address(want));
@@ -77,21 +190,11 @@ contract Strategy is BaseStrategy {
         require(address(cBorrowed) != address(xInv));
         require(address(cSupplied) != address(xInv));
 
-        if (address(borrowed) == address(weth) || address(want) == address(weth)) {
-            borrowedWantPath = [address(borrowed), address(want)];
-        } else {
-            borrowedWantPath = [address(borrowed), address(weth), address(want)];
-        }
-
-        rewardWantPath = [address(reward), address(weth), address(want)];
-        wethWantPath = [address(weth), address(want)];
-        wantWethPath = [address(want), address(weth)];
-
-        claimableMarkets = [address(cWant), address(cBorrowed), address(cSupplied)];
         comptroller = ComptrollerInterface(cWant.comptroller());
-        comptroller.enterMarkets(claimableMarkets);
+        comptroller.enterMarkets(_claimableMarkets());
+        syncCollateralFactor();
         // 1%
-        collateralTolerance = 0.01 ether;
+        config.collateralTolerance = 0.01 ether;
 
         want.safeApprove(address(cWant), max);
         want.safeApprove(address(router), max);
@@ -116,29 +219,36 @@ contract Strategy is BaseStrategy {
 
     // User portion of the delegated assets in want
     function delegatedAssets() external override view returns (uint256) {
-        uint256 _totalCollateral = valueOfTotalCollateral();
+        Context memory _ctx = _loadContext();
+        uint256 _totalCollateral = _valueOfTotalCollateral(_ctx);
         if (_totalCollateral == 0) {
             return 0;
         }
 
-        uint256 _userDelegated = valueOfDelegated().mul(valueOfCWant()).div(_totalCollateral);
-        return _usdToBase(_userDelegated, cWant, false);
+        uint256 _userDelegated = _valueOfDelegated(_ctx).mul(_valueOfCWant(_ctx)).div(_totalCollateral);
+        return _usdToBase(_userDelegated, _wantPrice(_ctx), false);
     }
 
     function estimatedTotalAssets() public view override returns (uint256) {
-        return balanceOfWant().add(_usdToBase(valueOfCWant().add(valueOfDelegated()).sub(valueOfBorrowedOwed()), cWant, false));
+        Context memory _ctx = _loadContext();
+        return balanceOfWant().add(_usdToBase(_valueOfCWant(_ctx).add(_valueOfDelegated(_ctx)).sub(_valueOfBorrowedOwed(_ctx)), _wantPrice(_ctx), false));
     }
 
     function prepareReturn(uint256 _debtOutstanding) internal override returns (uint256 _profit, uint256 _loss, uint256 _debtPayment){
+        // every path that sizes a deleverage from the factor syncs it first
+        syncCollateralFactor();
+        Context memory _ctx = _loadContext();
         uint256 _looseBalance = balanceOfWant();
-        _sellDelegatedProfits();
-        _sellLendingProfits();
+        _sellDelegatedProfits(_ctx);
+        _sellLendingProfits(_ctx);
 
-        comptroller.claimComp(address(this), claimableMarkets);
-        if (percentRewardToSell > 0) {
-            uint256 _rewardsToSell = balanceOfReward().mul(percentRewardToSell).div(100);
+        comptroller.claimComp(address(this), _claimableMarkets());
+        uint256 _percentRewardToSell = config.percentRewardToSell;
+        if (_percentRewardToSell > 0) {
+            uint256 _rewardsToSell = balanceOfReward().mul(_percentRewardToSell).div(100);
             if (_rewardsToSell > 1e9) {
-                router.swapExactTokensForTokens(_rewardsToSell, 0, rewardWantPath, address(this), now);
+                uint256[] memory _amounts = router.swapExactTokensForTokens(_rewardsToSell, 0, _toArray(address(reward), address(weth), address(want)), address(this), now);
+                emit RewardSold(_rewardsToSell, _amounts[2]);
             }
         }
 
@@ -149,7 +259,7 @@ contract Strategy is BaseStrategy {
 
         if (_debtOutstanding > 0) {
             uint256 _before = balanceOfWant();
-            _loss = _redeem(_debtOutstanding);
+            _loss = _redeem(_debtOutstanding, _ctx);
             uint256 _after = balanceOfWant();
             _debtPayment = Math.min(_debtOutstanding, _after.sub(_before));
             if (_loss > 0) {
@@ -162,7 +272,13 @@ contract Strategy is BaseStrategy {
         assert(cWant.mint(balanceOfWant()) == NO_ERROR);
         assert(xInv.mint(balanceOfReward()) == NO_ERROR);
 
-        _rebalance();
+        // a harvest already synced the factor in prepareReturn or liquidatePosition, a tend syncs it here
+        if (msg.sig != this.harvest.selector) {
+            syncCollateralFactor();
+        }
+        _rebalance(_loadContext());
+        uint256 _pricePerShare = delegatedVault.pricePerShare();
+        delegatedCheckpoint = SharePriceCheckpoint(uint128(_pricePerShare), uint64(block.timestamp), uint64(_yieldSince(delegatedCheckpoint, _pricePerShare)));
     }
 
     function liquidatePosition(uint256 _amountNeeded) internal override returns (uint256 _liquidatedAmount, uint256 _loss){
@@ -171,7 +287,8 @@ contract Strategy is BaseStrategy {
             if (_amountNeeded == max) {
                 _looseBalance = 0;
             }
-            _loss = _redeem(_amountNeeded.sub(_looseBalance));
+            syncCollateralFactor();
+            _loss = _redeem(_amountNeeded.sub(_looseBalance), _loadContext());
             _liquidatedAmount = Math.min(_amountNeeded, balanceOfWant());
         } else {
             _liquidatedAmount = _amountNeeded;
@@ -179,17 +296,45 @@ contract Strategy is BaseStrategy {
     }
 
     function liquidateAllPositions() internal override returns (uint256 _amountFreed){
+        if (address(flashLender) != address(0)) {
+            _flashUnwind();
+        }
         (_amountFreed,) = liquidatePosition(max);
     }
 
     function tendTrigger(uint256 callCostInWei) public override virtual view returns (bool) {
-        uint256 _valueCollateral = valueOfTotalCollateral();
+        Context memory _ctx = _loadContext();
+        uint256 _valueCollateral = _valueOfTotalCollateral(_ctx);
         if (harvestTrigger(callCostInWei) || _valueCollateral == 0) {
             return false;
         }
 
-        uint256 currentCF = valueOfBorrowedOwed().mul(1e18).div(_valueCollateral);
-        return targetCollateralFactor().sub(collateralTolerance) > currentCF || currentCF > targetCollateralFactor().add(collateralTolerance);
+        // comptroller changed the factor since the last sync, tend to pick it up
+        Config memory _config = config;
+        if (_marketCollateralFactor(address(cBorrowed)) != _config.collateralFactor) {
+            return true;
+        }
+
+        uint256 _usdBorrowOwed = _valueOfBorrowedOwed(_ctx);
+        uint256 currentCF = _usdBorrowOwed.mul(1e18).div(_valueCollateral);
+
+        // within tolerance of the comptroller factor, tend whatever it costs
+        if (currentCF.add(_config.collateralTolerance) >= _config.collateralFactor) {
+            return true;
+        }
+
+        uint256 _target = uint256(_config.collateralFactor).sub(0.1 ether);
+        if (_target.sub(_config.collateralTolerance) <= currentCF && currentCF <= _target.add(_config.collateralTolerance)) {
+            return false;
+        }
+
+        // outside the band, tend when what it gains before the next harvest rebalances anyway covers the call
+        (uint256 _usdAdjustment, bool _neg) = _usdBorrowAdjustment(_valueCollateral, _usdBorrowOwed, _target, _usdToBase(_config.borrowLimit, _borrowedPrice(_ctx), true));
+        if (_usdAdjustment == 0) {
+            return false;
+        }
+        uint256 _usdGain = _usdTendGain(_usdAdjustment, _neg, currentCF, _target, _config.collateralFactor);
+        return _usdToBase(_usdGain, _wantPrice(_ctx), false) >= ethToWant(callCostInWei);
     }
 
     function prepareMigration(address _newStrategy) internal override {
@@ -202,7 +347,7 @@ contract Strategy is BaseStrategy {
 
     function ethToWant(uint256 _amtInWei) public view override returns (uint256) {
         if (_amtInWei > 0) {
-            return router.getAmountsOut(_amtInWei, wethWantPath)[1];
+            return router.getAmountsOut(_amtInWei, _toArray(address(weth), address(want)))[1];
         }
     }
 
@@ -214,93 +359,230 @@ contract Strategy is BaseStrategy {
     //
 
     function targetCollateralFactor() public view returns (uint256) {
-        (bool isListed, uint256 collateralFactorMantissa, bool isComped) = comptroller.markets(address(cBorrowed));
-        return collateralFactorMantissa.sub(0.1 ether);
+        return uint256(config.collateralFactor).sub(0.1 ether);
+    }
+
+    function collateralTolerance() external view returns (uint256) {
+        return config.collateralTolerance;
     }
 
-    // repay borrowed position to free up collateral.
-    function _freeUpCollateral(uint256 _usdCollatNeeded, bool force) internal {
-        bool _needMax = _usdCollatNeeded == max;
+    function borrowLimit() external view returns (uint256) {
+        return config.borrowLimit;
+    }
 
-        cBorrowed.accrueInterest();
+    function percentRewardToSell() external view returns (uint256) {
+        return config.percentRewardToSell;
+    }
 
-        uint256 _usdCollatFree;
-        if (!force) {
-            _usdCollatFree = _usdCollateralFree();
+    // permissionless so anyone can refresh the cache after Inverse changes the market's collateral factor
+    function syncCollateralFactor() public {
+        config.collateralFactor = uint64(_marketCollateralFactor(address(cBorrowed)));
+    }
+
+    // Value of moving _usdAdjustment of debt back to target, until the next harvest would move it anyway. Re-levering
+    // earns the delegated yield over the borrow rate on it, deleveraging saves the opposite spread and avoids part of
+    // the liquidation penalty, weighted by how much of the margin between target and comptroller factor is used up.
+    function _usdTendGain(uint256 _usdAdjustment, bool _neg, uint256 _currentCF, uint256 _target, uint256 _collateralFactor) internal view returns (uint256 _usdGain){
+        uint256 _sinceReport = block.timestamp.sub(vault.strategies(address(this)).lastReport);
+        uint256 _horizon = maxReportDelay > _sinceReport ? maxReportDelay - _sinceReport : 0;
+
+        uint256 _yieldRate = _yieldSince(delegatedCheckpoint, delegatedVault.pricePerShare());
+        uint256 _borrowRate = cBorrowed.borrowRatePerBlock().div(SECONDS_PER_BLOCK);
+        uint256 _spread;
+        if (!_neg && _yieldRate > _borrowRate) {
+            _spread = _yieldRate - _borrowRate;
+        } else if (_neg && _borrowRate > _yieldRate) {
+            _spread = _borrowRate - _yieldRate;
+        }
+        _usdGain = _usdAdjustment.mul(_spread).mul(_horizon).div(1e18);
+
+        // a lowered borrow limit deleverages below target, there is no risk to weigh then
+        if (_neg && _currentCF > _target) {
+            uint256 _marginUsed = Math.min(_currentCF - _target, _collateralFactor.sub(_target)).mul(1e18).div(_collateralFactor.sub(_target));
+            _usdGain = _usdGain.add(_usdAdjustment.mul(_liquidationPenalty()).div(1e18).mul(_marginUsed).div(1e18));
         }
-        if (_usdCollatNeeded > _usdCollatFree) {
-            uint256 _usdMoreNeeded = _usdCollatNeeded.sub(_usdCollatFree);
-            uint256 _usdBorrowToRepay = _needMax ? max : _usdMoreNeeded.mul(targetCollateralFactor()).div(1e18);
-            uint256 _borrowed = _usdToBase(_usdBorrowToRepay, cBorrowed, false);
-            uint256 _shares = Math.min(_borrowedToShares(_borrowed), delegatedVault.balanceOf(address(this)));
+    }
 
-            uint256 _borrowedWithdrawn = delegatedVault.withdraw(_shares);
+    // collateral a liquidator seizes on top of the debt it repays, 1e18 is 100%
+    function _liquidationPenalty() internal view returns (uint256){
+        uint256 _incentive = comptroller.liquidationIncentiveMantissa();
+        return _incentive > 1e18 ? _incentive - 1e18 : 0;
+    }
 
-            weth.withdraw(_borrowedWithdrawn);
-            cBorrowed.repayBorrow{value : balanceOfEth()}();
+    // share price growth of delegatedVault per second since _checkpoint, 1e18 is 100%. The vault only moves its share
+    // price when it reports, until then the rate measured at the checkpoint is used.
+    function _yieldSince(SharePriceCheckpoint memory _checkpoint, uint256 _pricePerShare) internal view returns (uint256){
+        if (_checkpoint.timestamp == 0 || block.timestamp <= _checkpoint.timestamp || _pricePerShare <= _checkpoint.pricePerShare) {
+            return _checkpoint.yieldPerSecond;
+        }
+        return _pricePerShare.sub(_checkpoint.pricePerShare).mul(1e18).div(_checkpoint.pricePerShare).div(block.timestamp - _checkpoint.timestamp);
+    }
 
-            uint256 _usdBorrowedRepaid = _usdToBase(_borrowedWithdrawn, cBorrowed, true);
-            uint256 _usdCollatFreedUp = _usdBorrowedRepaid.mul(1e18).div(targetCollateralFactor());
-            if (_usdCollatNeeded > _usdCollatFreedUp) {
-                _usdMoreNeeded = _needMax ? max : _usdCollatNeeded.sub(_usdCollatFreedUp);
-                _repayWithWant(_usdMoreNeeded, force);
+    function _marketCollateralFactor(address _cToken) internal view returns (uint256 _collateralFactorMantissa) {
+        (, _collateralFactorMantissa,) = comptroller.markets(_cToken);
+    }
+
+    // repay borrowed position to free up collateral, planned in one pass and then executed
+    function _freeUpCollateral(uint256 _usdCollatNeeded, bool force, Context memory _ctx) internal {
+        _accrueInterest(cBorrowed);
+
+        DeleveragePlan memory _plan = _planDeleverage(_usdCollatNeeded, force, _ctx);
+        if (_plan.borrowedToRepay == 0) {
+            return;
+        }
+
+        uint256 _repaid;
+        if (_plan.shares > 0) {
+            delegatedVault.withdraw(_plan.shares);
+            _repaid = _repayBorrowed(_plan.borrowedOwed);
+        }
+
+        // the vault withdraw can return less than planned, redeem no more than is free after its repayment
+        uint256 _wantToSwap;
+        if (_plan.wantToSwap > 0) {
+            _wantToSwap = Math.min(_plan.wantToSwap, _usdToBase(_usdCollateralFree(_ctx), _wantPrice(_ctx), false));
+            if (_wantToSwap > minRedeemPrecision && cWant.redeemUnderlying(_wantToSwap) == NO_ERROR) {
+                uint256 _minBorrowedOut = _plan.minBorrowedOut.mul(_wantToSwap).div(_plan.wantToSwap);
+                router.swapExactTokensForTokens(_wantToSwap, _minBorrowedOut, _toArray(address(want), address(weth)), address(this), now);
+                _repaid = _repaid.add(_repayBorrowed(_plan.borrowedOwed.sub(_repaid)));
+            } else {
+                _wantToSwap = 0;
             }
         }
+        if (_repaid > 0) {
+            emit Repaid(_repaid, _plan.shares, _wantToSwap);
+        }
     }
 
-    // if unwinding delegatedVault was not enough (delegatedVault pps lowered, or market interest), start trading want -> eth to free up collateral
-    function _repayWithWant(uint256 _usdMoreNeeded, bool force) internal {
-        bool _needMax = _usdMoreNeeded == max;
+    // exact delegated shares and want to swap that cover the repayment, from one snapshot of the position
+    function _planDeleverage(uint256 _usdCollatNeeded, bool force, Context memory _ctx) internal view returns (DeleveragePlan memory _plan){
+        uint256 _target = targetCollateralFactor();
+        (, _plan.borrowedOwed) = _accountSnapshot(cBorrowed);
+        uint256 _usdBorrowOwed = _usdToBase(_plan.borrowedOwed, _borrowedPrice(_ctx), true);
+        uint256 _usdTotalCollat = _valueOfTotalCollateral(_ctx);
+
         uint256 _usdCollatFree;
         if (!force) {
-            _usdCollatFree = _usdCollateralFree();
+            _usdCollatFree = _collateralFree(_usdTotalCollat, _usdBorrowOwed, _target);
+        }
+        if (_usdCollatFree >= _usdCollatNeeded) {
+            return _plan;
         }
-        if (_usdMoreNeeded > _usdCollatFree) {
-            uint256 _usdToRepay = _needMax ? max : _usdMoreNeeded.sub(_usdCollatFree).mul(targetCollateralFactor()).div(1e18);
-            uint256 _borrowedToRepay = _usdToBase(_usdToRepay, cBorrowed, false);
 
+        uint256 _usdToRepay = _usdCollatNeeded == max ? max : _usdCollatNeeded.sub(_usdCollatFree).mul(_target).div(1e18);
+        // if payment would leave borrowed dust, pay everything
+        if (_usdToRepay == max || _usdBorrowOwed < _usdToRepay.add(dustLowerBound)) {
+            _plan.borrowedToRepay = _plan.borrowedOwed;
+        } else {
+            _plan.borrowedToRepay = _usdToBase(_usdToRepay, _borrowedPrice(_ctx), false);
+        }
+        if (_plan.borrowedToRepay == 0) {
+            return _plan;
+        }
 
-            uint256 _borrowedOwed = cBorrowed.borrowBalanceCurrent(address(this));
-            uint256 _usdBorrowedOwed = _usdToBase(_borrowedOwed, cBorrowed, true);
+        // unwind delegatedVault first, then trade want -> eth for what it can't cover (delegatedVault pps lowered, or market interest)
+        uint256 _borrowedFromVault = _planVaultWithdraw(_plan);
+        if (_plan.borrowedToRepay > _borrowedFromVault) {
+            uint256 _usdRepaidFromVault = Math.min(_usdToBase(_borrowedFromVault, _borrowedPrice(_ctx), true), _usdBorrowOwed);
+            uint256 _usdFreeAfterVault = _collateralFree(_usdTotalCollat, _usdBorrowOwed.sub(_usdRepaidFromVault), _target);
+            _planWantSwap(_plan, _plan.borrowedToRepay.sub(_borrowedFromVault), _usdFreeAfterVault, _ctx);
+        }
+    }
 
-            // if payment would leave borrowed dust or payment is lower than borrowed lower bound, pay everything
-            if (dustLowerBound > _usdBorrowedOwed) {
-                _borrowedToRepay = _borrowedOwed;
-            } else {
-                _borrowedToRepay = Math.min(_borrowedOwed, _borrowedToRepay);
-            }
+    function _planVaultWithdraw(DeleveragePlan memory _plan) internal view returns (uint256 _borrowedFromVault){
+        uint256 _sharesHeld = delegatedVault.balanceOf(address(this));
+        uint256 _borrowedDelegated = _sharesToBorrowed(_sharesHeld);
+        if (_plan.borrowedToRepay >= _borrowedDelegated) {
+            _plan.shares = _sharesHeld;
+            _borrowedFromVault = _borrowedDelegated;
+        } else {
+            _plan.shares = _borrowedToShares(_plan.borrowedToRepay);
+            _borrowedFromVault = _plan.borrowedToRepay;
+        }
+    }
 
-            // calculate exact want needed to repay borrowed
-            if (_borrowedToRepay > 0) {
-                uint256 _wantToRepay = router.getAmountsIn(_borrowedToRepay, wantWethPath)[0];
-
-                if (_wantToRepay > minRedeemPrecision) {
-                    cWant.accrueInterest();
-                    _usdToRepay = _usdToBase(_wantToRepay, cWant, true);
-
-                    // make sure we have enough cWant freed to do the redeem
-                    if (_usdCollateralFree() > _usdToRepay && valueOfCWant() > _usdToRepay) {
-                        cWant.redeemUnderlying(_wantToRepay);
-                        router.swapTokensForExactTokens(_borrowedToRepay, balanceOfWant(), wantWethPath, address(this), now);
-                        weth.withdraw(weth.balanceOf(address(this)));
-                        cBorrowed.repayBorrow{value : balanceOfEth()}();
-                    }
-                }
-            }
-        }}
+    function _planWantSwap(DeleveragePlan memory _plan, uint256 _borrowedShort, uint256 _usdCollatFree, Context memory _ctx) internal view {
+        address[] memory _path = _toArray(address(want), address(weth));
+        uint256 _wantToSwap = router.getAmountsIn(_borrowedShort, _path)[0];
+        uint256 _minBorrowedOut = _borrowedShort;
+
+        // redeem no more than the freed collateral, the cWant held and the market's cash
+        uint256 _wantRedeemable = Math.min(Math.min(_usdToBase(_usdCollatFree, _wantPrice(_ctx), false), balanceOfBase(cWant)), cWant.getCash());
+        if (_wantToSwap > _wantRedeemable) {
+            _wantToSwap = _wantRedeemable;
+            _minBorrowedOut = _wantToSwap > 0 ? router.getAmountsOut(_wantToSwap, _path)[1] : 0;
+        }
+
+        if (_wantToSwap > minRedeemPrecision) {
+            _plan.wantToSwap = _wantToSwap;
+            _plan.minBorrowedOut = _minBorrowedOut;
+        }
+    }
+
+    // unwrap all weth and repay up to _maxRepay
+    function _repayBorrowed(uint256 _maxRepay) internal returns (uint256 _repaid){
+        weth.withdraw(weth.balanceOf(address(this)));
+        _repaid = Math.min(balanceOfEth(), _maxRepay);
+        if (_repaid > 0) {
+            cBorrowed.repayBorrow{value : _repaid}();
+        }
+    }
 
-    function _usdCollateralFree() internal returns (uint256 _usdFree){
-        uint256 _usdCollatToMaintain = valueOfBorrowedOwed().mul(1e18).div(targetCollateralFactor());
-        uint256 _usdTotalCollat = valueOfTotalCollateral();
+    function _usdCollateralFree(Context memory _ctx) internal view returns (uint256){
+        return _collateralFree(_valueOfTotalCollateral(_ctx), _valueOfBorrowedOwed(_ctx), targetCollateralFactor());
+    }
+
+    function _collateralFree(uint256 _usdTotalCollat, uint256 _usdBorrowOwed, uint256 _target) internal pure returns (uint256 _usdFree){
+        uint256 _usdCollatToMaintain = _usdBorrowOwed.mul(1e18).div(_target);
         if (_usdTotalCollat > _usdCollatToMaintain) {
             _usdFree = _usdTotalCollat.sub(_usdCollatToMaintain);
         }
     }
 
-    function _redeem(uint256 _wantNeeded) internal returns (uint256 _wantShort){
-        _freeUpCollateral(_usdToBase(_wantNeeded, cWant, true), false);
+    // borrow what is owed, repay cBorrowed in full, then settle the loan from delegatedVault and want in onFlashLoan
+    function _flashUnwind() internal {
+        _accrueInterest(cBorrowed);
+        (, uint256 _borrowedOwed) = _accountSnapshot(cBorrowed);
+        if (_borrowedOwed > 0) {
+            flashLender.flashLoan(IERC3156FlashBorrower(address(this)), address(weth), _borrowedOwed, "");
+        }
+    }
+
+    function onFlashLoan(address _initiator, address _token, uint256 _amount, uint256 _fee, bytes calldata) external returns (bytes32) {
+        require(msg.sender == address(flashLender) && _initiator == address(this));
+        require(_token == address(weth));
 
-        uint256 _wantAllowed = _usdToBase(_usdCollateralFree(), cWant, false);
+        weth.withdraw(_amount);
+        cBorrowed.repayBorrow{value : _amount}();
+
+        if (delegatedVault.balanceOf(address(this)) > 0) {
+            delegatedVault.withdraw(max);
+        }
+
+        // nothing borrowed anymore, so all of cWant is free up to the market's cash
+        uint256 _wantCash = cWant.getCash();
+        if (balanceOfBase(cWant) > _wantCash) {
+            require(cWant.redeemUnderlying(_wantCash) == NO_ERROR);
+        } else {
+            require(cWant.redeem(cWant.balanceOf(address(this))) == NO_ERROR);
+        }
+
+        uint256 _owed = _amount.add(_fee);
+        uint256 _wethHeld = weth.balanceOf(address(this));
+        if (_owed > _wethHeld) {
+            router.swapTokensForExactTokens(_owed.sub(_wethHeld), balanceOfWant(), _toArray(address(want), address(weth)), address(this), now);
+        } else if (_wethHeld > _owed) {
+            router.swapExactTokensForTokens(_wethHeld.sub(_owed), 0, _borrowedWantPath(), address(this), now);
+        }
+
+        weth.approve(address(flashLender), _owed);
+        return keccak256("ERC3156FlashBorrower.onFlashLoan");
+    }
+
+    function _redeem(uint256 _wantNeeded, Context memory _ctx) internal returns (uint256 _wantShort){
+        _freeUpCollateral(_usdToBase(_wantNeeded, _wantPrice(_ctx), true), false, _ctx);
+
+        uint256 _wantAllowed = _usdToBase(_usdCollateralFree(_ctx), _wantPrice(_ctx), false);
         uint256 _wantCash = cWant.getCash();
         uint256 _wantHeld = balanceOfBase(cWant);
 
@@ -317,18 +599,19 @@ contract Strategy is BaseStrategy {
 
 
     // Calculate adjustments on borrowing market to maintain healthy targetCollateralFactor and borrowLimit
-    function _calculateUsdBorrowAdjustment() internal returns (uint256 _usdAdjustment, bool _neg){
-        uint256 _usdTotalCollat = valueOfTotalCollateral();
+    function _calculateUsdBorrowAdjustment(Context memory _ctx) internal view returns (uint256 _usdAdjustment, bool _neg){
+        return _usdBorrowAdjustment(_valueOfTotalCollateral(_ctx), _valueOfBorrowedOwed(_ctx), targetCollateralFactor(), _usdToBase(config.borrowLimit, _borrowedPrice(_ctx), true));
+    }
+
+    function _usdBorrowAdjustment(uint256 _usdTotalCollat, uint256 _usdBorrowOwed, uint256 _target, uint256 _usdBorrowLimit) internal pure returns (uint256 _usdAdjustment, bool _neg){
         _usdTotalCollat = _usdTotalCollat > dustLowerBound ? _usdTotalCollat : 0;
-        uint256 _usdBorrowTarget = _usdTotalCollat.mul(targetCollateralFactor()).div(1e18);
+        uint256 _usdBorrowTarget = _usdTotalCollat.mul(_target).div(1e18);
 
         // enforce borrow limit
-        uint256 _usdBorrowLimit = _usdToBase(borrowLimit, cBorrowed, true);
         if (_usdBorrowTarget > _usdBorrowLimit) {
             _usdBorrowTarget = _usdBorrowLimit;
         }
 
-        uint256 _usdBorrowOwed = valueOfBorrowedOwed();
         if (_usdBorrowOwed > _usdBorrowTarget) {
             _neg = true;
             _usdAdjustment = _usdBorrowOwed.sub(_usdBorrowTarget);
@@ -338,33 +621,34 @@ contract Strategy is BaseStrategy {
     }
 
 
-    function _rebalance() internal {
-        cBorrowed.accrueInterest();
-        (uint256 _usdBorrowAdjustment, bool _neg) = _calculateUsdBorrowAdjustment();
+    function _rebalance(Context memory _ctx) internal {
+        _accrueInterest(cBorrowed);
+        (uint256 _usdBorrowAdjustment, bool _neg) = _calculateUsdBorrowAdjustment(_ctx);
         if (_neg) {
             // undercollateralized, must unwind and repay to free up collateral
             uint256 _usdCollatToFree = _usdBorrowAdjustment.mul(1e18).div(targetCollateralFactor());
-            _freeUpCollateral(_usdCollatToFree, true);
+            _freeUpCollateral(_usdCollatToFree, true, _ctx);
         } else if (_usdBorrowAdjustment > 0) {
             // overcollateralized, can borrow more
-            uint256 _borrowedAdjustment = Math.min(_usdToBase(_usdBorrowAdjustment, cBorrowed, false), cBorrowed.getCash());
+            uint256 _borrowedAdjustment = Math.min(_usdToBase(_usdBorrowAdjustment, _borrowedPrice(_ctx), false), cBorrowed.getCash());
             assert(cBorrowed.borrow(_borrowedAdjustment) == NO_ERROR);
             uint256 _borrowedActual = address(this).balance;
             weth.deposit{value : _borrowedActual}();
             uint256 _wethBalance = weth.balanceOf(address(this));
             delegatedVault.deposit(_wethBalance);
+            emit Borrowed(_borrowedAdjustment, _wethBalance);
         }
     }
 
     // sell profits earned from delegated vault
-    function _sellDelegatedProfits() internal {
-        cBorrowed.accrueInterest();
-        uint256 _valueOfBorrowed = valueOfBorrowedOwed();
-        uint256 _valueOfDelegated = valueOfDelegated();
-
-        if (_valueOfDelegated > _valueOfBorrowed) {
-            uint256 _valueOfProfit = _valueOfDelegated.sub(_valueOfBorrowed);
-            uint256 _amountInShares = _borrowedToShares(_usdToBase(_valueOfProfit, cBorrowed, false));
+    function _sellDelegatedProfits(Context memory _ctx) internal {
+        _accrueInterest(cBorrowed);
+        uint256 _usdBorrowed = _valueOfBorrowedOwed(_ctx);
+        uint256 _usdDelegated = _valueOfDelegated(_ctx);
+
+        if (_usdDelegated > _usdBorrowed) {
+            uint256 _valueOfProfit = _usdDelegated.sub(_usdBorrowed);
+            uint256 _amountInShares = _borrowedToShares(_usdToBase(_valueOfProfit, _borrowedPrice(_ctx), false));
             if (_amountInShares >= delegatedVault.balanceOf(address(this))) {
                 // max uint256 is uniquely set to withdraw everything
                 _amountInShares = max;
@@ -372,18 +656,21 @@ contract Strategy is BaseStrategy {
             uint256 _actualWithdrawn = delegatedVault.withdraw(_amountInShares);
             // sell to want
             if (_actualWithdrawn > 0) {
-                router.swapExactTokensForTokens(_actualWithdrawn, 0, borrowedWantPath, address(this), now);
+                uint256[] memory _amounts = router.swapExactTokensForTokens(_actualWithdrawn, 0, _borrowedWantPath(), address(this), now);
+                emit DelegatedProfitSold(_actualWithdrawn, _amounts[_amounts.length - 1]);
             }
         }
     }
 
-    function _sellLendingProfits() internal {
-        cWant.accrueInterest();
+    function _sellLendingProfits(Context memory _ctx) internal {
+        _accrueInterest(cWant);
         uint256 _debt = vault.strategies(address(this)).totalDebt;
         uint256 _totalAssets = balanceOfBase(cWant);
 
         if (_totalAssets > _debt) {
-            _redeem(_totalAssets.sub(_debt));
+            uint256 _before = balanceOfWant();
+            _redeem(_totalAssets.sub(_debt), _ctx);
+            emit LendingProfitRedeemed(balanceOfWant().sub(_before));
         }
     }
 
@@ -400,43 +687,134 @@ contract Strategy is BaseStrategy {
         return address(this).balance;
     }
 
-    function balanceOfBase(CTokenInterface cToken) internal view returns (uint256){
-        return _cToBase(cToken.balanceOf(address(this)), cToken);
+    function balanceOfBase(CTokenInterface cToken) internal view returns (uint256 _base){
+        (_base,) = _accountSnapshot(cToken);
     }
 
     // Value of deposited want in USD
     function valueOfCWant() public view returns (uint256){
-        return _usdToBase(balanceOfBase(cWant), cWant, true);
+        return _valueOfCWant(_loadContext());
     }
 
     // Value of Inverse supplied tokens in USD
     function valueOfCSupplied() public view returns (uint256){
-        return _usdToBase(balanceOfBase(cSupplied), cSupplied, true);
+        return _valueOfCSupplied(_loadContext());
     }
 
     // Value of reward tokens in USD
     function valueOfxInv() public view returns (uint256){
-        return _usdToBase(balanceOfBase(xInv), xInv, true);
+        return _valueOfxInv(_loadContext());
     }
 
     function valueOfTotalCollateral() public view returns (uint256){
-        return valueOfCWant().add(valueOfCSupplied()).add(valueOfxInv());
+        return _valueOfTotalCollateral(_loadContext());
     }
 
     // Value of borrowed tokens in USD
     function valueOfBorrowedOwed() public view returns (uint256){
-        return _usdToBase(cBorrowed.borrowBalanceStored(address(this)), cBorrowed, true);
+        return _valueOfBorrowedOwed(_loadContext());
     }
 
     // Value of delegated vault deposits in USD
     function valueOfDelegated() public view returns (uint256){
-        uint256 _amountInBorrowed = delegatedVault.balanceOf(address(this)).mul(delegatedVault.pricePerShare()).div(10 ** delegatedVault.decimals());
-        return _usdToBase(_amountInBorrowed, cBorrowed, true);
+        return _valueOfDelegated(_loadContext());
+    }
+
+    // State of the strategy and its vault from a single oracle load and one snapshot per market
+    function positionSnapshot() external view returns (PositionSnapshot memory _snapshot) {
+        Context memory _ctx = _loadContext();
+        _snapshot.targetCollateralFactor = targetCollateralFactor();
+        _snapshot.balanceOfWant = balanceOfWant();
+        _snapshot.balanceOfReward = balanceOfReward();
+        _snapshot.balanceOfEth = balanceOfEth();
+
+        _snapshot.valueOfCWant = _valueOfCWant(_ctx);
+        _snapshot.valueOfCSupplied = _valueOfCSupplied(_ctx);
+        _snapshot.valueOfxInv = _valueOfxInv(_ctx);
+        _snapshot.valueOfTotalCollateral = _snapshot.valueOfCWant.add(_snapshot.valueOfCSupplied).add(_snapshot.valueOfxInv);
+        _snapshot.valueOfBorrowedOwed = _valueOfBorrowedOwed(_ctx);
+        _snapshot.valueOfDelegated = _valueOfDelegated(_ctx);
+
+        _snapshot.estimatedTotalAssets = _snapshot.balanceOfWant.add(_usdToBase(_snapshot.valueOfCWant.add(_snapshot.valueOfDelegated).sub(_snapshot.valueOfBorrowedOwed), _wantPrice(_ctx), false));
+        if (_snapshot.valueOfTotalCollateral > 0) {
+            uint256 _userDelegated = _snapshot.valueOfDelegated.mul(_snapshot.valueOfCWant).div(_snapshot.valueOfTotalCollateral);
+            _snapshot.delegatedAssets = _usdToBase(_userDelegated, _wantPrice(_ctx), false);
+        }
+
+        StrategyParams memory _params = vault.strategies(address(this));
+        _snapshot.vaultTotalAssets = vault.totalAssets();
+        _snapshot.vaultLooseBalance = want.balanceOf(address(vault));
+        _snapshot.vaultPricePerShare = vault.pricePerShare();
+        _snapshot.strategyTotalDebt = _params.totalDebt;
+        _snapshot.strategyTotalGain = _params.totalGain;
+        _snapshot.strategyTotalLoss = _params.totalLoss;
+    }
+
+    // the _valueOf helpers skip the price lookup for an empty balance, as the baseline views did
+    function _valueOfCWant(Context memory _ctx) internal view returns (uint256){
+        uint256 _supplied = balanceOfBase(cWant);
+        return _supplied == 0 ? 0 : _usdToBase(_supplied, _wantPrice(_ctx), true);
+    }
+
+    function _valueOfCSupplied(Context memory _ctx) internal view returns (uint256){
+        uint256 _supplied = balanceOfBase(cSupplied);
+        return _supplied == 0 ? 0 : _usdToBase(_supplied, _suppliedPrice(_ctx), true);
+    }
+
+    function _valueOfxInv(Context memory _ctx) internal view returns (uint256){
+        uint256 _xInv = balanceOfBase(xInv);
+        return _xInv == 0 ? 0 : _usdToBase(_xInv, _xInvPrice(_ctx), true);
+    }
+
+    function _valueOfTotalCollateral(Context memory _ctx) internal view returns (uint256){
+        return _valueOfCWant(_ctx).add(_valueOfCSupplied(_ctx)).add(_valueOfxInv(_ctx));
+    }
+
+    function _valueOfBorrowedOwed(Context memory _ctx) internal view returns (uint256){
+        (, uint256 _borrowedOwed) = _accountSnapshot(cBorrowed);
+        return _borrowedOwed == 0 ? 0 : _usdToBase(_borrowedOwed, _borrowedPrice(_ctx), true);
+    }
+
+    function _valueOfDelegated(Context memory _ctx) internal view returns (uint256){
+        uint256 _delegated = _sharesToBorrowed(delegatedVault.balanceOf(address(this)));
+        return _delegated == 0 ? 0 : _usdToBase(_delegated, _borrowedPrice(_ctx), true);
+    }
+
+    // fetch the oracle once, prices are looked up as the helpers need them
+    function _loadContext() internal view returns (Context memory _ctx) {
+        _ctx.oracle = comptroller.oracle();
+    }
+
+    function _wantPrice(Context memory _ctx) internal view returns (uint256) {
+        if (_ctx.wantPrice == 0) {
+            _ctx.wantPrice = _ctx.oracle.getUnderlyingPrice(address(cWant));
+        }
+        return _ctx.wantPrice;
     }
 
-    function _usdToBase(uint256 _amount, CTokenInterface cToken, bool reverse) internal view returns (uint256){
+    function _borrowedPrice(Context memory _ctx) internal view returns (uint256) {
+        if (_ctx.borrowedPrice == 0) {
+            _ctx.borrowedPrice = _ctx.oracle.getUnderlyingPrice(address(cBorrowed));
+        }
+        return _ctx.borrowedPrice;
+    }
+
+    function _suppliedPrice(Context memory _ctx) internal view returns (uint256) {
+        if (_ctx.suppliedPrice == 0) {
+            _ctx.suppliedPrice = _ctx.oracle.getUnderlyingPrice(address(cSupplied));
+        }
+        return _ctx.suppliedPrice;
+    }
+
+    function _xInvPrice(Context memory _ctx) internal view returns (uint256) {
+        if (_ctx.xInvPrice == 0) {
+            _ctx.xInvPrice = _ctx.oracle.getUnderlyingPrice(address(xInv));
+        }
+        return _ctx.xInvPrice;
+    }
+
+    function _usdToBase(uint256 _amount, uint256 _usdPerUnderlying, bool reverse) internal pure returns (uint256){
         if (_amount == max || _amount == 0) return _amount;
-        uint256 _usdPerUnderlying = comptroller.oracle().getUnderlyingPrice(address(cToken));
         if (reverse) {
             return _amount.mul(_usdPerUnderlying).div(1e18);
         } else {
@@ -444,12 +822,56 @@ contract Strategy is BaseStrategy {
         }
     }
 
+    function _sharesToBorrowed(uint256 _shares) internal view returns (uint256){
+        if (_shares == 0) return 0;
+        return _shares.mul(delegatedVault.pricePerShare()).div(10 ** delegatedVault.decimals());
+    }
+
     function _borrowedToShares(uint256 _amountBorrowed) internal view returns (uint256){
         if (_amountBorrowed == max || _amountBorrowed == 0) return _amountBorrowed;
         uint256 _borrowedPerShare = delegatedVault.pricePerShare();
         return _amountBorrowed.mul(10 ** delegatedVault.decimals()).div(_borrowedPerShare);
     }
 
+    // markets accrue at most once per block, so later calls in the same harvest skip the external accrual
+    function _accrueInterest(CTokenInterface cToken) internal {
+        if (cToken.accrualBlockNumber() != block.number) {
+            cToken.accrueInterest();
+        }
+    }
+
+    // supplied underlying and borrow balance in one call instead of balanceOf + exchangeRateStored + borrowBalanceStored
+    function _accountSnapshot(CTokenInterface cToken) internal view returns (uint256 _supplied, uint256 _borrowed){
+        (uint256 _error, uint256 _cTokenBalance, uint256 _borrowBalance, uint256 _exchangeRate) = cToken.getAccountSnapshot(address(this));
+        require(_error == NO_ERROR);
+        _supplied = _cTokenBalance.mul(_exchangeRate).div(1e18);
+        _borrowed = _borrowBalance;
+    }
+
+    function _borrowedWantPath() internal view returns (address[] memory) {
+        if (address(borrowed) == address(weth) || address(want) == address(weth)) {
+            return _toArray(address(borrowed), address(want));
+        }
+        return _toArray(address(borrowed), address(weth), address(want));
+    }
+
+    function _claimableMarkets() internal view returns (address[] memory) {
+        return _toArray(address(cWant), address(cBorrowed), address(cSupplied));
+    }
+
+    function _toArray(address _a, address _b) internal pure returns (address[] memory _path) {
+        _path = new address[](2);
+        _path[0] = _a;
+        _path[1] = _b;
+    }
+
+    function _toArray(address _a, address _b, address _c) internal pure returns (address[] memory _path) {
+        _path = new address[](3);
+        _path[0] = _a;
+        _path[1] = _b;
+        _path[2] = _c;
+    }
+
     function _cToBase(uint256 _amountCToken, CTokenInterface cToken) internal view returns (uint256){
         if (_amountCToken == max || _amountCToken == 0) return _amountCToken;
         uint256 _underlyingPerCToken = cToken.exchangeRateStored();
@@ -483,11 +905,17 @@ contract Strategy is BaseStrategy {
 
     function setComptroller() external onlyAuthorized {
         comptroller = ComptrollerInterface(cWant.comptroller());
-        comptroller.enterMarkets(claimableMarkets);
+        comptroller.enterMarkets(_claimableMarkets());
+        syncCollateralFactor();
+    }
+
+    function setFlashLender(address _flashLender) external onlyGovernance {
+        flashLender = IERC3156FlashLender(_flashLender);
     }
 
     function setCollateralTolerance(uint256 _toleranceMantissa) external onlyGovernance {
-        collateralTolerance = _toleranceMantissa;
+        require(_toleranceMantissa <= uint64(-1));
+        config.collateralTolerance = uint64(_toleranceMantissa);
     }
 
     function setInvDelegate(address _address) external onlyGovernance {
@@ -495,12 +923,13 @@ contract Strategy is BaseStrategy {
     }
 
     function setBorrowLimit(uint256 _borrowLimit) external onlyAuthorized {
-        borrowLimit = _borrowLimit;
+        require(_borrowLimit <= uint120(-1));
+        config.borrowLimit = uint120(_borrowLimit);
     }
 
     function setPercentRewardToSell(uint256 _percentRewardToSell) external onlyAuthorized {
         require(_percentRewardToSell <= 100);
-        percentRewardToSell = _percentRewardToSell;
+        config.percentRewardToSell = uint8(_percentRewardToSell);
     }
 
     //
@@ -516,18 +945,21 @@ contract Strategy is BaseStrategy {
 
         comptroller.exitMarket(address(cSupplied));
         cSupplied = CErc20Interface(address(_address));
-
-        claimableMarkets[2] = _address;
-        comptroller.enterMarkets(claimableMarkets);
+        comptroller.enterMarkets(_claimableMarkets());
     }
 
     // @param _amount in cToken from the private market
-    function supplyCollateral(uint256 _amount) external onlyInverseGovernance returns (bool) {
-        return cSupplied.transferFrom(msg.sender, address(this), _amount);
+    function supplyCollateral(uint256 _amount) external onlyInverseGovernance returns (bool _success) {
+        _success = cSupplied.transferFrom(msg.sender, address(this), _amount);
+        emit CollateralSupplied(_amount);
     }
 
     function removeCollateral(uint256 _cTokenAmount) external onlyInverseGovernance {
-        _freeUpCollateral(_usdToBase(_cToBase(_cTokenAmount, cSupplied), cSupplied, true), false);
-        cSupplied.transfer(msg.sender, Math.min(_cTokenAmount, cSupplied.balanceOf(address(this))));
+        syncCollateralFactor();
+        Context memory _ctx = _loadContext();
+        _freeUpCollateral(_usdToBase(_cToBase(_cTokenAmount, cSupplied), _suppliedPrice(_ctx), true), false, _ctx);
+        uint256 _removed = Math.min(_cTokenAmount, cSupplied.balanceOf(address(this)));
+        cSupplied.transfer(msg.sender, _removed);
+        emit CollateralRemoved(_removed);
     }
 }
@@ -0,0 +1,381 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import {SafeERC20, SafeMath, IERC20} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "../../interfaces/inverse.sol";
+
+// Compound-style market for local tests: a flat borrow rate per block, no reserves and no interest rate model.
+// Configured through initialize() so xINV can be placed at its fixed mainnet address on a dev chain.
+// Error codes follow Compound's TokenErrorReporter, comptroller rejections are passed through.
+abstract contract MockCToken {
+    using SafeMath for uint256;
+
+    uint256 internal constant NO_ERROR = 0;
+    uint256 internal constant TOKEN_INSUFFICIENT_CASH = 14;
+
+    struct BorrowSnapshot {
+        uint256 principal;
+        uint256 interestIndex;
+    }
+
+    string public name;
+    string public symbol;
+    uint8 public decimals;
+
+    address public comptroller;
+    uint256 public initialExchangeRateMantissa;
+    uint256 public borrowRatePerBlock;
+
+    uint256 public accrualBlockNumber;
+    uint256 public borrowIndex;
+    uint256 public totalBorrows;
+    uint256 public totalSupply;
+
+    mapping(address => uint256) public balanceOf;
+    mapping(address => mapping(address => uint256)) public allowance;
+    mapping(address => BorrowSnapshot) internal accountBorrows;
+
+    event AccrueInterest(uint256 cashPrior, uint256 interestAccumulated, uint256 borrowIndex, uint256 totalBorrows);
+    event Mint(address minter, uint256 mintAmount, uint256 mintTokens);
+    event Redeem(address redeemer, uint256 redeemAmount, uint256 redeemTokens);
+    event Borrow(address borrower, uint256 borrowAmount, uint256 accountBorrows, uint256 totalBorrows);
+    event RepayBorrow(address payer, address borrower, uint256 repayAmount, uint256 accountBorrows, uint256 totalBorrows);
+    event Transfer(address indexed from, address indexed to, uint256 amount);
+    event Approval(address indexed owner, address indexed spender, uint256 amount);
+
+    function _initialize(address _comptroller, uint256 _initialExchangeRateMantissa, string memory _name, string memory _symbol, uint8 _decimals) internal {
+        require(borrowIndex == 0, "initialized");
+        comptroller = _comptroller;
+        initialExchangeRateMantissa = _initialExchangeRateMantissa;
+        name = _name;
+        symbol = _symbol;
+        decimals = _decimals;
+        accrualBlockNumber = block.number;
+        borrowIndex = 1e18;
+    }
+
+    function _setBorrowRatePerBlock(uint256 _borrowRatePerBlock) external {
+        accrueInterest();
+        borrowRatePerBlock = _borrowRatePerBlock;
+    }
+
+    //
+    // Views
+    //
+
+    function getCash() external view returns (uint256) {
+        return _getCashPrior();
+    }
+
+    function supplyRatePerBlock() external view returns (uint256) {
+        uint256 _total = _getCashPrior().add(totalBorrows);
+        return _total == 0 ? 0 : borrowRatePerBlock.mul(totalBorrows).div(_total);
+    }
+
+    function exchangeRateStored() public view returns (uint256) {
+        if (totalSupply == 0) {
+            return initialExchangeRateMantissa;
+        }
+        return _getCashPrior().add(totalBorrows).mul(1e18).div(totalSupply);
+    }
+
+    function borrowBalanceStored(address _account) public view returns (uint256) {
+        BorrowSnapshot storage _snapshot = accountBorrows[_account];
+        if (_snapshot.principal == 0) {
+            return 0;
+        }
+        return _snapshot.principal.mul(borrowIndex).div(_snapshot.interestIndex);
+    }
+
+    function balanceOfUnderlying(address _owner) external view returns (uint256) {
+        return balanceOf[_owner].mul(exchangeRateStored()).div(1e18);
+    }
+
+    function getAccountSnapshot(address _account) external view returns (uint256, uint256, uint256, uint256) {
+        return (NO_ERROR, balanceOf[_account], borrowBalanceStored(_account), exchangeRateStored());
+    }
+
+    //
+    // Accrual
+    //
+
+    function accrueInterest() public returns (uint256) {
+        uint256 _blockDelta = block.number.sub(accrualBlockNumber);
+        if (_blockDelta == 0) {
+            return NO_ERROR;
+        }
+
+        uint256 _simpleInterestFactor = borrowRatePerBlock.mul(_blockDelta);
+        uint256 _interestAccumulated = _simpleInterestFactor.mul(totalBorrows).div(1e18);
+        totalBorrows = totalBorrows.add(_interestAccumulated);
+        borrowIndex = borrowIndex.add(_simpleInterestFactor.mul(borrowIndex).div(1e18));
+        accrualBlockNumber = block.number;
+
+        emit AccrueInterest(_getCashPrior(), _interestAccumulated, borrowIndex, totalBorrows);
+        return NO_ERROR;
+    }
+
+    function exchangeRateCurrent() external returns (uint256) {
+        accrueInterest();
+        return exchangeRateStored();
+    }
+
+    function borrowBalanceCurrent(address _account) external returns (uint256) {
+        accrueInterest();
+        return borrowBalanceStored(_account);
+    }
+
+    function totalBorrowsCurrent() external returns (uint256) {
+        accrueInterest();
+        return totalBorrows;
+    }
+
+    //
+    // cToken transfers
+    //
+
+    function approve(address _spender, uint256 _amount) external returns (bool) {
+        allowance[msg.sender][_spender] = _amount;
+        emit Approval(msg.sender, _spender, _amount);
+        return true;
+    }
+
+    function transfer(address _dst, uint256 _amount) external returns (bool) {
+        return _transferTokens(msg.sender, msg.sender, _dst, _amount);
+    }
+
+    function transferFrom(address _src, address _dst, uint256 _amount) external returns (bool) {
+        return _transferTokens(msg.sender, _src, _dst, _amount);
+    }
+
+    function _transferTokens(address _spender, address _src, address _dst, uint256 _amount) internal returns (bool) {
+        if (ComptrollerInterface(comptroller).transferAllowed(address(this), _src, _dst, _amount) != NO_ERROR) {
+            return false;
+        }
+        if (_spender != _src && allowance[_src][_spender] != uint256(-1)) {
+            allowance[_src][_spender] = allowance[_src][_spender].sub(_amount, "!allowance");
+        }
+        balanceOf[_src] = balanceOf[_src].sub(_amount, "!balance");
+        balanceOf[_dst] = balanceOf[_dst].add(_amount);
+        emit Transfer(_src, _dst, _amount);
+        return true;
+    }
+
+    //
+    // Market actions
+    //
+
+    function _mintFresh(address _minter, uint256 _mintAmount) internal returns (uint256) {
+        accrueInterest();
+        uint256 _error = ComptrollerInterface(comptroller).mintAllowed(address(this), _minter, _mintAmount);
+        if (_error != NO_ERROR) {
+            return _error;
+        }
+
+        // rate before the new cash comes in
+        uint256 _exchangeRate = exchangeRateStored();
+        _doTransferIn(_minter, _mintAmount);
+
+        uint256 _mintTokens = _mintAmount.mul(1e18).div(_exchangeRate);
+        totalSupply = totalSupply.add(_mintTokens);
+        balanceOf[_minter] = balanceOf[_minter].add(_mintTokens);
+
+        emit Mint(_minter, _mintAmount, _mintTokens);
+        emit Transfer(address(this), _minter, _mintTokens);
+        return NO_ERROR;
+    }
+
+    function _redeemFresh(address payable _redeemer, uint256 _redeemTokensIn, uint256 _redeemAmountIn) internal returns (uint256) {
+        accrueInterest();
+        uint256 _exchangeRate = exchangeRateStored();
+
+        uint256 _redeemTokens;
+        uint256 _redeemAmount;
+        if (_redeemTokensIn > 0) {
+            _redeemTokens = _redeemTokensIn;
+            _redeemAmount = _redeemTokensIn.mul(_exchangeRate).div(1e18);
+        } else {
+            _redeemTokens = _redeemAmountIn.mul(1e18).div(_exchangeRate);
+            _redeemAmount = _redeemAmountIn;
+        }
+
+        uint256 _error = ComptrollerInterface(comptroller).redeemAllowed(address(this), _redeemer, _redeemTokens);
+        if (_error != NO_ERROR) {
+            return _error;
+        }
+        if (_getCashPrior() < _redeemAmount) {
+            return TOKEN_INSUFFICIENT_CASH;
+        }
+
+        totalSupply = totalSupply.sub(_redeemTokens);
+        balanceOf[_redeemer] = balanceOf[_redeemer].sub(_redeemTokens, "!balance");
+        _doTransferOut(_redeemer, _redeemAmount);
+
+        emit Transfer(_redeemer, address(this), _redeemTokens);
+        emit Redeem(_redeemer, _redeemAmount, _redeemTokens);
+        return NO_ERROR;
+    }
+
+    function _borrowFresh(address payable _borrower, uint256 _borrowAmount) internal returns (uint256) {
+        accrueInterest();
+        uint256 _error = ComptrollerInterface(comptroller).borrowAllowed(address(this), _borrower, _borrowAmount);
+        if (_error != NO_ERROR) {
+            return _error;
+        }
+        if (_getCashPrior() < _borrowAmount) {
+            return TOKEN_INSUFFICIENT_CASH;
+        }
+
+        uint256 _accountBorrows = borrowBalanceStored(_borrower).add(_borrowAmount);
+        accountBorrows[_borrower] = BorrowSnapshot(_accountBorrows, borrowIndex);
+        totalBorrows = totalBorrows.add(_borrowAmount);
+        _doTransferOut(_borrower, _borrowAmount);
+
+        emit Borrow(_borrower, _borrowAmount, _accountBorrows, totalBorrows);
+        return NO_ERROR;
+    }
+
+    function _repayBorrowFresh(address _payer, address _borrower, uint256 _repayAmount) internal returns (uint256) {
+        accrueInterest();
+        uint256 _error = ComptrollerInterface(comptroller).repayBorrowAllowed(address(this), _payer, _borrower, _repayAmount);
+        if (_error != NO_ERROR) {
+            return _error;
+        }
+
+        uint256 _owed = borrowBalanceStored(_borrower);
+        if (_repayAmount == uint256(-1)) {
+            _repayAmount = _owed;
+        }
+        _doTransferIn(_payer, _repayAmount);
+
+        // repaying more than is owed reverts, as in Compound
+        uint256 _accountBorrows = _owed.sub(_repayAmount, "!repay");
+        accountBorrows[_borrower] = BorrowSnapshot(_accountBorrows, borrowIndex);
+        totalBorrows = totalBorrows > _repayAmount ? totalBorrows - _repayAmount : 0;
+
+        emit RepayBorrow(_payer, _borrower, _repayAmount, _accountBorrows, totalBorrows);
+        return NO_ERROR;
+    }
+
+    function _getCashPrior() internal view virtual returns (uint256);
+
+    function _doTransferIn(address _from, uint256 _amount) internal virtual;
+
+    function _doTransferOut(address payable _to, uint256 _amount) internal virtual;
+}
+
+contract MockCErc20 is MockCToken {
+    using SafeERC20 for IERC20;
+
+    address public underlying;
+
+    function initialize(
+        address _underlying,
+        address _comptroller,
+        uint256 _initialExchangeRateMantissa,
+        string memory _name,
+        string memory _symbol,
+        uint8 _decimals
+    ) external {
+        underlying = _underlying;
+        _initialize(_comptroller, _initialExchangeRateMantissa, _name, _symbol, _decimals);
+    }
+
+    function mint(uint256 _mintAmount) external returns (uint256) {
+        return _mintFresh(msg.sender, _mintAmount);
+    }
+
+    function redeem(uint256 _redeemTokens) external returns (uint256) {
+        return _redeemFresh(msg.sender, _redeemTokens, 0);
+    }
+
+    function redeemUnderlying(uint256 _redeemAmount) external returns (uint256) {
+        return _redeemFresh(msg.sender, 0, _redeemAmount);
+    }
+
+    function borrow(uint256 _borrowAmount) external returns (uint256) {
+        return _borrowFresh(msg.sender, _borrowAmount);
+    }
+
+    function repayBorrow(uint256 _repayAmount) external returns (uint256) {
+        return _repayBorrowFresh(msg.sender, msg.sender, _repayAmount);
+    }
+
+    function repayBorrowBehalf(address _borrower, uint256 _repayAmount) external returns (uint256) {
+        return _repayBorrowFresh(msg.sender, _borrower, _repayAmount);
+    }
+
+    function _getCashPrior() internal view override returns (uint256) {
+        return IERC20(underlying).balanceOf(address(this));
+    }
+
+    function _doTransferIn(address _from, uint256 _amount) internal override {
+        IERC20(underlying).safeTransferFrom(_from, address(this), _amount);
+    }
+
+    function _doTransferOut(address payable _to, uint256 _amount) internal override {
+        IERC20(underlying).safeTransfer(_to, _amount);
+    }
+}
+
+contract MockCEther is MockCToken {
+    function initialize(
+        address _comptroller,
+        uint256 _initialExchangeRateMantissa,
+        string memory _name,
+        string memory _symbol,
+        uint8 _decimals
+    ) external {
+        _initialize(_comptroller, _initialExchangeRateMantissa, _name, _symbol, _decimals);
+    }
+
+    function mint() external payable {
+        require(_mintFresh(msg.sender, msg.value) == NO_ERROR, "!mint");
+    }
+
+    function redeem(uint256 _redeemTokens) external returns (uint256) {
+        return _redeemFresh(msg.sender, _redeemTokens, 0);
+    }
+
+    function redeemUnderlying(uint256 _redeemAmount) external returns (uint256) {
+        return _redeemFresh(msg.sender, 0, _redeemAmount);
+    }
+
+    function borrow(uint256 _borrowAmount) external returns (uint256) {
+        return _borrowFresh(msg.sender, _borrowAmount);
+    }
+
+    function repayBorrow() external payable {
+        require(_repayBorrowFresh(msg.sender, msg.sender, msg.value) == NO_ERROR, "!repay");
+    }
+
+    // the payment is already in the balance while the call runs
+    function _getCashPrior() internal view override returns (uint256) {
+        return address(this).balance.sub(msg.value);
+    }
+
+    function _doTransferIn(address _from, uint256 _amount) internal override {
+        require(msg.sender == _from && msg.value == _amount, "!value");
+    }
+
+    function _doTransferOut(address payable _to, uint256 _amount) internal override {
+        _to.transfer(_amount);
+    }
+}
+
+// xINV: INV market whose voting power can be delegated, escrowed withdrawals are released instantly
+contract MockXInv is MockCErc20 {
+    mapping(address => address) public delegates;
+
+    function delegate(address _delegatee) external {
+        delegates[msg.sender] = _delegatee;
+    }
+
+    function escrow() external view returns (address) {
+        return address(this);
+    }
+
+    function withdraw() external {}
+}
@@ -0,0 +1,218 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import {SafeERC20, SafeMath, IERC20} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "../../interfaces/inverse.sol";
+
+// Comptroller for local tests: market listing, collateral factors, account liquidity and reward claims.
+// Error codes follow Compound's ComptrollerErrorReporter.
+contract MockComptroller {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    uint256 internal constant NO_ERROR = 0;
+    uint256 internal constant INSUFFICIENT_LIQUIDITY = 4;
+    uint256 internal constant MARKET_NOT_LISTED = 9;
+    uint256 internal constant NONZERO_BORROW_BALANCE = 12;
+
+    struct Market {
+        bool isListed;
+        uint256 collateralFactorMantissa;
+    }
+
+    address public admin;
+    PriceOracle public oracle;
+    IERC20 public comp; // INV
+    uint256 public liquidationIncentiveMantissa = 1.08 ether;
+
+    mapping(address => Market) internal _markets;
+    mapping(address => address[]) internal accountAssets;
+    mapping(address => mapping(address => bool)) public checkMembership;
+    mapping(address => uint256) public compAccrued;
+
+    modifier onlyAdmin() {
+        require(msg.sender == admin, "!admin");
+        _;
+    }
+
+    constructor(address _oracle, address _comp) public {
+        admin = msg.sender;
+        oracle = PriceOracle(_oracle);
+        comp = IERC20(_comp);
+    }
+
+    //
+    // Admin
+    //
+
+    function _supportMarket(address _cToken) external onlyAdmin returns (uint256) {
+        _markets[_cToken].isListed = true;
+        return NO_ERROR;
+    }
+
+    function _setCollateralFactor(address _cToken, uint256 _collateralFactorMantissa) external onlyAdmin returns (uint256) {
+        require(_collateralFactorMantissa <= 0.9 ether);
+        _markets[_cToken].collateralFactorMantissa = _collateralFactorMantissa;
+        return NO_ERROR;
+    }
+
+    function _setPriceOracle(address _oracle) external onlyAdmin returns (uint256) {
+        oracle = PriceOracle(_oracle);
+        return NO_ERROR;
+    }
+
+    function _setLiquidationIncentive(uint256 _liquidationIncentiveMantissa) external onlyAdmin returns (uint256) {
+        liquidationIncentiveMantissa = _liquidationIncentiveMantissa;
+        return NO_ERROR;
+    }
+
+    // rewards handed out on the next claimComp, paid from this contract's INV balance
+    function setCompAccrued(address _holder, uint256 _amount) external {
+        compAccrued[_holder] = _amount;
+    }
+
+    //
+    // Markets
+    //
+
+    function markets(address _cToken) external view returns (bool isListed, uint256 collatFactorMantissa, bool isComped) {
+        Market storage _market = _markets[_cToken];
+        return (_market.isListed, _market.collateralFactorMantissa, _market.isListed);
+    }
+
+    function getAssetsIn(address _account) external view returns (address[] memory) {
+        return accountAssets[_account];
+    }
+
+    function enterMarkets(address[] calldata _cTokens) external returns (uint256[] memory _results) {
+        _results = new uint256[](_cTokens.length);
+        for (uint256 i = 0; i < _cTokens.length; i++) {
+            address _cToken = _cTokens[i];
+            if (!_markets[_cToken].isListed) {
+                _results[i] = MARKET_NOT_LISTED;
+            } else if (!checkMembership[msg.sender][_cToken]) {
+                checkMembership[msg.sender][_cToken] = true;
+                accountAssets[msg.sender].push(_cToken);
+            }
+        }
+    }
+
+    function exitMarket(address _cToken) external returns (uint256) {
+        if (!checkMembership[msg.sender][_cToken]) {
+            return NO_ERROR;
+        }
+        (, uint256 _tokens, uint256 _borrowed,) = CTokenInterface(_cToken).getAccountSnapshot(msg.sender);
+        if (_borrowed > 0) {
+            return NONZERO_BORROW_BALANCE;
+        }
+        uint256 _error = redeemAllowed(_cToken, msg.sender, _tokens);
+        if (_error != NO_ERROR) {
+            return _error;
+        }
+
+        checkMembership[msg.sender][_cToken] = false;
+        address[] storage _assets = accountAssets[msg.sender];
+        for (uint256 i = 0; i < _assets.length; i++) {
+            if (_assets[i] == _cToken) {
+                _assets[i] = _assets[_assets.length - 1];
+                _assets.pop();
+                break;
+            }
+        }
+        return NO_ERROR;
+    }
+
+    //
+    // Policy hooks
+    //
+
+    function mintAllowed(address _cToken, address, uint256) external view returns (uint256) {
+        return _markets[_cToken].isListed ? NO_ERROR : MARKET_NOT_LISTED;
+    }
+
+    function redeemAllowed(address _cToken, address _redeemer, uint256 _redeemTokens) public view returns (uint256) {
+        if (!_markets[_cToken].isListed) {
+            return MARKET_NOT_LISTED;
+        }
+        // not collateral, so it can't leave the account short
+        if (!checkMembership[_redeemer][_cToken]) {
+            return NO_ERROR;
+        }
+        (, uint256 _shortfall) = _hypotheticalLiquidity(_redeemer, _cToken, _redeemTokens, 0);
+        return _shortfall > 0 ? INSUFFICIENT_LIQUIDITY : NO_ERROR;
+    }
+
+    function borrowAllowed(address _cToken, address _borrower, uint256 _borrowAmount) external returns (uint256) {
+        if (!_markets[_cToken].isListed) {
+            return MARKET_NOT_LISTED;
+        }
+        // markets enter themselves on first borrow, as in Compound
+        if (!checkMembership[_borrower][_cToken]) {
+            require(msg.sender == _cToken, "!cToken");
+            checkMembership[_borrower][_cToken] = true;
+            accountAssets[_borrower].push(_cToken);
+        }
+        (, uint256 _shortfall) = _hypotheticalLiquidity(_borrower, _cToken, 0, _borrowAmount);
+        return _shortfall > 0 ? INSUFFICIENT_LIQUIDITY : NO_ERROR;
+    }
+
+    function repayBorrowAllowed(address _cToken, address, address, uint256) external view returns (uint256) {
+        return _markets[_cToken].isListed ? NO_ERROR : MARKET_NOT_LISTED;
+    }
+
+    function transferAllowed(address _cToken, address _src, address, uint256 _transferTokens) external view returns (uint256) {
+        return redeemAllowed(_cToken, _src, _transferTokens);
+    }
+
+    //
+    // Liquidity
+    //
+
+    function getAccountLiquidity(address _account) external view returns (uint256, uint256, uint256) {
+        (uint256 _liquidity, uint256 _shortfall) = _hypotheticalLiquidity(_account, address(0), 0, 0);
+        return (NO_ERROR, _liquidity, _shortfall);
+    }
+
+    function _hypotheticalLiquidity(address _account, address _cTokenModify, uint256 _redeemTokens, uint256 _borrowAmount) internal view returns (uint256 _liquidity, uint256 _shortfall) {
+        uint256 _sumCollateral;
+        uint256 _sumBorrowPlusEffects;
+
+        address[] storage _assets = accountAssets[_account];
+        for (uint256 i = 0; i < _assets.length; i++) {
+            address _asset = _assets[i];
+            (, uint256 _tokens, uint256 _borrowed, uint256 _exchangeRate) = CTokenInterface(_asset).getAccountSnapshot(_account);
+            uint256 _price = oracle.getUnderlyingPrice(_asset);
+            require(_price > 0, "!price");
+
+            // USD per cToken, after the collateral factor
+            uint256 _tokensToDenom = _markets[_asset].collateralFactorMantissa.mul(_exchangeRate).div(1e18).mul(_price).div(1e18);
+            _sumCollateral = _sumCollateral.add(_tokensToDenom.mul(_tokens).div(1e18));
+            _sumBorrowPlusEffects = _sumBorrowPlusEffects.add(_price.mul(_borrowed).div(1e18));
+
+            if (_asset == _cTokenModify) {
+                _sumBorrowPlusEffects = _sumBorrowPlusEffects.add(_tokensToDenom.mul(_redeemTokens).div(1e18));
+                _sumBorrowPlusEffects = _sumBorrowPlusEffects.add(_price.mul(_borrowAmount).div(1e18));
+            }
+        }
+
+        if (_sumCollateral > _sumBorrowPlusEffects) {
+            _liquidity = _sumCollateral - _sumBorrowPlusEffects;
+        } else {
+            _shortfall = _sumBorrowPlusEffects - _sumCollateral;
+        }
+    }
+
+    //
+    // Rewards
+    //
+
+    function claimComp(address _holder, address[] memory) external {
+        uint256 _amount = compAccrued[_holder];
+        if (_amount > 0 && comp.balanceOf(address(this)) >= _amount) {
+            compAccrued[_holder] = 0;
+            comp.safeTransfer(_holder, _amount);
+        }
+    }
+}
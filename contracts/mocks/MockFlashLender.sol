@@ -0,0 +1,39 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+pragma experimental ABIEncoderV2;
+
+import {SafeERC20, SafeMath, IERC20} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+import "../../interfaces/erc3156.sol";
+
+// ERC-3156 lender for local tests, lends whatever it holds for a flat fee in bps
+contract MockFlashLender is IERC3156FlashLender {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    bytes32 private constant CALLBACK_SUCCESS = keccak256("ERC3156FlashBorrower.onFlashLoan");
+
+    uint256 public feeBps;
+
+    constructor(uint256 _feeBps) public {
+        feeBps = _feeBps;
+    }
+
+    function maxFlashLoan(address token) public view override returns (uint256) {
+        return IERC20(token).balanceOf(address(this));
+    }
+
+    function flashFee(address, uint256 amount) public view override returns (uint256) {
+        return amount.mul(feeBps).div(10_000);
+    }
+
+    function flashLoan(IERC3156FlashBorrower receiver, address token, uint256 amount, bytes calldata data) external override returns (bool) {
+        require(amount <= maxFlashLoan(token), "!liquidity");
+        uint256 _fee = flashFee(token, amount);
+
+        IERC20(token).safeTransfer(address(receiver), amount);
+        require(receiver.onFlashLoan(msg.sender, token, amount, _fee, data) == CALLBACK_SUCCESS, "!callback");
+        IERC20(token).safeTransferFrom(address(receiver), address(this), amount.add(_fee));
+        return true;
+    }
+}
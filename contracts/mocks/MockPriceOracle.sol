@@ -0,0 +1,15 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+// Prices keyed by cToken, scaled like the Inverse oracle: 1e18 USD per unit of underlying, times 1e18
+contract MockPriceOracle {
+    mapping(address => uint256) public prices;
+
+    function setUnderlyingPrice(address _cToken, uint256 _price) external {
+        prices[_cToken] = _price;
+    }
+
+    function getUnderlyingPrice(address _cToken) external view returns (uint256) {
+        return prices[_cToken];
+    }
+}
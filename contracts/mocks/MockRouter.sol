@@ -0,0 +1,78 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {SafeERC20, SafeMath, IERC20} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+
+// Uniswap V2 style router for local tests. Quotes from fixed prices with the 0.3% pool fee and fills
+// swaps from its own balances, so it has to be funded with every output token.
+contract MockRouter {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    uint256 public constant FEE_BPS = 30;
+    uint256 internal constant BPS = 10_000;
+
+    // USD per unit of token, scaled like the Inverse oracle
+    mapping(address => uint256) public prices;
+
+    function setPrice(address _token, uint256 _price) external {
+        prices[_token] = _price;
+    }
+
+    function getAmountsOut(uint256 amountIn, address[] memory path) public view returns (uint256[] memory amounts) {
+        require(path.length >= 2, "INVALID_PATH");
+        amounts = new uint256[](path.length);
+        amounts[0] = amountIn;
+        for (uint256 i = 0; i < path.length - 1; i++) {
+            require(amounts[i] > 0, "INSUFFICIENT_INPUT_AMOUNT");
+            amounts[i + 1] = amounts[i].mul(_price(path[i])).mul(BPS - FEE_BPS).div(_price(path[i + 1]).mul(BPS));
+        }
+    }
+
+    function getAmountsIn(uint256 amountOut, address[] memory path) public view returns (uint256[] memory amounts) {
+        require(path.length >= 2, "INVALID_PATH");
+        amounts = new uint256[](path.length);
+        amounts[amounts.length - 1] = amountOut;
+        for (uint256 i = path.length - 1; i > 0; i--) {
+            require(amounts[i] > 0, "INSUFFICIENT_OUTPUT_AMOUNT");
+            // rounded up so the input always buys at least the output
+            amounts[i - 1] = amounts[i].mul(_price(path[i])).mul(BPS).div(_price(path[i - 1]).mul(BPS - FEE_BPS)).add(1);
+        }
+    }
+
+    function swapExactTokensForTokens(
+        uint256 amountIn,
+        uint256 amountOutMin,
+        address[] calldata path,
+        address to,
+        uint256 deadline
+    ) external returns (uint256[] memory amounts) {
+        require(deadline >= block.timestamp, "EXPIRED");
+        amounts = getAmountsOut(amountIn, path);
+        require(amounts[amounts.length - 1] >= amountOutMin, "INSUFFICIENT_OUTPUT_AMOUNT");
+        _swap(amounts, path, to);
+    }
+
+    function swapTokensForExactTokens(
+        uint256 amountOut,
+        uint256 amountInMax,
+        address[] calldata path,
+        address to,
+        uint256 deadline
+    ) external returns (uint256[] memory amounts) {
+        require(deadline >= block.timestamp, "EXPIRED");
+        amounts = getAmountsIn(amountOut, path);
+        require(amounts[0] <= amountInMax, "EXCESSIVE_INPUT_AMOUNT");
+        _swap(amounts, path, to);
+    }
+
+    function _swap(uint256[] memory amounts, address[] memory path, address to) internal {
+        IERC20(path[0]).safeTransferFrom(msg.sender, address(this), amounts[0]);
+        IERC20(path[path.length - 1]).safeTransfer(to, amounts[amounts.length - 1]);
+    }
+
+    function _price(address _token) internal view returns (uint256 _tokenPrice) {
+        _tokenPrice = prices[_token];
+        require(_tokenPrice > 0, "!price");
+    }
+}
@@ -0,0 +1,81 @@
+// SPDX-License-Identifier: AGPL-3.0
+pragma solidity 0.6.12;
+
+import {SafeERC20, SafeMath, IERC20} from "@openzeppelin/contracts/token/ERC20/SafeERC20.sol";
+import {Math} from "@openzeppelin/contracts/math/Math.sol";
+
+// Minimal yVault for local tests: shares over its token balance, so sending it tokens raises pricePerShare
+contract MockYVault {
+    using SafeERC20 for IERC20;
+    using SafeMath for uint256;
+
+    IERC20 public token;
+    uint8 public decimals;
+    string public name;
+    string public symbol;
+    uint256 public totalSupply;
+
+    mapping(address => uint256) public balanceOf;
+    mapping(address => mapping(address => uint256)) public allowance;
+
+    event Transfer(address indexed from, address indexed to, uint256 value);
+    event Approval(address indexed owner, address indexed spender, uint256 value);
+
+    constructor(address _token, uint8 _decimals, string memory _name, string memory _symbol) public {
+        token = IERC20(_token);
+        decimals = _decimals;
+        name = _name;
+        symbol = _symbol;
+    }
+
+    function totalAssets() public view returns (uint256) {
+        return token.balanceOf(address(this));
+    }
+
+    function pricePerShare() external view returns (uint256) {
+        if (totalSupply == 0) {
+            return 10 ** uint256(decimals);
+        }
+        return totalAssets().mul(10 ** uint256(decimals)).div(totalSupply);
+    }
+
+    function deposit(uint256 _amount) external returns (uint256 _shares) {
+        if (_amount == uint256(-1)) {
+            _amount = token.balanceOf(msg.sender);
+        }
+        uint256 _totalAssets = totalAssets();
+        _shares = totalSupply == 0 || _totalAssets == 0 ? _amount : _amount.mul(totalSupply).div(_totalAssets);
+
+        token.safeTransferFrom(msg.sender, address(this), _amount);
+        totalSupply = totalSupply.add(_shares);
+        balanceOf[msg.sender] = balanceOf[msg.sender].add(_shares);
+        emit Transfer(address(0), msg.sender, _shares);
+    }
+
+    // max uint256 withdraws everything
+    function withdraw(uint256 _maxShares) external returns (uint256 _value) {
+        uint256 _shares = Math.min(_maxShares, balanceOf[msg.sender]);
+        if (_shares == 0) {
+            return 0;
+        }
+        _value = _shares.mul(totalAssets()).div(totalSupply);
+
+        balanceOf[msg.sender] = balanceOf[msg.sender].sub(_shares);
+        totalSupply = totalSupply.sub(_shares);
+        token.safeTransfer(msg.sender, _value);
+        emit Transfer(msg.sender, address(0), _shares);
+    }
+
+    function approve(address _spender, uint256 _amount) external returns (bool) {
+        allowance[msg.sender][_spender] = _amount;
+        emit Approval(msg.sender, _spender, _amount);
+        return true;
+    }
+
+    function transfer(address _to, uint256 _amount) external returns (bool) {
+        balanceOf[msg.sender] = balanceOf[msg.sender].sub(_amount, "!balance");
+        balanceOf[_to] = balanceOf[_to].add(_amount);
+        emit Transfer(msg.sender, _to, _amount);
+        return true;
+    }
+}
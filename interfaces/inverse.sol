@@ -13,9 +13,11 @@ interface PriceOracle {
 }
 
 interface ComptrollerInterface {
-    // autogen getter
+    // autogen getters
     function oracle() external view returns (PriceOracle);
 
+    function liquidationIncentiveMantissa() external view returns (uint);
+
     /*** Assets You Are In ***/
 
     function enterMarkets(address[] calldata cTokens) external returns (uint[] memory);
@@ -226,6 +228,8 @@ interface CTokenInterface {
 
     function accrueInterest() external returns (uint);
 
+    function accrualBlockNumber() external view returns (uint);
+
     function seize(address liquidator, address borrower, uint seizeTokens) external returns (uint);
 
     function underlying() external view returns (address);
@@ -0,0 +1,16 @@
+from .strategy import (
+    MAX,
+    Position,
+    amount_in,
+    amount_out,
+    c_to_base,
+    collateral_free,
+    free_up_collateral,
+    rebalance,
+    redeem,
+    tend_gain,
+    tend_trigger,
+    usd_borrow_adjustment,
+    usd_to_base,
+)
+from .risk import BLOCKS_PER_YEAR, RiskReport, Scenario, eth_price_paths, liquidation_risk, simulate
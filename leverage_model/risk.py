@@ -0,0 +1,123 @@
+"""
+Monte Carlo liquidation risk of a strategy position.
+
+Every batch of price paths runs as one set of NumPy arrays: each step moves the ETH price, accrues the borrow
+at `borrowRatePerBlock`, grows the delegated vault's `pricePerShare` and, on the keeper's cadence, tends the
+paths where `tendTrigger` fires. Independent batches go to a process pool, seeded so the result doesn't depend
+on the number of workers.
+
+Only ETH moves against want, the oracle prices of want, the supplied collateral and xINV stay where they are.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .strategy import MANTISSA, SECONDS_PER_BLOCK, _select, rebalance, tend_trigger
+
+BLOCKS_PER_YEAR = 2_102_400  # 15s blocks, as the Compound rate models assume
+
+
+@dataclass(frozen=True)
+class Scenario:
+    blocks: int = BLOCKS_PER_YEAR // 12
+    step_blocks: int = 240  # an hour
+    eth_volatility: float = 0.9  # annualized, of ETH priced in want
+    eth_drift: float = 0.0
+    borrow_rate_per_block: float = 0.0
+    price_per_share_growth_per_block: float = 0.0
+    tend_interval_blocks: int = 6_500  # a day
+    call_cost_in_want: float = 0.0
+
+    @property
+    def steps(self):
+        return self.blocks // self.step_blocks
+
+
+@dataclass(frozen=True)
+class RiskReport:
+    paths: int
+    breached: int
+    mean_tends: float
+    worst_collateral_factor: np.ndarray  # per path, highest borrowed / collateral seen
+
+    @property
+    def probability(self):
+        return self.breached / self.paths
+
+
+def eth_price_paths(rng, start_price, scenario, paths):
+    """
+    Geometric brownian motion of the ETH oracle price, shape (paths, steps).
+    """
+    dt = scenario.step_blocks / BLOCKS_PER_YEAR
+    sigma = scenario.eth_volatility * np.sqrt(dt)
+    log_returns = rng.normal((scenario.eth_drift - scenario.eth_volatility ** 2 / 2) * dt, sigma, (paths, scenario.steps))
+    return float(start_price) * np.exp(np.cumsum(log_returns, axis=1))
+
+
+def simulate(position, scenario, eth_prices):
+    """
+    Runs one batch of `eth_prices` paths, shape (paths, steps), from `position`. Returns per path whether the
+    comptroller collateral factor was breached, the number of tends and the highest collateral factor reached.
+    """
+    p = position.to_float()
+    paths, steps = eth_prices.shape
+    breached = np.zeros(paths, dtype=bool)
+    tends = np.zeros(paths, dtype=np.int64)
+    worst = np.zeros(paths)
+
+    borrow_growth = 1 + scenario.borrow_rate_per_block * scenario.step_blocks
+    share_growth = 1 + scenario.price_per_share_growth_per_block * scenario.step_blocks
+    # the rates tendTrigger weighs a tend with, as the contract reads them
+    yield_per_second = scenario.price_per_share_growth_per_block * MANTISSA / SECONDS_PER_BLOCK
+    borrow_rate_per_block = scenario.borrow_rate_per_block * MANTISSA
+    for step in range(steps):
+        p = replace(
+            p,
+            borrowed_price=eth_prices[:, step],
+            borrowed_owed=p.borrowed_owed * borrow_growth,
+            price_per_share=p.price_per_share * share_growth,
+        )
+
+        usd_total = p.value_of_total_collateral
+        current = p.value_of_borrowed_owed * MANTISSA / np.where(usd_total == 0, 1, usd_total)
+        worst = np.maximum(worst, current)
+        breached |= current > p.collateral_factor
+
+        block = (step + 1) * scenario.step_blocks
+        if block % scenario.tend_interval_blocks < scenario.step_blocks:
+            # no harvest is simulated, so what a tend gains runs to the end of the scenario
+            horizon = (scenario.blocks - block) * SECONDS_PER_BLOCK
+            trigger = tend_trigger(p, scenario.call_cost_in_want, yield_per_second, borrow_rate_per_block, horizon) & ~breached
+            p = _select(trigger, rebalance(p), p)
+            tends += trigger
+
+    return breached, tends, worst
+
+
+def _run_batch(position, scenario, paths, seed):
+    rng = np.random.default_rng(seed)
+    eth_prices = eth_price_paths(rng, position.borrowed_price, scenario, paths)
+    return simulate(position, scenario, eth_prices)
+
+
+def liquidation_risk(position, scenario=Scenario(), paths=10_000, batch_size=1_000, workers=None, seed=0):
+    """
+    Probability that `position` breaches the comptroller collateral factor within `scenario.blocks`.
+    `workers=1` runs the batches in this process.
+    """
+    batches = [min(batch_size, paths - start) for start in range(0, paths, batch_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    args = ([position] * len(batches), [scenario] * len(batches), batches, seeds)
+
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        results = list(map(_run_batch, *args))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_run_batch, *args))
+
+    breached, tends, worst = (np.concatenate(result) for result in zip(*results))
+    return RiskReport(paths=paths, breached=int(breached.sum()), mean_tends=float(tends.mean()), worst_collateral_factor=worst)
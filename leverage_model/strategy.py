@@ -0,0 +1,337 @@
+"""
+Off-chain reference model of `Strategy`'s accounting.
+
+Every field of a `Position` is a NumPy array (or scalar) and all of them broadcast together, so one call evaluates
+as many positions or price scenarios as the arrays hold. Integer inputs are kept as exact Python ints (object arrays)
+and reproduce the contract's floor divisions bit for bit, float inputs run at NumPy speed within float rounding.
+
+Swaps are quoted like a Uniswap V2 pool at oracle prices, the way `MockRouter` fills them.
+"""
+from dataclasses import dataclass, fields, replace
+
+import numpy as np
+
+MAX = 2 ** 256 - 1
+MANTISSA = 10 ** 18
+DUST_LOWER_BOUND = 10 ** 16  # threshold for paying off borrowed dust
+SECONDS_PER_BLOCK = 13
+LIQUIDATION_PENALTY = 8 * 10 ** 16  # the comptroller's liquidationIncentiveMantissa less 100%
+FEE_BPS = 30
+BPS = 10_000
+
+
+def _array(value):
+    array = np.asarray(value)
+    if array.dtype.kind in "iu":
+        return array.astype(object)
+    if array.dtype.kind == "O":
+        return array
+    return array.astype(np.float64)
+
+
+# np.where and np.minimum would promote plain ints to int64, keep them exact unless floats are mixed in
+def _operands(a, b):
+    a, b = _array(a), _array(b)
+    if a.dtype == np.float64 or b.dtype == np.float64:
+        return a.astype(np.float64), b.astype(np.float64)
+    return a, b
+
+
+def _where(condition, a, b):
+    return np.where(condition, *_operands(a, b))
+
+
+def _min(a, b):
+    return np.minimum(*_operands(a, b))
+
+
+@dataclass(frozen=True)
+class Position:
+    """
+    Balances are in underlying units (cToken balances already converted), prices are the oracle mantissas.
+    """
+
+    want_balance: np.ndarray
+    cwant_balance: np.ndarray
+    csupplied_balance: np.ndarray
+    xinv_balance: np.ndarray
+    borrowed_owed: np.ndarray
+    delegated_shares: np.ndarray
+    price_per_share: np.ndarray
+    want_price: np.ndarray
+    borrowed_price: np.ndarray
+    supplied_price: np.ndarray
+    xinv_price: np.ndarray
+    collateral_factor: np.ndarray
+    borrow_limit: np.ndarray
+    want_cash: np.ndarray
+    borrowed_cash: np.ndarray
+    eth_balance: np.ndarray = 0
+    collateral_tolerance: np.ndarray = 10 ** 16
+    min_redeem_precision: np.ndarray = 1
+    vault_decimals: np.ndarray = 18
+    target_offset: np.ndarray = 10 ** 17  # targetCollateralFactor() is the market factor minus 0.1 ether
+
+    def __post_init__(self):
+        for field in fields(self):
+            object.__setattr__(self, field.name, _array(getattr(self, field.name)))
+
+    def to_float(self):
+        """
+        Same position in float64, for large scenario sweeps where exact rounding doesn't matter.
+        """
+        return replace(self, **{f.name: np.asarray(getattr(self, f.name), dtype=np.float64) for f in fields(self)})
+
+    @property
+    def target_collateral_factor(self):
+        return self.collateral_factor - self.target_offset
+
+    @property
+    def value_of_cwant(self):
+        return usd_to_base(self.cwant_balance, self.want_price, True)
+
+    @property
+    def value_of_csupplied(self):
+        return usd_to_base(self.csupplied_balance, self.supplied_price, True)
+
+    @property
+    def value_of_xinv(self):
+        return usd_to_base(self.xinv_balance, self.xinv_price, True)
+
+    @property
+    def value_of_total_collateral(self):
+        return self.value_of_cwant + self.value_of_csupplied + self.value_of_xinv
+
+    @property
+    def value_of_borrowed_owed(self):
+        return usd_to_base(self.borrowed_owed, self.borrowed_price, True)
+
+    @property
+    def delegated_borrowed(self):
+        return self.shares_to_borrowed(self.delegated_shares)
+
+    @property
+    def value_of_delegated(self):
+        return usd_to_base(self.delegated_borrowed, self.borrowed_price, True)
+
+    @property
+    def estimated_total_assets(self):
+        return self.want_balance + usd_to_base(
+            self.value_of_cwant + self.value_of_delegated - self.value_of_borrowed_owed, self.want_price
+        )
+
+    def shares_to_borrowed(self, shares):
+        return shares * self.price_per_share // 10 ** self.vault_decimals
+
+    def borrowed_to_shares(self, amount):
+        passthrough = (amount == 0) | (amount == MAX)
+        return _where(passthrough, amount, amount * 10 ** self.vault_decimals // self.price_per_share)
+
+    def calculate_usd_borrow_adjustment(self):
+        return usd_borrow_adjustment(
+            self.value_of_total_collateral,
+            self.value_of_borrowed_owed,
+            self.target_collateral_factor,
+            usd_to_base(self.borrow_limit, self.borrowed_price, True),
+        )
+
+
+def usd_to_base(amount, usd_per_underlying, reverse=False):
+    amount = _array(amount)
+    passthrough = (amount == 0) | (amount == MAX)
+    divisor = _where(passthrough, 1, usd_per_underlying)
+    converted = amount * usd_per_underlying // MANTISSA if reverse else amount * MANTISSA // divisor
+    return _where(passthrough, amount, converted)
+
+
+def c_to_base(amount_ctoken, exchange_rate):
+    amount_ctoken = _array(amount_ctoken)
+    passthrough = (amount_ctoken == 0) | (amount_ctoken == MAX)
+    return _where(passthrough, amount_ctoken, amount_ctoken * exchange_rate // MANTISSA)
+
+
+def collateral_free(usd_total_collat, usd_borrow_owed, target):
+    usd_to_maintain = usd_borrow_owed * MANTISSA // target
+    return _where(usd_total_collat > usd_to_maintain, usd_total_collat - usd_to_maintain, 0)
+
+
+def usd_borrow_adjustment(usd_total_collat, usd_borrow_owed, target, usd_borrow_limit):
+    usd_total_collat = _where(usd_total_collat > DUST_LOWER_BOUND, usd_total_collat, 0)
+    usd_borrow_target = _min(usd_total_collat * target // MANTISSA, usd_borrow_limit)
+    neg = usd_borrow_owed > usd_borrow_target
+    return _where(neg, usd_borrow_owed - usd_borrow_target, usd_borrow_target - usd_borrow_owed), neg
+
+
+def amount_out(amount_in, price_in, price_out, fee_bps=FEE_BPS):
+    return amount_in * price_in * (BPS - fee_bps) // (price_out * BPS)
+
+
+def amount_in(amount_out, price_in, price_out, fee_bps=FEE_BPS):
+    # rounded up so the input always buys at least the output
+    return amount_out * price_out * BPS // (price_in * (BPS - fee_bps)) + 1
+
+
+def _select(condition, a, b):
+    return replace(a, **{f.name: _where(condition, getattr(a, f.name), getattr(b, f.name)) for f in fields(a)})
+
+
+def free_up_collateral(position, usd_collat_needed, force=False, fee_bps=FEE_BPS):
+    """
+    Plan and execute `_freeUpCollateral`: withdraw from the delegated vault, then swap redeemed want for what
+    the vault can't cover, and repay.
+    """
+    p = position
+    target = p.target_collateral_factor
+    usd_owed = p.value_of_borrowed_owed
+    usd_total = p.value_of_total_collateral
+    usd_needed = _array(usd_collat_needed)
+
+    usd_free = 0 if force else collateral_free(usd_total, usd_owed, target)
+    active = usd_free < usd_needed
+    to_max = usd_needed == MAX
+
+    usd_to_repay = _where(active & ~to_max, (usd_needed - usd_free) * target // MANTISSA, 0)
+    repay_all = to_max | (usd_owed < usd_to_repay + DUST_LOWER_BOUND)
+    borrowed_to_repay = _where(repay_all, p.borrowed_owed, usd_to_base(usd_to_repay, p.borrowed_price))
+    borrowed_to_repay = _where(active, borrowed_to_repay, 0)
+
+    # delegatedVault first
+    delegated = p.delegated_borrowed
+    all_shares = borrowed_to_repay >= delegated
+    shares = _where(all_shares, p.delegated_shares, p.borrowed_to_shares(borrowed_to_repay))
+    borrowed_from_vault = _where(all_shares, delegated, borrowed_to_repay)
+    eth = p.eth_balance + p.shares_to_borrowed(shares)
+    repaid = _where(shares > 0, _min(eth, p.borrowed_owed), 0)
+    eth = eth - repaid
+
+    # then want -> eth for what the vault can't cover
+    needs_swap = borrowed_to_repay > borrowed_from_vault
+    usd_repaid_from_vault = _min(usd_to_base(borrowed_from_vault, p.borrowed_price, True), usd_owed)
+    usd_free_after_vault = collateral_free(usd_total, usd_owed - usd_repaid_from_vault, target)
+    borrowed_short = _where(needs_swap, borrowed_to_repay - borrowed_from_vault, 0)
+
+    want_to_swap = amount_in(borrowed_short, p.want_price, p.borrowed_price, fee_bps)
+    want_redeemable = _min(
+        _min(usd_to_base(usd_free_after_vault, p.want_price), p.cwant_balance), p.want_cash
+    )
+    want_to_swap = _min(want_to_swap, want_redeemable)
+    want_to_swap = _where(needs_swap & (want_to_swap > p.min_redeem_precision), want_to_swap, 0)
+
+    # capped by what is free after the vault repayment actually went in
+    usd_free_after_repay = collateral_free(usd_total, usd_to_base(p.borrowed_owed - repaid, p.borrowed_price, True), target)
+    want_to_swap = _min(want_to_swap, usd_to_base(usd_free_after_repay, p.want_price))
+    want_to_swap = _where(want_to_swap > p.min_redeem_precision, want_to_swap, 0)
+    eth = eth + amount_out(want_to_swap, p.want_price, p.borrowed_price, fee_bps)
+    repaid_after_swap = _where(want_to_swap > 0, _min(eth, p.borrowed_owed - repaid), 0)
+    repaid = repaid + repaid_after_swap
+
+    return replace(
+        p,
+        cwant_balance=p.cwant_balance - want_to_swap,
+        want_cash=p.want_cash - want_to_swap,
+        borrowed_owed=p.borrowed_owed - repaid,
+        borrowed_cash=p.borrowed_cash + repaid,
+        delegated_shares=p.delegated_shares - shares,
+        eth_balance=eth - repaid_after_swap,
+    )
+
+
+def redeem(position, want_needed, fee_bps=FEE_BPS):
+    """
+    `_redeem`: free up collateral for `want_needed`, then redeem as much of it as the market allows.
+    Returns the new position and the want still short.
+    """
+    want_needed = _array(want_needed)
+    p = free_up_collateral(position, usd_to_base(want_needed, position.want_price, True), False, fee_bps)
+
+    want_allowed = usd_to_base(
+        collateral_free(p.value_of_total_collateral, p.value_of_borrowed_owed, p.target_collateral_factor), p.want_price
+    )
+    want_redeemable = _min(_min(_min(want_needed, p.want_cash), p.cwant_balance), want_allowed)
+    want_redeemable = _where(want_redeemable > p.min_redeem_precision, want_redeemable, 0)
+    p = replace(
+        p,
+        want_balance=p.want_balance + want_redeemable,
+        cwant_balance=p.cwant_balance - want_redeemable,
+        want_cash=p.want_cash - want_redeemable,
+    )
+
+    short = (want_needed > p.want_balance) & (want_needed != MAX)
+    return p, _where(short, want_needed - p.want_balance, 0)
+
+
+def rebalance(position, fee_bps=FEE_BPS):
+    """
+    `_rebalance`: repay down to the target collateral factor, or borrow up to it (capped by the borrow limit and
+    the market's cash) and deposit everything into the delegated vault.
+    """
+    p = position
+    usd_adjustment, neg = p.calculate_usd_borrow_adjustment()
+
+    # undercollateralized, must unwind and repay to free up collateral
+    usd_collat_to_free = _where(neg, usd_adjustment * MANTISSA // p.target_collateral_factor, 0)
+    unwound = free_up_collateral(p, usd_collat_to_free, True, fee_bps)
+
+    # overcollateralized, can borrow more
+    borrowed = _where(neg, 0, _min(usd_to_base(usd_adjustment, p.borrowed_price), p.borrowed_cash))
+    deposit = _where(borrowed > 0, p.eth_balance + borrowed, 0)
+    levered = replace(
+        p,
+        borrowed_owed=p.borrowed_owed + borrowed,
+        borrowed_cash=p.borrowed_cash - borrowed,
+        delegated_shares=p.delegated_shares + p.borrowed_to_shares(deposit),
+        eth_balance=p.eth_balance + borrowed - deposit,
+    )
+    return _select(neg, unwound, levered)
+
+
+def tend_gain(
+        usd_adjustment, neg, current, target, collateral_factor, yield_per_second=0, borrow_rate_per_block=0, horizon=0,
+        liquidation_penalty=LIQUIDATION_PENALTY
+):
+    """
+    `_usdTendGain`: the yield spread on the adjustment over `horizon` seconds, plus the weighted liquidation penalty
+    when deleveraging. `yield_per_second` is the delegated vault's share price growth, 1e18 is 100%.
+    """
+    yield_per_second = _array(yield_per_second)
+    borrow_rate = _array(borrow_rate_per_block) // SECONDS_PER_BLOCK
+    spread = _where(neg, borrow_rate - yield_per_second, yield_per_second - borrow_rate)
+    usd_gain = usd_adjustment * _where(spread > 0, spread, 0) * horizon // MANTISSA
+
+    margin = collateral_factor - target
+    risky = neg & (current > target)
+    margin_used = _min(_where(risky, current - target, 0), margin) * MANTISSA // margin
+    return usd_gain + _where(risky, usd_adjustment * liquidation_penalty // MANTISSA * margin_used // MANTISSA, 0)
+
+
+def tend_trigger(
+        position, call_cost_in_want, yield_per_second=0, borrow_rate_per_block=0, horizon=0,
+        market_collateral_factor=None, harvest_trigger=False, liquidation_penalty=LIQUIDATION_PENALTY
+):
+    """
+    `tendTrigger` with the call cost already converted by `ethToWant`. `horizon` is the time in seconds until the
+    next harvest, `maxReportDelay` less the time since the last report.
+    """
+    p = position
+    usd_total = p.value_of_total_collateral
+    usd_owed = p.value_of_borrowed_owed
+    if market_collateral_factor is None:
+        market_collateral_factor = p.collateral_factor
+
+    current = usd_owed * MANTISSA // _where(usd_total == 0, 1, usd_total)
+    target = p.target_collateral_factor
+    tolerance = p.collateral_tolerance
+
+    near_liquidation = current + tolerance >= p.collateral_factor
+    in_band = (target - tolerance <= current) & (current <= target + tolerance)
+    usd_adjustment, neg = usd_borrow_adjustment(
+        usd_total, usd_owed, target, usd_to_base(p.borrow_limit, p.borrowed_price, True)
+    )
+    usd_gain = tend_gain(
+        usd_adjustment, neg, current, target, p.collateral_factor, yield_per_second, borrow_rate_per_block, horizon,
+        liquidation_penalty
+    )
+    worth_it = (usd_adjustment != 0) & (usd_to_base(usd_gain, p.want_price) >= _array(call_cost_in_want))
+
+    tend = (_array(market_collateral_factor) != p.collateral_factor) | near_liquidation | (~in_band & worth_it)
+    return tend & (usd_total != 0) & ~np.asarray(harvest_trigger)
@@ -0,0 +1,177 @@
+"""
+Parameter sweep of the strategy's risk settings against simulated harvest and tend cycles.
+
+Every grid point runs the same Monte Carlo ETH and INV price paths (common random numbers, so points are compared
+on equal footing) through a year's worth of keeper calls in the reference model. It reports the mean net APR after
+keeper gas, the probability of breaching the comptroller collateral factor, and the gas spent. Grid points are
+evaluated in a process pool, `pareto_frontier` keeps the ones no other point beats on all three, and
+`setter_calls` turns a point into the transactions that apply it.
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .risk import BLOCKS_PER_YEAR, Scenario, eth_price_paths
+from .strategy import BPS, FEE_BPS, MANTISSA, SECONDS_PER_BLOCK, _select, rebalance, tend_trigger
+
+DEFAULT_TARGET_OFFSET = 10 ** 17
+
+
+@dataclass(frozen=True)
+class Params:
+    target_offset: int  # targetCollateralFactor() = market collateral factor - target_offset
+    collateral_tolerance: int
+    borrow_limit: int
+    percent_reward_to_sell: int
+
+
+@dataclass(frozen=True)
+class Economics:
+    supply_rate_per_block: float = 0.0  # cWant supplyRatePerBlock
+    reward_usd_per_block: float = 0.0  # INV distributed to the strategy, in USD
+    inv_volatility: float = 1.2
+    harvest_interval_blocks: int = 6_500 * 7
+    harvest_gas: int = 2_000_000
+    tend_gas: int = 1_000_000
+    gas_price_gwei: float = 50.0
+    liquidation_incentive: float = 0.08  # share of the debt lost when liquidated
+
+
+@dataclass(frozen=True)
+class Outcome:
+    params: Params
+    net_apr: float
+    liquidation_risk: float
+    gas_per_year: float  # in want
+
+
+def grid(target_offsets, collateral_tolerances, borrow_limits, percents_reward_to_sell):
+    return [Params(*values) for values in itertools.product(target_offsets, collateral_tolerances, borrow_limits, percents_reward_to_sell)]
+
+
+def _value(p):
+    # estimatedTotalAssets plus the xINV kept as collateral, in want
+    return p.estimated_total_assets + p.value_of_xinv * MANTISSA / p.want_price
+
+
+def simulate_cycles(position, params, scenario, economics, eth_prices, inv_prices):
+    """
+    Runs one set of price paths, shape (paths, steps), with `params` applied. Returns per path the net APR,
+    whether it was liquidated and the keeper gas spent in want.
+    """
+    p = replace(
+        position.to_float(),
+        target_offset=params.target_offset,
+        collateral_tolerance=params.collateral_tolerance,
+        borrow_limit=params.borrow_limit,
+    )
+    p = rebalance(p)
+    start = _value(p)
+
+    paths, steps = eth_prices.shape
+    rewards = np.zeros(paths)
+    gas = np.zeros(paths)
+    breached = np.zeros(paths, dtype=bool)
+    liquidated_value = np.zeros(paths)
+
+    borrow_growth = 1 + scenario.borrow_rate_per_block * scenario.step_blocks
+    share_growth = 1 + scenario.price_per_share_growth_per_block * scenario.step_blocks
+    supply_growth = 1 + economics.supply_rate_per_block * scenario.step_blocks
+    swap = (BPS - FEE_BPS) / BPS
+    yield_per_second = scenario.price_per_share_growth_per_block * MANTISSA / SECONDS_PER_BLOCK
+    borrow_rate_per_block = scenario.borrow_rate_per_block * MANTISSA
+    for step in range(steps):
+        p = replace(
+            p,
+            borrowed_price=eth_prices[:, step],
+            xinv_price=inv_prices[:, step],
+            borrowed_owed=p.borrowed_owed * borrow_growth,
+            price_per_share=p.price_per_share * share_growth,
+            cwant_balance=p.cwant_balance * supply_growth,
+        )
+        rewards += economics.reward_usd_per_block * scenario.step_blocks * MANTISSA * MANTISSA / p.xinv_price
+
+        usd_total = p.value_of_total_collateral
+        newly_breached = (p.value_of_borrowed_owed * MANTISSA > usd_total * p.collateral_factor) & ~breached
+        penalty = economics.liquidation_incentive * p.value_of_borrowed_owed * MANTISSA / p.want_price
+        liquidated_value = np.where(newly_breached, _value(p) - penalty, liquidated_value)
+        breached |= newly_breached
+        active = ~breached
+
+        # want per unit of gas, as ethToWant prices it
+        gas_in_want = economics.gas_price_gwei * 1e9 * p.borrowed_price / p.want_price
+        block = (step + 1) * scenario.step_blocks
+        if block % economics.harvest_interval_blocks < scenario.step_blocks:
+            # prepareReturn sells delegated profits and part of the INV, adjustPosition supplies it and rebalances
+            sold = rewards * params.percent_reward_to_sell / 100
+            profit = np.maximum(p.delegated_borrowed - p.borrowed_owed, 0)
+            want_in = (sold * p.xinv_price * swap * swap + profit * p.borrowed_price * swap) / p.want_price
+            harvested = replace(
+                p,
+                cwant_balance=p.cwant_balance + want_in,
+                xinv_balance=p.xinv_balance + rewards - sold,
+                delegated_shares=p.delegated_shares - p.borrowed_to_shares(profit),
+            )
+            p = _select(active, rebalance(harvested), p)
+            rewards = np.where(active, 0, rewards)
+            gas += np.where(active, economics.harvest_gas * gas_in_want, 0)
+        elif block % scenario.tend_interval_blocks < scenario.step_blocks:
+            # a tend gains until the next harvest rebalances anyway
+            horizon = (economics.harvest_interval_blocks - block % economics.harvest_interval_blocks) * SECONDS_PER_BLOCK
+            trigger = tend_trigger(p, economics.tend_gas * gas_in_want, yield_per_second, borrow_rate_per_block, horizon) & active
+            p = _select(trigger, rebalance(p), p)
+            gas += np.where(trigger, economics.tend_gas * gas_in_want, 0)
+
+    end = np.where(breached, liquidated_value, _value(p) + rewards * p.xinv_price / p.want_price)
+    years = scenario.steps * scenario.step_blocks / BLOCKS_PER_YEAR
+    return (end - gas - start) / start / years, breached, gas / years
+
+
+def evaluate(position, params, scenario=Scenario(), economics=Economics(), paths=1_000, seed=0):
+    rng = np.random.default_rng(seed)
+    eth_prices = eth_price_paths(rng, position.borrowed_price, scenario, paths)
+    inv_prices = eth_price_paths(rng, position.xinv_price, replace(scenario, eth_volatility=economics.inv_volatility, eth_drift=0.0), paths)
+    apr, breached, gas = simulate_cycles(position, params, scenario, economics, eth_prices, inv_prices)
+    return Outcome(params=params, net_apr=float(apr.mean()), liquidation_risk=float(breached.mean()), gas_per_year=float(gas.mean()))
+
+
+def sweep(position, candidates, scenario=Scenario(), economics=Economics(), paths=1_000, seed=0, workers=None):
+    """
+    Evaluates every `Params` in `candidates` on the same price paths. `workers=1` runs them in this process.
+    """
+    count = len(candidates)
+    args = ([position] * count, candidates, [scenario] * count, [economics] * count, [paths] * count, [seed] * count)
+
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        return list(map(evaluate, *args))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(evaluate, *args))
+
+
+def _dominates(a, b):
+    no_worse = a.net_apr >= b.net_apr and a.liquidation_risk <= b.liquidation_risk and a.gas_per_year <= b.gas_per_year
+    better = a.net_apr > b.net_apr or a.liquidation_risk < b.liquidation_risk or a.gas_per_year < b.gas_per_year
+    return no_worse and better
+
+
+def pareto_frontier(outcomes):
+    """
+    Outcomes no other outcome beats on net APR, liquidation risk and gas at once, best APR first.
+    """
+    frontier = [a for a in outcomes if not any(_dominates(b, a) for b in outcomes)]
+    return sorted(frontier, key=lambda outcome: -outcome.net_apr)
+
+
+def setter_calls(params, strategy="strategy", gov="gov", management="strategist"):
+    calls = [
+        f'{strategy}.setCollateralTolerance({params.collateral_tolerance}, {{"from": {gov}}})',
+        f'{strategy}.setBorrowLimit({params.borrow_limit}, {{"from": {management}}})',
+        f'{strategy}.setPercentRewardToSell({params.percent_reward_to_sell}, {{"from": {management}}})',
+    ]
+    if params.target_offset != DEFAULT_TARGET_OFFSET:
+        calls.append(f"# targetCollateralFactor() offset {params.target_offset} is a constant in Strategy, it has no setter")
+    return calls
@@ -0,0 +1,42 @@
+"""
+Lazy access to the yearn-vaults package for scripts.
+
+Loading the package as a brownie project compiles or loads every contract in it. Most scripts only need the
+Vault ABI, so it is read from the package's build artifact, as long as its source hash still matches the source.
+The project is loaded only when the artifact is missing or stale, and that load writes a fresh artifact for the
+next run. Both lookups are cached for the life of the process.
+"""
+import json
+from functools import lru_cache
+from hashlib import sha1
+from pathlib import Path
+
+from brownie import Contract, config, project
+
+PACKAGE = config["dependencies"][0]
+API_VERSION = PACKAGE.split("@")[-1]
+
+
+def package_path():
+    return Path.home() / ".brownie" / "packages" / PACKAGE
+
+
+@lru_cache(maxsize=None)
+def load_package():
+    # the test fixtures may have loaded it already, share that copy
+    return project.load(package_path(), raise_if_loaded=False)
+
+
+@lru_cache(maxsize=None)
+def abi(name):
+    artifact = package_path() / "build" / "contracts" / f"{name}.json"
+    if artifact.exists():
+        build = json.loads(artifact.read_text())
+        source = package_path() / build["sourcePath"]
+        if source.exists() and sha1(source.read_text().encode()).hexdigest() == build["sha1"]:
+            return build["abi"]
+    return getattr(load_package(), name).abi
+
+
+def vault_at(address):
+    return Contract.from_abi("Vault", address, abi("Vault"))
@@ -1,13 +1,24 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from brownie import Strategy, accounts, config, network, project, web3
+from brownie import Strategy, accounts, network, web3
 from eth_utils import is_checksum_address
 import click
+import yaml
 
-API_VERSION = config["dependencies"][0].split("@")[-1]
-Vault = project.load(
-    Path.home() / ".brownie" / "packages" / config["dependencies"][0]
-).Vault
+from scripts.dependencies import API_VERSION, vault_at
+
+
+# manifest fields that hold an address or an ENS name
+ADDRESS_FIELDS = ("vault", "cWant", "cBorrowed", "delegatedVault", "keeper", "original")
+
+
+def resolve_address(val: str) -> str:
+    if is_checksum_address(val):
+        return val
+    return web3.ens.address(val)
 
 
 def get_address(msg: str, default: str = None) -> str:
@@ -18,7 +29,7 @@ def get_address(msg: str, default: str = None) -> str:
 
         if is_checksum_address(val):
             return val
-        elif addr := web3.ens.address(val):
+        elif addr := resolve_address(val):
             click.echo(f"Found ENS '{val}' [{addr}]")
             return addr
 
@@ -35,7 +46,7 @@ def main():
     print(f"You are using: 'dev' [{dev.address}]")
 
     if input("Is there a Vault for this strategy already? y/[N]: ").lower() == "y":
-        vault = Vault.at(get_address("Deployed Vault: "))
+        vault = vault_at(get_address("Deployed Vault: "))
         assert vault.apiVersion() == API_VERSION
     else:
         print("You should deploy one vault using scripts from Vault project")
@@ -51,8 +62,138 @@ def main():
     symbol: '{vault.symbol()}'
     """
     )
+    cWant = get_address("cWant market: ")
+    cBorrowed = get_address("cBorrowed market: ")
+    delegatedVault = get_address("Delegated vault: ")
+    name = click.prompt("Strategy name")
+
+    # Clone an already deployed Strategy when there is one, it costs a fraction of a full deploy
+    if input("Clone an existing Strategy? y/[N]: ").lower() == "y":
+        original = Strategy.at(get_address("Original Strategy: "))
+        assert original.isOriginal()
+        if input("Clone Strategy? y/[N]: ").lower() != "y":
+            return
+
+        tx = original.cloneStrategy(
+            vault, dev, dev, dev, cWant, cBorrowed, delegatedVault, name, {"from": dev}
+        )
+        strategy = Strategy.at(tx.events["Cloned"]["clone"])
+        print(f"Cloned Strategy at {strategy.address}")
+        return
+
     publish_source = click.confirm("Verify source on etherscan?")
     if input("Deploy Strategy? y/[N]: ").lower() != "y":
         return
 
-    strategy = Strategy.deploy(vault, {"from": dev}, publish_source=publish_source)
+    strategy = Strategy.deploy(
+        vault, cWant, cBorrowed, delegatedVault, name, {"from": dev}, publish_source=publish_source
+    )
+
+
+def load_manifest(path):
+    """
+    Strategies to deploy, from a YAML (or JSON) file:
+
+        defaults:                   # optional, applied to every strategy
+          keeper: keeper.ychad.eth
+          borrow_limit: 1000000000000000000000
+          percent_reward_to_sell: 10
+          original: "0x..."         # optional, clone this Strategy instead of deploying new ones
+        strategies:
+          - vault: "0x..."
+            cWant: "0x..."
+            cBorrowed: "0x..."
+            delegatedVault: "0x..."
+            name: StrategyInverseDolaLeverage
+
+    Every address may be an ENS name, all of them are resolved concurrently.
+    """
+    manifest = yaml.safe_load(Path(path).read_text())
+    entries = [{**manifest.get("defaults", {}), **entry} for entry in manifest["strategies"]]
+
+    names = {entry[field] for entry in entries for field in ADDRESS_FIELDS if entry.get(field)}
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        resolved = dict(zip(names, pool.map(resolve_address, names)))
+    missing = sorted(name for name, address in resolved.items() if not address)
+    if missing:
+        raise ValueError(f"not checksummed addresses or valid ENS records: {', '.join(missing)}")
+    return [{**entry, **{f: resolved[entry[f]] for f in ADDRESS_FIELDS if entry.get(f)}} for entry in entries]
+
+
+def send_all(dev, calls):
+    """
+    Sends every (function, args) on consecutive nonces without waiting for receipts in between, then waits for
+    all of them. Returns the receipts in order.
+    """
+    nonce = web3.eth.get_transaction_count(dev.address, "pending")
+    sent = [fn(*args, {"from": dev, "nonce": nonce + i, "required_confs": 0}) for i, (fn, args) in enumerate(calls)]
+    # a deploy that confirms right away (development chains) comes back as the contract
+    receipts = [getattr(tx, "tx", tx) for tx in sent]
+    for receipt in receipts:
+        receipt.wait(1)
+    failed = [receipt.txid for receipt in receipts if receipt.status != 1]
+    if failed:
+        raise RuntimeError(f"reverted: {', '.join(failed)}")
+    return receipts
+
+
+def deploy_batch(dev, entries, publish_source=False):
+    """
+    Deploys (or clones) one Strategy per manifest entry, then applies the keeper, borrow limit and reward
+    percentage they set. Each of the two stages is one pipelined batch of transactions.
+    """
+    vaults = sorted({entry["vault"] for entry in entries})
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        versions = dict(zip(vaults, pool.map(lambda vault: vault_at(vault).apiVersion(), vaults)))
+    wrong = [vault for vault, version in versions.items() if version != API_VERSION]
+    if wrong:
+        raise ValueError(f"vaults not on {API_VERSION}: {', '.join(wrong)}")
+
+    deploys = []
+    for entry in entries:
+        markets = (entry["cWant"], entry["cBorrowed"], entry["delegatedVault"], entry["name"])
+        if entry.get("original"):
+            original = Strategy.at(entry["original"])
+            deploys.append((original.cloneStrategy, (entry["vault"], dev, dev, dev, *markets)))
+        else:
+            deploys.append((Strategy.deploy, (entry["vault"], *markets)))
+
+    strategies = []
+    for entry, receipt in zip(entries, send_all(dev, deploys)):
+        address = receipt.events["Cloned"]["clone"] if entry.get("original") else receipt.contract_address
+        strategies.append(Strategy.at(address))
+    if publish_source:
+        for strategy in strategies:
+            if strategy.isOriginal():
+                Strategy.publish_source(strategy)
+
+    setup = []
+    for entry, strategy in zip(entries, strategies):
+        if entry.get("keeper"):
+            setup.append((strategy.setKeeper, (entry["keeper"],)))
+        if entry.get("borrow_limit") is not None:
+            setup.append((strategy.setBorrowLimit, (int(entry["borrow_limit"]),)))
+        if entry.get("percent_reward_to_sell") is not None:
+            setup.append((strategy.setPercentRewardToSell, (int(entry["percent_reward_to_sell"]),)))
+    send_all(dev, setup)
+    return strategies
+
+
+def batch(manifest, account=None):
+    """
+    Non-interactive deployment of every strategy in `manifest`:
+
+        brownie run deploy batch strategies.yml deployer --network mainnet
+
+    Without an account id the first local account is used, e.g. for a dry run on a development chain. The
+    keystore password is read from DEPLOYER_PASSWORD.
+    """
+    print(f"You are using the '{network.show_active()}' network")
+    dev = accounts[0] if account is None else accounts.load(account, password=os.environ.get("DEPLOYER_PASSWORD"))
+    entries = load_manifest(manifest)
+
+    start = time.time()
+    strategies = deploy_batch(dev, entries, publish_source=bool(os.environ.get("PUBLISH_SOURCE")))
+    for entry, strategy in zip(entries, strategies):
+        print(f"{entry['name']} for {entry['vault']}: {strategy.address}")
+    print(f"{len(strategies)} strategies in {time.time() - start:.1f}s")
@@ -0,0 +1,174 @@
+"""
+Gas attribution of a strategy transaction.
+
+Walks the expanded opcode trace of a transaction (`tx.trace`, what `tx.call_trace()` is built from) and charges
+every step's own gas to the stack it ran under, internal Strategy functions included. A CALL is charged only the
+call overhead; what the callee spends goes to the callee's frames. The result is grouped three ways:
+
+- by full stack, in the collapsed format flamegraph.pl, inferno and speedscope read
+- by Strategy function, inclusive of everything it calls
+- by the external contract the strategy called into (oracle, comptroller, cWant, ...), including whatever that
+  contract calls in turn
+
+    brownie run gas_profile --network mainnet-fork
+
+`withdraw` profiles `vault.withdraw` from a depositor, with the strategy paying out whatever the vault's loose
+balance doesn't cover.
+"""
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+from brownie import Strategy, accounts, interface, network
+import click
+
+from scripts.dependencies import vault_at
+
+ACTIONS = ("harvest", "tend", "withdraw")
+
+
+def targets(strategy):
+    """
+    Labels for the contracts a Strategy calls into, by address.
+    """
+    cWant = interface.CErc20Interface(strategy.cWant())
+    comptroller = interface.ComptrollerInterface(cWant.comptroller())
+    labels = {
+        "want": strategy.want(),
+        "oracle": comptroller.oracle(),
+        "comptroller": comptroller.address,
+        "cWant": cWant.address,
+        "cBorrowed": strategy.cBorrowed(),
+        "cSupplied": strategy.cSupplied(),
+        "xInv": strategy.xInv(),
+        "router": strategy.router(),
+        "delegatedVault": strategy.delegatedVault(),
+        "vault": strategy.vault(),
+        "flashLender": strategy.flashLender(),
+    }
+    return {str(address): label for label, address in labels.items()}
+
+
+def _step_costs(trace):
+    # gas of each step on its own, a call step gets what the call cost beyond the callee's execution
+    costs = [0] * len(trace)
+    calls = []  # [index of the call step, gas spent in the callee so far]
+    for i, step in enumerate(trace):
+        following = trace[i + 1] if i + 1 < len(trace) else None
+        if following is not None and following["depth"] > step["depth"]:
+            calls.append([i, 0])
+            continue
+        if following is None or following["depth"] < step["depth"]:
+            cost = step["gasCost"]
+        else:
+            cost = step["gas"] - following["gas"]
+        costs[i] = cost
+        if calls:
+            calls[-1][1] += cost
+
+        if following is not None and following["depth"] < step["depth"] and calls:
+            index, inner = calls.pop()
+            costs[index] = trace[index]["gas"] - following["gas"] - inner
+            if calls:
+                calls[-1][1] += trace[index]["gas"] - following["gas"]
+    return costs
+
+
+@dataclass(frozen=True)
+class Profile:
+    stacks: Dict[Tuple[str, ...], int]
+    functions: Dict[str, int]
+    targets: Dict[str, int]
+
+    @property
+    def total(self):
+        return sum(self.stacks.values())
+
+    def collapsed(self):
+        """
+        One `frame;frame;frame gas` line per stack.
+        """
+        return "".join(f"{';'.join(stack)} {gas}\n" for stack, gas in sorted(self.stacks.items()))
+
+    def table(self):
+        total = self.total
+        lines = [f"{'gas':>10} {'share':>6}  by Strategy function, inclusive"]
+        lines += [f"{gas:>10} {gas / total:>6.1%}  {name}" for name, gas in sorted(self.functions.items(), key=lambda item: -item[1])]
+        lines += ["", f"{'gas':>10} {'share':>6}  by external target"]
+        lines += [f"{gas:>10} {gas / total:>6.1%}  {name}" for name, gas in sorted(self.targets.items(), key=lambda item: -item[1])]
+        return "\n".join(lines)
+
+
+def profile(tx, strategy, labels=None):
+    """
+    Attributes the gas of `tx` for `strategy`. `labels` names external targets by address, see `targets`.
+    """
+    # brownie doesn't promise checksummed addresses in the trace
+    labels = {str(address).lower(): label for address, label in (labels or {}).items()}
+    trace = tx.trace
+    strategy = str(strategy).lower()
+
+    stacks = defaultdict(int)
+    functions = defaultdict(int)
+    by_target = defaultdict(int)
+    base = trace[0]["depth"]
+    frames = []  # per call depth: [address, contract name, internal function stack]
+    for step, cost in zip(trace, _step_costs(trace)):
+        depth = step["depth"] - base
+        del frames[depth + 1:]
+        if len(frames) <= depth:
+            address = str(step["address"]).lower()
+            frames.append([address, step["contractName"] or address, []])
+        frame = frames[depth]
+        del frame[2][step["jumpDepth"]:]
+        frame[2].append(step["fn"])
+
+        stacks[tuple(fn for _, _, stack in frames for fn in stack)] += cost
+        for fn in {fn for address, _, stack in frames if address == strategy for fn in stack}:
+            functions[fn] += cost
+
+        entered = [i for i, (address, _, _) in enumerate(frames) if address == strategy]
+        if not entered:
+            # the caller's own code, e.g. the vault around a withdraw
+            address, name, _ = frames[0]
+        elif entered[0] + 1 < len(frames):
+            address, name, _ = frames[entered[0] + 1]
+        else:
+            address, name = strategy, "Strategy (own code)"
+        by_target[labels.get(address, name)] += cost
+
+    return Profile(stacks=dict(stacks), functions=dict(functions), targets=dict(by_target))
+
+
+def transact(strategy, action, account, shares=None):
+    """
+    Sends `action` from `account`: a strategy harvest or tend, or a withdrawal of `shares` (all by default) from
+    the strategy's vault.
+    """
+    if action == "withdraw":
+        vault = vault_at(strategy.vault())
+        shares = vault.balanceOf(account) if shares is None else shares
+        return vault.withdraw(shares, {"from": account})
+    return getattr(strategy, action)({"from": account})
+
+
+def main():
+    print(f"You are using the '{network.show_active()}' network")
+    strategy = Strategy.at(click.prompt("Strategy"))
+    action = click.prompt("Transaction", type=click.Choice(ACTIONS), default="harvest")
+
+    # on a fork, send as the strategy's keeper or as any depositor
+    shares = None
+    if action == "withdraw":
+        account = accounts.at(click.prompt("Depositor"), force=True)
+        shares = click.prompt("Shares", type=int, default=vault_at(strategy.vault()).balanceOf(account))
+    else:
+        account = accounts.at(strategy.keeper(), force=True)
+    tx = transact(strategy, action, account, shares)
+    result = profile(tx, strategy, targets(strategy))
+
+    path = f"{action}.folded"
+    with open(path, "w") as file:
+        file.write(result.collapsed())
+    print(result.table())
+    print(f"\n{result.total} gas in {len(result.stacks)} stacks, flame graph input written to {path}")
@@ -0,0 +1,156 @@
+"""
+Indexes the Strategy position events into SQLite.
+
+Logs of every strategy are fetched in block ranges, `batch_blocks` at a time, and stored with one table per
+event and one column per field. Progress is kept per strategy, so `sync` can be called again at any time to pick
+up from where it stopped. History questions then become local queries:
+
+    SELECT block, timestamp, CAST(collateral_factor AS REAL) / 1e18 FROM repaid WHERE strategy = ? ORDER BY block
+
+The events carry amounts only. The tables of position moves also get the `collateral_factor` it left behind, the
+borrowed value over the total collateral from `positionSnapshot` at the end of the event's block, so indexing an
+old range needs a node that serves historical state.
+
+Every event field is a uint256, past the 64 bits of a SQLite INTEGER, so it is stored exactly as a TEXT decimal
+string. Convert it in the query, with CAST as above for analytics, or with int() in Python for exact amounts.
+
+    brownie run indexer --network mainnet
+"""
+import sqlite3
+import time
+from pathlib import Path
+
+from brownie import network, web3
+from hexbytes import HexBytes
+import click
+
+from scripts.state_reader import POSITION_SNAPSHOT, WORD, PositionSnapshot, _record
+
+DATABASE = Path(__file__).resolve().parent.parent / "strategy-events.db"
+
+# table => (event name, fields), every field is a uint256 in the event data
+EVENTS = {
+    "harvested": ("Harvested", ("profit", "loss", "debt_payment", "debt_outstanding")),
+    "borrowed": ("Borrowed", ("amount", "delegated")),
+    "repaid": ("Repaid", ("amount", "shares_withdrawn", "want_swapped")),
+    "delegated_profit_sold": ("DelegatedProfitSold", ("borrowed_sold", "want_out")),
+    "lending_profit_redeemed": ("LendingProfitRedeemed", ("want_redeemed",)),
+    "reward_sold": ("RewardSold", ("reward_sold", "want_out")),
+    "collateral_supplied": ("CollateralSupplied", ("ctoken_amount",)),
+    "collateral_removed": ("CollateralRemoved", ("ctoken_amount",)),
+}
+# tables of the events that move the position, stored with the collateral factor derived after them
+POSITION_TABLES = ("borrowed", "repaid", "collateral_supplied", "collateral_removed")
+
+
+def _columns(table, fields):
+    return (*fields, "collateral_factor") if table in POSITION_TABLES else fields
+
+
+def _topic(name, fields):
+    return bytes(web3.keccak(text=f"{name}({','.join(['uint256'] * len(fields))})"))
+
+
+class Indexer:
+    def __init__(self, strategies, path=DATABASE, batch_blocks=2_000, confirmations=0, from_block=0):
+        self.strategies = [str(strategy) for strategy in strategies]
+        self.batch_blocks = batch_blocks
+        self.confirmations = confirmations
+        self.from_block = from_block
+        self.topics = {_topic(name, fields): (table, fields) for table, (name, fields) in EVENTS.items()}
+
+        self.db = sqlite3.connect(str(path))
+        for table, (_, fields) in EVENTS.items():
+            columns = "".join(f", {column} TEXT" for column in _columns(table, fields))
+            self.db.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} (block INTEGER, log_index INTEGER, timestamp INTEGER, "
+                f"tx TEXT, strategy TEXT{columns}, PRIMARY KEY (block, log_index))"
+            )
+            self.db.execute(f"CREATE INDEX IF NOT EXISTS {table}_strategy ON {table} (strategy, block)")
+        self.db.execute("CREATE TABLE IF NOT EXISTS progress (strategy TEXT PRIMARY KEY, block INTEGER)")
+        self.db.commit()
+
+    def indexed_to(self, strategy):
+        row = self.db.execute("SELECT block FROM progress WHERE strategy = ?", (strategy,)).fetchone()
+        return self.from_block - 1 if row is None else row[0]
+
+    def _logs(self, start, end):
+        try:
+            return web3.eth.get_logs(
+                {"address": self.strategies, "fromBlock": start, "toBlock": end, "topics": [list(self.topics)]}
+            )
+        except ValueError:
+            # providers cap the logs per request, split the range until it fits
+            if end == start:
+                raise
+            middle = (start + end) // 2
+            return self._logs(start, middle) + self._logs(middle + 1, end)
+
+    def _collateral_factor(self, strategy, block):
+        data = web3.eth.call({"to": strategy, "data": "0x" + POSITION_SNAPSHOT.hex()}, block)
+        position = _record(PositionSnapshot, True, data)
+        if position is None or position.value_of_total_collateral == 0:
+            return 0
+        return position.value_of_borrowed_owed * 10 ** 18 // position.value_of_total_collateral
+
+    def _rows(self, logs):
+        timestamps = {}
+        collateral_factors = {}
+        rows = {}
+        for log in logs:
+            table, fields = self.topics[bytes(log["topics"][0])]
+            block = log["blockNumber"]
+            if block not in timestamps:
+                timestamps[block] = web3.eth.get_block(block)["timestamp"]
+            data = HexBytes(log["data"])
+            values = [str(int.from_bytes(data[i * WORD:(i + 1) * WORD], "big")) for i in range(len(fields))]
+            if table in POSITION_TABLES:
+                # one read per strategy and block, however many moves the block has
+                key = (log["address"], block)
+                if key not in collateral_factors:
+                    collateral_factors[key] = self._collateral_factor(log["address"], block)
+                values.append(str(collateral_factors[key]))
+            row = (block, log["logIndex"], timestamps[block], log["transactionHash"].hex(), log["address"], *values)
+            rows.setdefault(table, []).append(row)
+        return rows
+
+    def sync(self, to_block=None):
+        """
+        Stores every event up to `to_block` (default: the latest block less `confirmations`). Returns the
+        number of new rows.
+        """
+        if to_block is None:
+            to_block = web3.eth.block_number - self.confirmations
+        start = min(self.indexed_to(strategy) for strategy in self.strategies) + 1
+
+        stored = 0
+        for batch_start in range(start, to_block + 1, self.batch_blocks):
+            batch_end = min(batch_start + self.batch_blocks - 1, to_block)
+            for table, rows in self._rows(self._logs(batch_start, batch_end)).items():
+                placeholders = ", ".join("?" * len(rows[0]))
+                before = self.db.total_changes
+                self.db.executemany(f"INSERT OR IGNORE INTO {table} VALUES ({placeholders})", rows)
+                stored += self.db.total_changes - before
+            self.db.executemany(
+                "INSERT OR REPLACE INTO progress VALUES (?, ?)", [(strategy, batch_end) for strategy in self.strategies]
+            )
+            # a batch and its progress commit together, an interrupted sync resumes at the batch
+            self.db.commit()
+        return stored
+
+
+def main():
+    print(f"You are using the '{network.show_active()}' network")
+    strategies = [address.strip() for address in click.prompt("Strategies, comma separated").split(",")]
+    indexer = Indexer(
+        strategies,
+        path=click.prompt("Database", default=str(DATABASE)),
+        from_block=click.prompt("First block", default=0),
+        confirmations=click.prompt("Confirmations", default=12),
+    )
+    interval = click.prompt("Seconds between syncs, 0 to sync once", default=0)
+    while True:
+        print(f"{indexer.sync()} new events")
+        if not interval:
+            return
+        time.sleep(interval)
@@ -0,0 +1,138 @@
+"""
+Keeper for many strategies.
+
+Every `interval` seconds one batched read through scripts/state_reader.py evaluates `tendTrigger` and
+`harvestTrigger` of every strategy, priced at the current gas price times the gas each call takes. The strategies
+that fire are sent concurrently from one account. Each send takes its nonce from a local counter, so none of them
+waits for another's receipt. A strategy with a transaction in flight is skipped until it settles, and one whose
+transaction failed is retried after an exponential backoff.
+
+    brownie run keeper --network mainnet
+"""
+import asyncio
+import functools
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from brownie import Strategy, accounts, network, web3
+from brownie.network.transaction import Status
+import click
+
+from scripts.state_reader import StateReader, load_multicall
+
+# gas the triggers are priced at, the same estimates leverage_model.sweep.Economics uses
+TEND_GAS = 1_000_000
+HARVEST_GAS = 2_000_000
+
+
+@dataclass
+class Job:
+    strategy: object
+    pending: Optional[object] = None  # TransactionReceipt in flight
+    failures: int = 0
+    not_before: float = 0.0
+
+
+class Keeper:
+    def __init__(self, account, strategies, multicall, interval=60, backoff=30, max_backoff=3_600, gas_price=None, clock=time.monotonic):
+        self.account = account
+        self.jobs = {strategy.address: Job(strategy) for strategy in strategies}
+        self.reader = StateReader(multicall, strategies)
+        self.interval = interval
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.gas_price = gas_price or (lambda: web3.eth.gas_price)
+        self.clock = clock
+        self._nonce = None
+
+    async def _run(self, fn, *args, **kwargs):
+        # brownie and web3 block, run them off the event loop so sends overlap
+        return await asyncio.get_running_loop().run_in_executor(None, functools.partial(fn, *args, **kwargs))
+
+    def _fail(self, job):
+        job.failures += 1
+        job.not_before = self.clock() + min(self.backoff * 2 ** (job.failures - 1), self.max_backoff)
+
+    def _ready(self, job):
+        if job.pending is not None:
+            if job.pending.status == Status.Pending:
+                return False
+            if job.pending.status == Status.Confirmed:
+                job.failures = 0
+            else:
+                self._fail(job)
+            job.pending = None
+        return self.clock() >= job.not_before
+
+    async def _next_nonce(self):
+        if self._nonce is None:
+            count = await self._run(web3.eth.get_transaction_count, self.account.address, "pending")
+            if self._nonce is None:
+                self._nonce = count
+        nonce = self._nonce
+        self._nonce += 1
+        return nonce
+
+    async def _send(self, job, action, gas_price):
+        nonce = await self._next_nonce()
+        try:
+            tx = await self._run(
+                getattr(job.strategy, action),
+                {"from": self.account, "nonce": nonce, "gas_price": gas_price, "required_confs": 0},
+            )
+        except Exception as e:
+            # the nonce may not have been used, take the count from the node again
+            self._nonce = None
+            self._fail(job)
+            print(f"{action} {job.strategy.address} failed: {e}")
+            return None
+        job.pending = tx
+        return job.strategy.address, action, tx
+
+    async def poll(self):
+        """
+        One round: reads every trigger in one call and sends what fired. Returns (strategy, action, tx) per send.
+        """
+        ready = {address for address, job in self.jobs.items() if self._ready(job)}
+        if not ready:
+            return []
+
+        gas_price = await self._run(self.gas_price)
+        states = await self._run(
+            self.reader.read, call_cost_in_wei=gas_price * TEND_GAS, harvest_cost_in_wei=gas_price * HARVEST_GAS
+        )
+
+        sends = []
+        for state in states:
+            if state.address not in ready:
+                continue
+            # harvest rebalances too, never send both
+            if state.harvest_trigger:
+                sends.append(self._send(self.jobs[state.address], "harvest", gas_price))
+            elif state.tend_trigger:
+                sends.append(self._send(self.jobs[state.address], "tend", gas_price))
+        return [sent for sent in await asyncio.gather(*sends) if sent is not None]
+
+    async def run(self, rounds=None):
+        done = 0
+        while rounds is None or done < rounds:
+            try:
+                for address, action, tx in await self.poll():
+                    print(f"{action} {address}: {tx.txid}")
+            except Exception as e:
+                # node hiccups shouldn't stop the keeper, the next round reads everything again
+                print(f"poll failed: {e}")
+            done += 1
+            await asyncio.sleep(self.interval)
+
+
+def main():
+    print(f"You are using the '{network.show_active()}' network")
+    account = accounts.load(click.prompt("Account", type=click.Choice(accounts.load())))
+    print(f"You are using: 'keeper' [{account.address}]")
+
+    strategies = [Strategy.at(address.strip()) for address in click.prompt("Strategies, comma separated").split(",")]
+    interval = click.prompt("Seconds between polls", default=60)
+    keeper = Keeper(account, strategies, load_multicall(account), interval=interval)
+    asyncio.run(keeper.run())
@@ -0,0 +1,160 @@
+"""
+Record and replay JSON-RPC proxy for mainnet-fork runs.
+
+Ganache forks through this proxy instead of Infura. Reads at or below the pinned block (code, balances, nonces,
+storage slots, calls and the block itself) never change, so they are stored on disk per block and replayed on
+later runs. Once warm, the fork tests run offline. Run it outside of brownie:
+
+    python scripts/rpc_cache.py --block 13500000
+"""
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".rpc-cache"
+
+# method => index of its block param, None when the answer doesn't depend on a block
+CACHEABLE = {
+    "eth_chainId": None,
+    "net_version": None,
+    "eth_getCode": 1,
+    "eth_getBalance": 1,
+    "eth_getTransactionCount": 1,
+    "eth_getStorageAt": 2,
+    "eth_call": 1,
+    "eth_getBlockByNumber": 0,
+}
+
+
+class RpcCache:
+    def __init__(self, upstream, block, path=CACHE_DIR):
+        self.upstream = upstream
+        self.block = int(block)
+        self.hits = 0
+        self.misses = 0
+        directory = Path(path) / str(self.block)
+        directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(directory / "rpc.db"), check_same_thread=False)
+        self._db.execute("CREATE TABLE IF NOT EXISTS rpc (key TEXT PRIMARY KEY, result TEXT)")
+
+    def key(self, method, params):
+        # only answers pinned at or below the fork block are immutable, "latest" and later blocks always go upstream
+        if method not in CACHEABLE:
+            return None
+        index = CACHEABLE[method]
+        if index is not None:
+            tag = params[index] if len(params) > index else None
+            if not isinstance(tag, str) or not tag.startswith("0x") or int(tag, 16) > self.block:
+                return None
+        return json.dumps([method, params], sort_keys=True)
+
+    def request(self, payload):
+        if isinstance(payload, list):
+            return [self.request(p) for p in payload]
+
+        key = self.key(payload["method"], payload.get("params", []))
+        if key is not None:
+            with self._lock:
+                row = self._db.execute("SELECT result FROM rpc WHERE key = ?", (key,)).fetchone()
+            if row is not None:
+                self.hits += 1
+                return {"jsonrpc": "2.0", "id": payload.get("id"), "result": json.loads(row[0])}
+            self.misses += 1
+
+        response = self._forward(payload)
+        if key is not None and "result" in response:
+            with self._lock:
+                self._db.execute("INSERT OR REPLACE INTO rpc VALUES (?, ?)", (key, json.dumps(response["result"])))
+                self._db.commit()
+        return response
+
+    def _forward(self, payload):
+        error = "no upstream"
+        if self.upstream:
+            request = urllib.request.Request(
+                self.upstream, json.dumps(payload).encode(), {"Content-Type": "application/json"}
+            )
+            try:
+                with urllib.request.urlopen(request, timeout=60) as response:
+                    return json.loads(response.read())
+            except OSError as exc:
+                error = str(exc)
+        return {
+            "jsonrpc": "2.0",
+            "id": payload.get("id"),
+            "error": {"code": -32603, "message": f"not cached and upstream unavailable: {error}"},
+        }
+
+    def serve(self, port=8549):
+        cache = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                body = json.dumps(cache.request(payload)).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        return ThreadingHTTPServer(("127.0.0.1", port), Handler)
+
+
+def cached_contract(address, block=None, path=CACHE_DIR):
+    """
+    `Contract(address)` that keeps the fetched ABI next to the RPC cache of the pinned block (`FORK_BLOCK`),
+    so later runs don't hit the explorer. Without a pinned block it is a plain `Contract(address)`.
+    """
+    from brownie import Contract
+
+    block = block or os.environ.get("FORK_BLOCK")
+    if not block:
+        return Contract(address)
+
+    file = Path(path) / str(block) / "abi" / f"{str(address).lower()}.json"
+    if file.exists():
+        cached = json.loads(file.read_text())
+        return Contract.from_abi(cached["name"], address, cached["abi"])
+
+    contract = Contract(address)
+    file.parent.mkdir(parents=True, exist_ok=True)
+    file.write_text(json.dumps({"name": contract._name, "abi": contract.abi}))
+    return contract
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--block", type=int, default=os.environ.get("FORK_BLOCK"), required="FORK_BLOCK" not in os.environ)
+    parser.add_argument("--port", type=int, default=8549)
+    parser.add_argument(
+        "--upstream",
+        default=os.environ.get("WEB3_PROVIDER_URI")
+        or f"https://mainnet.infura.io/v3/{os.environ.get('WEB3_INFURA_PROJECT_ID', '')}",
+        help="archive node to fill the cache from, replays only when unreachable",
+    )
+    args = parser.parse_args()
+
+    cache = RpcCache(args.upstream, args.block)
+    server = cache.serve(args.port)
+    print(f"Caching block {cache.block} from {args.upstream} on http://127.0.0.1:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"{cache.hits} hits, {cache.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
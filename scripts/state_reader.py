@@ -0,0 +1,210 @@
+"""
+Batched reads of vault and strategy state through Multicall.
+
+Monitoring many strategies one getter at a time costs a round trip per value. `StateReader` instead bundles the
+vault reads (`totalAssets`, `totalDebt`, `pricePerShare`, `want.balanceOf(vault)`, `strategies(strategy)`) and the
+strategy reads (`positionSnapshot`, `tendTrigger`, `harvestTrigger`) of every strategy into a single `eth_call`
+to `tryBlockAndAggregate`, and decodes the answers into the records below. Every value read is a uint256 or a
+bool, so the calls are encoded from their selectors and don't need an ABI per target.
+
+    reader = StateReader(load_multicall(accounts[0]), [strategy_a, strategy_b])
+    for state in reader.read(call_cost_in_wei=10 ** 15):
+        print(state.address, state.position.estimated_total_assets, state.tend_trigger)
+"""
+from dataclasses import dataclass, fields
+from typing import List, Optional
+
+from brownie import Multicall, chain, web3
+from eth_utils import function_signature_to_4byte_selector
+
+# Multicall2 deployments with the same ABI as contracts/Multicall.sol, anywhere else it is deployed
+MULTICALL2 = {1: "0x5BA1e12693Dc8F9c48aAD8770482f4739bEeD696"}
+
+WORD = 32
+
+
+def _selector(signature):
+    return function_signature_to_4byte_selector(signature)
+
+
+def _address(value):
+    return web3.toChecksumAddress(value.to_bytes(WORD, "big")[-20:])
+
+
+VAULT = _selector("vault()")
+WANT = _selector("want()")
+TOTAL_ASSETS = _selector("totalAssets()")
+TOTAL_DEBT = _selector("totalDebt()")
+PRICE_PER_SHARE = _selector("pricePerShare()")
+BALANCE_OF = _selector("balanceOf(address)")
+STRATEGIES = _selector("strategies(address)")
+POSITION_SNAPSHOT = _selector("positionSnapshot()")
+TEND_TRIGGER = _selector("tendTrigger(uint256)")
+HARVEST_TRIGGER = _selector("harvestTrigger(uint256)")
+
+
+@dataclass(frozen=True)
+class StrategyParams:
+    # vault.strategies(strategy), yearn-vaults 0.4.x
+    performance_fee: int
+    activation: int
+    debt_ratio: int
+    min_debt_per_harvest: int
+    max_debt_per_harvest: int
+    last_report: int
+    total_debt: int
+    total_gain: int
+    total_loss: int
+
+
+@dataclass(frozen=True)
+class PositionSnapshot:
+    # Strategy.positionSnapshot(), values in USD are scaled by 1e18
+    target_collateral_factor: int
+    balance_of_want: int
+    balance_of_reward: int
+    balance_of_eth: int
+    value_of_cwant: int
+    value_of_csupplied: int
+    value_of_xinv: int
+    value_of_total_collateral: int
+    value_of_borrowed_owed: int
+    value_of_delegated: int
+    estimated_total_assets: int
+    delegated_assets: int
+    vault_total_assets: int
+    vault_loose_balance: int
+    vault_price_per_share: int
+    strategy_total_debt: int
+    strategy_total_gain: int
+    strategy_total_loss: int
+
+
+@dataclass(frozen=True)
+class VaultState:
+    address: str
+    want: str
+    total_assets: int
+    total_debt: int
+    loose_balance: int
+    price_per_share: int
+
+
+@dataclass(frozen=True)
+class StrategyState:
+    address: str
+    block: int
+    vault: VaultState
+    params: StrategyParams
+    # None when the call reverted, e.g. a strategy without positionSnapshot
+    position: Optional[PositionSnapshot]
+    tend_trigger: Optional[bool]
+    harvest_trigger: Optional[bool]
+
+
+def load_multicall(account=None):
+    """
+    The chain's Multicall2 if it has one, otherwise a Multicall deployed from `account`.
+    """
+    address = MULTICALL2.get(chain.id)
+    if address and len(web3.eth.get_code(address)) > 0:
+        return Multicall.at(address)
+    if account is None:
+        raise ValueError(f"no Multicall on chain {chain.id}, pass an account to deploy one")
+    return account.deploy(Multicall)
+
+
+def _words(success, data, count):
+    data = bytes(data)
+    if not success or len(data) < count * WORD:
+        return None
+    return [int.from_bytes(data[i * WORD:(i + 1) * WORD], "big") for i in range(count)]
+
+
+def _record(cls, success, data):
+    words = _words(success, data, len(fields(cls)))
+    return None if words is None else cls(*words)
+
+
+def _uint(value):
+    return value.to_bytes(WORD, "big")
+
+
+class StateReader:
+    def __init__(self, multicall, strategies):
+        self.multicall = multicall
+        self.strategies = [str(strategy) for strategy in strategies]
+
+        # the vault and want of a strategy never change, look them up once
+        _, results = self._aggregate([(strategy, selector) for strategy in self.strategies for selector in (VAULT, WANT)])
+        words = [_words(success, data, 1) for success, data in results]
+        if None in words:
+            raise ValueError("every strategy must answer vault() and want()")
+        self.vaults = [_address(vault[0]) for vault in words[0::2]]
+        self.wants = [_address(want[0]) for want in words[1::2]]
+
+    def _aggregate(self, calls, block=None):
+        encoded = [(target, "0x" + data.hex()) for target, data in calls]
+        block_number, _, results = self.multicall.tryBlockAndAggregate.call(False, encoded, block_identifier=block)
+        return block_number, results
+
+    def _costs(self, cost):
+        return list(cost) if isinstance(cost, (list, tuple)) else [cost] * len(self.strategies)
+
+    def calls(self, call_cost_in_wei=0, harvest_cost_in_wei=None):
+        """
+        The (target, calldata) pairs of one read: four per distinct vault, then four per strategy.
+        """
+        tend_costs = self._costs(call_cost_in_wei)
+        harvest_costs = tend_costs if harvest_cost_in_wei is None else self._costs(harvest_cost_in_wei)
+        vaults = list(dict.fromkeys(zip(self.vaults, self.wants)))
+        calls = []
+        for vault, want in vaults:
+            calls += [
+                (vault, TOTAL_ASSETS),
+                (vault, TOTAL_DEBT),
+                (vault, PRICE_PER_SHARE),
+                (want, BALANCE_OF + _uint(int(vault, 16))),
+            ]
+        for strategy, vault, tend_cost, harvest_cost in zip(self.strategies, self.vaults, tend_costs, harvest_costs):
+            calls += [
+                (vault, STRATEGIES + _uint(int(strategy, 16))),
+                (strategy, POSITION_SNAPSHOT),
+                (strategy, TEND_TRIGGER + _uint(tend_cost)),
+                (strategy, HARVEST_TRIGGER + _uint(harvest_cost)),
+            ]
+        return vaults, calls
+
+    def read(self, call_cost_in_wei=0, block=None, harvest_cost_in_wei=None) -> List[StrategyState]:
+        """
+        State of every strategy in one eth_call. `call_cost_in_wei` is passed to the triggers, either one value
+        for all strategies or one per strategy. `harvest_cost_in_wei` prices harvestTrigger apart from tendTrigger.
+        """
+        vaults, calls = self.calls(call_cost_in_wei, harvest_cost_in_wei)
+        block_number, results = self._aggregate(calls, block)
+
+        vault_states = {}
+        for i, (vault, want) in enumerate(vaults):
+            words = [_words(success, data, 1) for success, data in results[4 * i:4 * i + 4]]
+            if None in words:
+                raise ValueError(f"vault {vault} didn't answer")
+            total_assets, total_debt, price_per_share, loose = (word[0] for word in words)
+            vault_states[vault] = VaultState(vault, want, total_assets, total_debt, loose, price_per_share)
+
+        states = []
+        offset = 4 * len(vaults)
+        for i, (strategy, vault) in enumerate(zip(self.strategies, self.vaults)):
+            params, snapshot, tend, harvest = results[offset + 4 * i:offset + 4 * i + 4]
+            tend, harvest = _words(*tend, 1), _words(*harvest, 1)
+            states.append(
+                StrategyState(
+                    address=strategy,
+                    block=block_number,
+                    vault=vault_states[vault],
+                    params=_record(StrategyParams, *params),
+                    position=_record(PositionSnapshot, *snapshot),
+                    tend_trigger=None if tend is None else bool(tend[0]),
+                    harvest_trigger=None if harvest is None else bool(harvest[0]),
+                )
+            )
+        return states
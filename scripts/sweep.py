@@ -0,0 +1,99 @@
+from brownie import Contract, Strategy, interface, network
+import click
+
+from leverage_model import BLOCKS_PER_YEAR, Position, Scenario
+from leverage_model.sweep import Economics, grid, pareto_frontier, setter_calls, sweep
+from scripts.dependencies import vault_at
+
+ETHER = 10 ** 18
+
+
+def underlying(cToken, account):
+    _, balance, _, rate = cToken.getAccountSnapshot(account)
+    return balance * rate // ETHER
+
+
+def read_position(strategy):
+    cWant = interface.CErc20Interface(strategy.cWant())
+    cBorrowed = interface.CTokenInterface(strategy.cBorrowed())
+    cSupplied = interface.CTokenInterface(strategy.cSupplied())
+    xInv = interface.CTokenInterface(strategy.xInv())
+    delegatedVault = Contract(strategy.delegatedVault())
+    comptroller = interface.ComptrollerInterface(cWant.comptroller())
+    oracle = interface.PriceOracle(comptroller.oracle())
+
+    return Position(
+        want_balance=strategy.balanceOfWant(),
+        cwant_balance=underlying(cWant, strategy),
+        csupplied_balance=underlying(cSupplied, strategy),
+        xinv_balance=underlying(xInv, strategy),
+        borrowed_owed=cBorrowed.borrowBalanceStored(strategy),
+        delegated_shares=delegatedVault.balanceOf(strategy),
+        price_per_share=delegatedVault.pricePerShare(),
+        want_price=oracle.getUnderlyingPrice(cWant),
+        borrowed_price=oracle.getUnderlyingPrice(cBorrowed),
+        supplied_price=oracle.getUnderlyingPrice(cSupplied),
+        xinv_price=oracle.getUnderlyingPrice(xInv),
+        collateral_factor=comptroller.markets(cBorrowed)[1],
+        borrow_limit=strategy.borrowLimit(),
+        want_cash=cWant.getCash(),
+        borrowed_cash=cBorrowed.getCash(),
+        eth_balance=strategy.balanceOfEth(),
+        collateral_tolerance=strategy.collateralTolerance(),
+        min_redeem_precision=strategy.minRedeemPrecision(),
+        vault_decimals=delegatedVault.decimals(),
+    ), cWant, cBorrowed
+
+
+def borrow_limits(position, vault_assets):
+    """
+    Candidate borrow limits around the strategy's current one. While it is still 0, fractions of what the vault's
+    total assets, in want, could borrow at the market's collateral factor.
+    """
+    limit = int(position.borrow_limit)
+    if limit > 0:
+        return [limit // 2, limit, limit * 2]
+    ceiling = vault_assets * int(position.want_price) * int(position.collateral_factor) // (int(position.borrowed_price) * ETHER)
+    if ceiling == 0:
+        raise ValueError("no borrow limit set and nothing in the vault to size one from")
+    return [ceiling // 4, ceiling // 2, ceiling]
+
+
+def main():
+    print(f"You are using the '{network.show_active()}' network")
+    strategy = Strategy.at(click.prompt("Strategy"))
+    position, cWant, cBorrowed = read_position(strategy)
+
+    # rates as the markets quote them now, the delegated vault's growth and INV emissions are estimates
+    scenario = Scenario(
+        blocks=BLOCKS_PER_YEAR // 4,
+        eth_volatility=click.prompt("ETH volatility against want, annualized", default=0.9),
+        borrow_rate_per_block=cBorrowed.borrowRatePerBlock() / ETHER,
+        price_per_share_growth_per_block=click.prompt("Delegated vault APR", default=0.05) / BLOCKS_PER_YEAR,
+        tend_interval_blocks=click.prompt("Blocks between keeper tend checks", default=6_500),
+    )
+    economics = Economics(
+        supply_rate_per_block=cWant.supplyRatePerBlock() / ETHER,
+        reward_usd_per_block=click.prompt("INV rewards per block, in USD", default=0.0),
+        gas_price_gwei=click.prompt("Gas price, gwei", default=50.0),
+    )
+
+    candidates = grid(
+        target_offsets=[5 * 10 ** 16, 10 ** 17, 15 * 10 ** 16, 2 * 10 ** 17],
+        collateral_tolerances=[5 * 10 ** 15, 10 ** 16, 2 * 10 ** 16, 4 * 10 ** 16],
+        borrow_limits=borrow_limits(position, vault_at(strategy.vault()).totalAssets()),
+        percents_reward_to_sell=[0, 10, 50, 100],
+    )
+    frontier = pareto_frontier(sweep(position, candidates, scenario, economics, paths=click.prompt("Paths per point", default=1_000)))
+
+    print(f"{'target offset':>14} {'tolerance':>10} {'borrow limit':>14} {'sell %':>6} {'net APR':>8} {'risk':>7} {'gas/yr':>12}")
+    for outcome in frontier:
+        params = outcome.params
+        print(
+            f"{params.target_offset / ETHER:>14.3f} {params.collateral_tolerance / ETHER:>10.3f} "
+            f"{params.borrow_limit / ETHER:>14.2f} {params.percent_reward_to_sell:>6} "
+            f"{outcome.net_apr:>8.2%} {outcome.liquidation_risk:>7.2%} {outcome.gas_per_year / ETHER:>12.2f}"
+        )
+
+    choice = click.prompt("Frontier row to apply", default=0, type=click.IntRange(0, len(frontier) - 1))
+    print("\n".join(setter_calls(frontier[choice].params)))
@@ -0,0 +1,60 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Asset:
+    """
+    One `want` the strategy is tested against. Amounts are in whole tokens, the fixtures scale them by decimals.
+    `mock_want` and `mock_supplied` are the (name, symbol, decimals, USD price) the offline mocks deploy.
+    """
+
+    id: str
+    strategy_name: str
+    want: str
+    want_whale: str
+    amount: int
+    cWant: str
+    cwant_whale: str
+    cSupplied: str
+    cSupplied_whale: str
+    inverse_gov: str
+    cSupply_amount: int
+    airdrop: int
+    mock_want: tuple
+    mock_supplied: tuple
+
+
+ASSETS = [
+    Asset(
+        id="dola",
+        strategy_name="StrategyDolaEthLeverage",
+        want="0x865377367054516e17014ccded1e7d814edc9ce4",  # DOLA
+        want_whale="0x9547429C0e2c3A8B88C6833B58FCE962734C0E8C",  # DOLA 3CRV Curve Metapool
+        amount=100000,
+        cWant="0x7fcb7dac61ee35b3d4a51117a7c58d53f0a8a670",  # anDOLA
+        cwant_whale="0x5E075E40D01c82B6Bf0B0ecdb4Eb1D6984357EF7",  # Fed
+        cSupplied="0xde2af899040536884e062D3a334F2dD36F34b4a4",  # temporarily anYFI
+        cSupplied_whale="0x7BFEe91193d9Df2Ac0bFe90191D40F23c773C060",
+        inverse_gov="0x926dF14a23BE491164dCF93f4c468A50ef659D5B",  # Inverse timelock
+        cSupply_amount=10,
+        airdrop=500,
+        mock_want=("Dola USD Stablecoin", "DOLA", 18, 1 * 10 ** 18),
+        mock_supplied=("yearn.finance", "YFI", 18, 30_000 * 10 ** 18),
+    ),
+    Asset(
+        id="yfi",
+        strategy_name="StrategyYfiEthLeverage",
+        want="0x0bc529c00C6401aEF6D220BE8C6Ea1667F6Ad93e",  # YFI
+        want_whale="0x3ff33d9162aD47660083D7DC4bC02Fb231c81677",  # YFI whale
+        amount=2,
+        cWant="0xde2af899040536884e062D3a334F2dD36F34b4a4",  # anYFI
+        cwant_whale="0xB1AdceddB2941033a090dD166a462fe1c2029484",  # Fed
+        cSupplied="0xD60B06B457bFf7fc38AC5E7eCE2b5ad16B288326",  # temporarily anXSUSHI
+        cSupplied_whale="0x7BFEe91193d9Df2Ac0bFe90191D40F23c773C060",  # temporarily anXSUSHI
+        inverse_gov="0x35d9f4953748b318f18c30634bA299b237eeDfff",
+        cSupply_amount=100000,
+        airdrop=1,
+        mock_want=("yearn.finance", "YFI", 18, 30_000 * 10 ** 18),
+        mock_supplied=("SushiBar", "xSUSHI", 18, 10 * 10 ** 18),
+    ),
+]
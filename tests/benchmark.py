@@ -0,0 +1,61 @@
+import json
+from pathlib import Path
+
+import pytest
+
+SNAPSHOT = Path(__file__).parent / "gas-snapshot.json"
+
+
+class GasSnapshot:
+    """
+    Gas used per benchmark key, compared against the committed snapshot. A key over the threshold fails, a key
+    missing from the snapshot is skipped until it is recorded. `--update-gas-snapshot` records the measured values
+    instead.
+    """
+
+    def __init__(self, path=SNAPSHOT, threshold=0.02, update=False):
+        self.path = Path(path)
+        self.threshold = threshold
+        self.update = update
+        self.recorded = self._load()
+        self.measured = {}
+
+    def _load(self):
+        return json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def check(self, key, gas_used):
+        """
+        Records `gas_used` and returns a message when it is over its baseline by more than the threshold. A key
+        without a baseline returns None, `missing` tells them apart.
+        """
+        self.measured[key] = gas_used
+        baseline = self.recorded.get(key)
+        if self.update or baseline is None:
+            return None
+        if gas_used <= baseline * (1 + self.threshold):
+            return None
+        return f"{key}: {gas_used} gas, {gas_used / baseline - 1:+.1%} over the snapshot of {baseline}"
+
+    def missing(self, keys):
+        return [] if self.update else [key for key in keys if key not in self.recorded]
+
+    def verify(self, gas):
+        """
+        Checks every `key: gas_used` of `gas`. Fails on the keys over their baseline, then skips the calling test
+        when some keys have no baseline yet, so a fresh path is reported rather than passed silently.
+        """
+        regressions = [message for message in (self.check(key, used) for key, used in gas.items()) if message]
+        assert not regressions, "\n".join(regressions)
+        missing = self.missing(gas)
+        if missing:
+            pytest.skip(f"no gas baseline for {', '.join(missing)}, record it with --update-gas-snapshot")
+
+    def save(self, measured):
+        """
+        Writes `measured` over the snapshot, keys not measured in this run are kept. Call it from one process only.
+        """
+        if not measured:
+            return
+        snapshot = self._load()
+        snapshot.update(measured)
+        self.path.write_text(json.dumps(snapshot, indent=2, sort_keys=True) + "\n")
@@ -1,89 +1,182 @@
+import json
+
 import pytest
 from brownie import Contract, config
 
+import mocks
+from assets import ASSETS
+from benchmark import GasSnapshot
+from scripts.rpc_cache import cached_contract
+from scripts.state_reader import load_multicall
+
+
+def pytest_addoption(parser):
+    parser.addoption("--update-gas-snapshot", action="store_true", help="rewrite tests/gas-snapshot.json with the gas measured")
+    parser.addoption("--gas-threshold", type=float, default=0.02, help="gas increase over the snapshot that fails a benchmark")
+
+
+# setup includes the module scoped deployments, compare with `--durations=0` for a breakdown
+_durations = {"setup": 0.0, "call": 0.0, "teardown": 0.0}
+
+
+def pytest_runtest_logreport(report):
+    _durations[report.when] += report.duration
+
+
+def pytest_terminal_summary(terminalreporter):
+    terminalreporter.write_sep("-", "time per phase")
+    for phase, seconds in _durations.items():
+        terminalreporter.write_line(f"{phase:>8}: {seconds:.2f}s")
+
+
+# With `-n`, every xdist worker runs its own chain on the next port and deploys its own fixtures. These modules do
+# many harvests and sleeps, so their tests are handed out one by one, the rest go to a worker per module and asset.
+SPREAD_MODULES = ("test_operation.py", "test_airdrops.py", "test_collateral_injection.py", "test_gas_benchmark.py")
+
+
+@pytest.hookimpl(tryfirst=True, optionalhook=True)
+def pytest_xdist_make_scheduler(config, log):
+    from xdist.scheduler import LoadScopeScheduling
+
+    class AssetScheduling(LoadScopeScheduling):
+        def _split_scope(self, nodeid):
+            module, _, test = nodeid.partition("::")
+            if module.endswith(SPREAD_MODULES):
+                return nodeid
+            return module + test[test.find("["):] if "[" in test else module
+
+    return AssetScheduling(config, log)
+
+
+# Gas measured by the benchmarks. xdist workers hand theirs to the controller, which alone writes the snapshot.
+_gas_measured = {}
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    _gas_measured.update(json.loads(getattr(node, "workeroutput", {}).get("gas_measured", "{}")))
+
+
+def pytest_sessionfinish(session):
+    config = session.config
+    if hasattr(config, "workerinput"):
+        config.workeroutput["gas_measured"] = json.dumps(_gas_measured)
+    elif config.getoption("--update-gas-snapshot"):
+        GasSnapshot().save(_gas_measured)
+
 
-@pytest.fixture
+# Every module runs once per asset in `assets.ASSETS`, pick one with `-k dola` or `-k yfi`
+@pytest.fixture(scope="module", params=ASSETS, ids=lambda asset: asset.id)
+def asset(request):
+    yield request.param
+
+
+# On a plain dev chain (`brownie test --network development`) the protocol is deployed from local mocks,
+# otherwise every fixture resolves the live contracts on the mainnet fork.
+@pytest.fixture(scope="module")
+def protocol(accounts, chain, asset, module_isolation):
+    # module_isolation only resets once per module, the next asset has to start from a clean chain as well
+    chain.reset()
+    yield mocks.deploy_protocol(accounts[0], asset) if mocks.is_local() else None
+
+
+@pytest.fixture(scope="module")
 def gov(accounts):
     yield accounts.at("0xFEB4acf3df3cDEA7399794D0869ef76A6EfAff52", force=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def user(accounts):
     yield accounts[0]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def rewards(accounts):
     yield accounts[1]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def guardian(accounts):
     yield accounts[2]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def management(accounts):
     yield accounts[3]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def strategist(accounts):
     yield accounts[4]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def keeper(accounts):
     yield accounts[5]
 
 
-@pytest.fixture
-def token(interface):
-    token_address = "0x865377367054516e17014ccded1e7d814edc9ce4"  # DOLA
-    yield interface.ERC20(token_address)
+@pytest.fixture(scope="module")
+def token(interface, asset, protocol):
+    if protocol:
+        yield protocol.token
+        return
+    yield interface.ERC20(asset.want)
+
 
+@pytest.fixture(scope="module")
+def token_whale(accounts, asset, protocol):
+    if protocol:
+        yield protocol.token_whale
+        return
+    yield accounts.at(asset.want_whale, force=True)
 
-@pytest.fixture
-def token_whale(accounts):
-    yield accounts.at("0x9547429C0e2c3A8B88C6833B58FCE962734C0E8C", force=True)  # DOLA 3CRV Curve Metapool
 
+# Deployments and funding run once per module on top of a freshly reset chain, every test then
+# reverts to the snapshot `fn_isolation` takes right after them.
 @pytest.fixture(autouse=True)
 def isolation(fn_isolation):
     pass
 
-@pytest.fixture
-def amount(accounts, token, user, token_whale):
-    amount = 100000 * 10 ** token.decimals()
+
+@pytest.fixture(scope="module")
+def amount(accounts, asset, token, user, token_whale):
+    amount = asset.amount * 10 ** token.decimals()
     # In order to get some funds for the token you are about to use,
     # it impersonate an exchange address to use it's funds.
     token.transfer(user, amount, {"from": token_whale})
     yield amount
 
 
-@pytest.fixture
-def weth():
+@pytest.fixture(scope="module")
+def weth(protocol):
+    if protocol:
+        yield protocol.weth
+        return
     token_address = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
-    yield Contract(token_address)
+    yield cached_contract(token_address)
 
 
-@pytest.fixture
-def weth_whale(accounts):
+@pytest.fixture(scope="module")
+def weth_whale(accounts, protocol):
+    if protocol:
+        yield protocol.weth_whale
+        return
     yield accounts.at("0x2F0b23f53734252Bda2277357e97e1517d6B042A", force=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def weth_amout(user, weth):
     weth_amout = 10 ** weth.decimals()
     user.transfer(weth, weth_amout)
     yield weth_amout
 
 
-@pytest.fixture
-def name():
-    return "StrategyDolaEthLeverage"
+@pytest.fixture(scope="module")
+def name(asset):
+    return asset.strategy_name
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def vault(pm, gov, rewards, guardian, management, token):
     Vault = pm(config["dependencies"][0]).Vault
     vault = guardian.deploy(Vault)
@@ -95,9 +188,11 @@ def vault(pm, gov, rewards, guardian, management, token):
     yield vault
 
 
-@pytest.fixture
-def strategy(strategist, keeper, vault, Strategy, gov, cWant, cBorrowed, delegatedVault, cSupplied, name):
+@pytest.fixture(scope="module")
+def strategy(request, strategist, keeper, vault, Strategy, gov, cWant, cBorrowed, delegatedVault, name, protocol):
     strategy = strategist.deploy(Strategy, vault, cWant, cBorrowed, delegatedVault, name)
+    if protocol:
+        mocks.use_protocol(strategy, protocol, gov, request.getfixturevalue("inverseGov"))
     strategy.setKeeper(keeper, {"from": strategist})
     strategy.setMaxReportDelay(86400, {"from": strategist})  # 1 day
     strategy.setDebtThreshold(100000 * 1e18, {"from": strategist})
@@ -106,73 +201,171 @@ def strategy(strategist, keeper, vault, Strategy, gov, cWant, cBorrowed, delegat
     yield strategy
 
 
-@pytest.fixture
-def cWant():
-    token_address = "0x7fcb7dac61ee35b3d4a51117a7c58d53f0a8a670"  # anDOLA
-    yield Contract(token_address)
+# clones of the fixture strategy, set up for the same protocol
+@pytest.fixture(scope="module")
+def clone_strategy(
+        request, Strategy, strategy, strategist, rewards, keeper, vault, cWant, cBorrowed, delegatedVault, name, gov,
+        protocol
+):
+    inverse_gov = request.getfixturevalue("inverseGov") if protocol else None
+
+    def clone_strategy():
+        tx = strategy.cloneStrategy(
+            vault, strategist, rewards, keeper, cWant, cBorrowed, delegatedVault, name, {"from": strategist}
+        )
+        clone = Strategy.at(tx.events["Cloned"]["clone"])
+        if protocol:
+            mocks.use_protocol(clone, protocol, gov, inverse_gov)
+        return clone
+
+    yield clone_strategy
+
+
+@pytest.fixture(scope="module")
+def multicall(accounts, protocol):
+    yield load_multicall(accounts[0])
+
 
+@pytest.fixture(scope="module")
+def cWant(asset, protocol):
+    if protocol:
+        yield protocol.cWant
+        return
+    yield cached_contract(asset.cWant)
 
-@pytest.fixture
-def cwant_whale(accounts):
-    yield accounts.at("0x5E075E40D01c82B6Bf0B0ecdb4Eb1D6984357EF7", force=True)  # Fed
 
+@pytest.fixture(scope="module")
+def cwant_whale(accounts, asset, protocol):
+    if protocol:
+        yield protocol.cwant_whale
+        return
+    yield accounts.at(asset.cwant_whale, force=True)
 
-@pytest.fixture
-def cSupplied():
-    token_address = "0xde2af899040536884e062D3a334F2dD36F34b4a4"  # temporarily anYFI
-    yield Contract(token_address)
 
+@pytest.fixture(scope="module")
+def cSupplied(asset, protocol):
+    if protocol:
+        yield protocol.cSupplied
+        return
+    yield cached_contract(asset.cSupplied)
 
-@pytest.fixture
-def cSupplied_whale(accounts):
-    token_address = "0x7BFEe91193d9Df2Ac0bFe90191D40F23c773C060"
-    yield accounts.at(token_address, force=True)
 
+@pytest.fixture(scope="module")
+def cSupplied_whale(accounts, asset, protocol):
+    if protocol:
+        yield protocol.cSupplied_whale
+        return
+    yield accounts.at(asset.cSupplied_whale, force=True)
 
-@pytest.fixture
-def cBorrowed():
+
+@pytest.fixture(scope="module")
+def cBorrowed(protocol):
+    if protocol:
+        yield protocol.cBorrowed
+        return
     token_address = "0x697b4acAa24430F254224eB794d2a85ba1Fa1FB8"  # anETH
-    yield Contract(token_address)
+    yield cached_contract(token_address)
+
+
+@pytest.fixture(scope="module")
+def comptroller(cWant, protocol):
+    if protocol:
+        yield protocol.comptroller
+        return
+    unitroller = cached_contract(cWant.comptroller())
+    yield Contract.from_abi(
+        "Comptroller", unitroller, cached_contract(unitroller.comptrollerImplementation()).abi
+    )
+
+
+@pytest.fixture(scope="module")
+def comptroller_admin(accounts, comptroller):
+    yield accounts.at(comptroller.admin(), force=True)
 
 
-@pytest.fixture
-def inv():
-    yield Contract("0x41d5d79431a913c4ae7d69a668ecdfe5ff9dfb68")
+@pytest.fixture(scope="module")
+def inv(protocol):
+    if protocol:
+        yield protocol.inv
+        return
+    yield cached_contract("0x41d5d79431a913c4ae7d69a668ecdfe5ff9dfb68")
 
 
-@pytest.fixture
-def inv_whale(accounts):
-    yield accounts.at("0x926dF14a23BE491164dCF93f4c468A50ef659D5B", force=True)  # Inverse Timelock
+@pytest.fixture(scope="module")
+def inv_whale(accounts, inv, protocol):
+    whale = accounts.at("0x926dF14a23BE491164dCF93f4c468A50ef659D5B", force=True)  # Inverse Timelock
+    if protocol:
+        inv.mint(whale, 10 ** 6 * 10 ** 18, {"from": accounts[0]})
+    yield whale
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def rook():
     token_address = "0xfA5047c9c78B8877af97BDcb85Db743fD7313d4a"
-    yield Contract(token_address)
+    yield cached_contract(token_address)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def rook_whale(accounts):
     yield accounts.at("0xb81f5b9bd373b9d0df2e3191a01b8fa9b4d2832a", force=True)
 
 
-@pytest.fixture
-def delegatedVault():
+@pytest.fixture(scope="module")
+def delegatedVault(protocol):
+    if protocol:
+        yield protocol.delegatedVault
+        return
     token_address = "0xa9fE4601811213c340e850ea305481afF02f5b28"  # WETH yVault
-    yield Contract(token_address)
-
-
-@pytest.fixture
-def inverseGov(cSupplied_whale, cSupplied, cSupply_amount):
-    token_address = "0x926dF14a23BE491164dCF93f4c468A50ef659D5B" # Inverse timelock
-    invGov = Contract(token_address)
+    yield cached_contract(token_address)
+
+
+@pytest.fixture(scope="module")
+def new_router(accounts, protocol):
+    if protocol:
+        router = accounts[0].deploy(mocks.MockRouter)
+        for asset in (protocol.token, protocol.weth, protocol.inv):
+            router.setPrice(asset, protocol.router.prices(asset), {"from": accounts[0]})
+        protocol.token.mint(router, 10 ** 9 * 10 ** protocol.token.decimals(), {"from": accounts[0]})
+        protocol.inv.mint(router, 10 ** 6 * 10 ** 18, {"from": accounts[0]})
+        protocol.weth.transfer(router, "10_000 ether", {"from": protocol.weth_whale})
+        yield router
+        return
+    yield cached_contract("0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F")  # sushiswap
+
+
+@pytest.fixture(scope="module")
+def inverseGov(accounts, asset, cSupplied_whale, cSupplied, cSupply_amount, protocol):
+    if protocol:
+        invGov = accounts.at("0x926dF14a23BE491164dCF93f4c468A50ef659D5B", force=True)  # Inverse timelock
+    else:
+        invGov = cached_contract(asset.inverse_gov)
     cSupplied.transfer(invGov, cSupply_amount, {"from": cSupplied_whale})
     yield invGov
 
 
-@pytest.fixture
-def cSupply_amount(cSupplied):
-    yield 10 * 10 ** cSupplied.decimals()
+@pytest.fixture(scope="module")
+def cSupply_amount(asset, cSupplied):
+    yield asset.cSupply_amount * 10 ** cSupplied.decimals()
+
+
+@pytest.fixture(scope="session")
+def gas_snapshot(request):
+    snapshot = GasSnapshot(
+        threshold=request.config.getoption("--gas-threshold"),
+        update=request.config.getoption("--update-gas-snapshot"),
+    )
+    yield snapshot
+    _gas_measured.update(snapshot.measured)
+
+
+@pytest.fixture(scope="module")
+def check_gas(gas_snapshot, protocol, asset):
+    # gas on a fork depends on the fork block, so only the local mocks are compared with the snapshot
+    def check(case, gas):
+        if protocol:
+            gas_snapshot.verify({f"{asset.id}-{case}:{entry}": used for entry, used in gas.items()})
+
+    return check
 
 
 @pytest.fixture(scope="session")
@@ -0,0 +1,152 @@
+from types import SimpleNamespace
+
+from brownie import (
+    Contract,
+    MockCErc20,
+    MockCEther,
+    MockComptroller,
+    MockERC20,
+    MockPriceOracle,
+    MockRouter,
+    MockWETH,
+    MockXInv,
+    MockYVault,
+    accounts,
+    network,
+    web3,
+)
+
+# Strategy hardcodes these, so their mocks are placed at the same addresses
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+XINV = "0x65b35d6Eb7006e0e607BC54EB2dFD459923476fE"
+INV = "0x41D5D79431A913C4aE7d69a668ecdfE5fF9DFB68"
+
+# USD per unit of underlying, in the oracle's 1e(36 - decimals) scale, want and supplied prices come from the asset
+ETH_PRICE = 3_000 * 10 ** 18
+INV_PRICE = 400 * 10 ** 18
+
+# 0.02 underlying per 8 decimal cToken, as Compound markets start
+INITIAL_EXCHANGE_RATE = 2 * 10 ** 26
+COLLATERAL_FACTOR = 6 * 10 ** 17
+BORROW_RATE_PER_BLOCK = 10 ** 10  # roughly 2% a year
+
+
+def is_local():
+    return not network.show_active().endswith("-fork")
+
+
+def etch(template, address):
+    # copy a deployed mock's runtime code to a fixed address, state still has to be initialized there
+    code = web3.eth.get_code(template.address).hex()
+    for method in ("evm_setAccountCode", "anvil_setCode", "hardhat_setCode"):
+        if "error" not in web3.provider.make_request(method, [address, code]):
+            return Contract.from_abi(template._name, address, template.abi)
+    raise RuntimeError("dev chain can't set account code, use ganache 7, anvil or hardhat")
+
+
+def erc20(deployer, name, symbol, decimals, at=None):
+    token = deployer.deploy(MockERC20)
+    if at is not None:
+        token = etch(token, at)
+    token.initialize(name, symbol, decimals, {"from": deployer})
+    return token
+
+
+def market(deployer, comptroller, oracle, underlying, price, name, symbol, container=MockCErc20, at=None):
+    cToken = deployer.deploy(container)
+    if at is not None:
+        cToken = etch(cToken, at)
+    cToken.initialize(underlying, comptroller, INITIAL_EXCHANGE_RATE, name, symbol, 8, {"from": deployer})
+    _list(deployer, comptroller, oracle, cToken, price)
+    return cToken
+
+
+def _list(deployer, comptroller, oracle, cToken, price):
+    comptroller._supportMarket(cToken, {"from": deployer})
+    comptroller._setCollateralFactor(cToken, COLLATERAL_FACTOR, {"from": deployer})
+    oracle.setUnderlyingPrice(cToken, price, {"from": deployer})
+
+
+def deploy_protocol(deployer, asset):
+    weth = etch(deployer.deploy(MockWETH), WETH)
+    inv = erc20(deployer, "Inverse DAO", "INV", 18, at=INV)
+    *want_spec, want_price = asset.mock_want
+    *supplied_spec, supplied_price = asset.mock_supplied
+    token = erc20(deployer, *want_spec)
+    supplied = erc20(deployer, *supplied_spec)
+
+    oracle = deployer.deploy(MockPriceOracle)
+    comptroller = deployer.deploy(MockComptroller, oracle, inv)
+
+    cWant = market(deployer, comptroller, oracle, token, want_price, f"an{want_spec[1]}", f"an{want_spec[1]}")
+    cSupplied = market(deployer, comptroller, oracle, supplied, supplied_price, f"an{supplied_spec[1]}", f"an{supplied_spec[1]}")
+    xInv = market(deployer, comptroller, oracle, inv, INV_PRICE, "xINV", "XINV", container=MockXInv, at=XINV)
+
+    cBorrowed = deployer.deploy(MockCEther)
+    cBorrowed.initialize(comptroller, INITIAL_EXCHANGE_RATE, "anETH", "anETH", 8, {"from": deployer})
+    cBorrowed._setBorrowRatePerBlock(BORROW_RATE_PER_BLOCK, {"from": deployer})
+    _list(deployer, comptroller, oracle, cBorrowed, ETH_PRICE)
+
+    delegatedVault = deployer.deploy(MockYVault, weth, 18, "WETH yVault", "yvWETH")
+
+    router = deployer.deploy(MockRouter)
+    for underlying, price in ((token, want_price), (weth, ETH_PRICE), (inv, INV_PRICE), (supplied, supplied_price)):
+        router.setPrice(underlying, price, {"from": deployer})
+
+    protocol = SimpleNamespace(
+        weth=weth,
+        inv=inv,
+        token=token,
+        supplied=supplied,
+        oracle=oracle,
+        comptroller=comptroller,
+        cWant=cWant,
+        cSupplied=cSupplied,
+        cBorrowed=cBorrowed,
+        xInv=xInv,
+        delegatedVault=delegatedVault,
+        router=router,
+        token_whale=accounts[6],
+        weth_whale=accounts[7],
+        cwant_whale=accounts[8],
+        cSupplied_whale=accounts[9],
+    )
+    _fund(deployer, protocol)
+    return protocol
+
+
+def use_protocol(strategy, protocol, gov, inverse_gov):
+    # Strategy initializes with the mainnet router and cSupplied, which have no code on a dev chain.
+    # Every deploy and clone has to be pointed at the mocks before it can harvest.
+    strategy.setRouter(protocol.router, {"from": gov})
+    strategy.setCSupplied(protocol.cSupplied, {"from": inverse_gov})
+
+
+def set_borrowed_price(protocol, price, sender):
+    # the router quotes from its own prices, move it with the oracle
+    protocol.oracle.setUnderlyingPrice(protocol.cBorrowed, price, {"from": sender})
+    protocol.router.setPrice(protocol.weth, price, {"from": sender})
+
+
+def _fund(deployer, protocol):
+    token_units = 10 ** protocol.token.decimals()
+
+    # lending market cash to borrow from
+    protocol.cBorrowed.mint({"from": deployer, "value": "10_000 ether"})
+
+    # router inventory for every output token it quotes
+    protocol.token.mint(protocol.router, 10 ** 9 * token_units, {"from": deployer})
+    protocol.inv.mint(protocol.router, 10 ** 6 * 10 ** 18, {"from": deployer})
+    protocol.weth.deposit({"from": deployer, "value": "10_000 ether"})
+    protocol.weth.transfer(protocol.router, "10_000 ether", {"from": deployer})
+
+    protocol.token.mint(protocol.token_whale, 10 ** 9 * token_units, {"from": deployer})
+    protocol.weth.deposit({"from": protocol.weth_whale, "value": "100_000 ether"})
+
+    protocol.token.mint(protocol.cwant_whale, 10 ** 6 * token_units, {"from": deployer})
+    protocol.token.approve(protocol.cWant, 2 ** 256 - 1, {"from": protocol.cwant_whale})
+    protocol.cWant.mint(10 ** 6 * token_units, {"from": protocol.cwant_whale})
+
+    protocol.supplied.mint(protocol.cSupplied_whale, 10 ** 6 * 10 ** 18, {"from": deployer})
+    protocol.supplied.approve(protocol.cSupplied, 2 ** 256 - 1, {"from": protocol.cSupplied_whale})
+    protocol.cSupplied.mint(10 ** 6 * 10 ** 18, {"from": protocol.cSupplied_whale})
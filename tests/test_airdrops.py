@@ -16,6 +16,7 @@ def test_airdrop_want(
         amount,
         RELATIVE_APPROX,
         delegatedVault,
+        asset,
 ):
     # Deposit to the vault
     user_balance_before = token.balanceOf(user)
@@ -30,7 +31,7 @@ def test_airdrop_want(
 
 
     print("==== Airdrop ====")
-    airdrop_amount = 500 * 1e18
+    airdrop_amount = asset.airdrop * 10 ** token.decimals()
     starting_total_assets = strategy.estimatedTotalAssets()
     token.transfer(strategy, airdrop_amount, {"from": token_whale})
     util.stateOfStrat(strategy, token)
@@ -73,6 +74,7 @@ def test_airdrop_cwant(
         amount,
         RELATIVE_APPROX,
         delegatedVault,
+        asset,
 ):
     # Deposit to the vault
     user_balance_before = token.balanceOf(user)
@@ -86,7 +88,7 @@ def test_airdrop_cwant(
     assert pytest.approx(strategy.estimatedTotalAssets(), rel=RELATIVE_APPROX) == amount
 
     print("==== Airdrop ====")
-    airdrop_amount = 500 * 1e8
+    airdrop_amount = asset.airdrop * 10 ** cWant.decimals()
     starting_cwant_balance = cWant.balanceOf(strategy)
     starting_total_assets = strategy.estimatedTotalAssets()
     cWant.transfer(strategy, airdrop_amount, {"from": cwant_whale})
@@ -0,0 +1,48 @@
+import brownie
+import pytest
+from brownie import Strategy
+
+import mocks
+
+
+def test_clone(
+        token, vault, strategy, strategist, rewards, keeper, gov, user, amount, cWant, cBorrowed, delegatedVault, name,
+        protocol, inverseGov, RELATIVE_APPROX
+):
+    deploy_gas = strategy.tx.gas_used
+
+    # clone for a second vault of the same asset
+    tx = strategy.cloneStrategy(
+        vault, strategist, rewards, keeper, cWant, cBorrowed, delegatedVault, name, {"from": strategist}
+    )
+    clone = Strategy.at(tx.events["Cloned"]["clone"])
+    print(f"deploy gas: {deploy_gas}, clone gas: {tx.gas_used}")
+    assert tx.gas_used < deploy_gas
+    if protocol:
+        mocks.use_protocol(clone, protocol, gov, inverseGov)
+
+    assert clone.isOriginal() == False
+    assert clone.name() == name
+    assert clone.cWant() == cWant
+    assert clone.strategist() == strategist
+    assert clone.keeper() == keeper
+    assert clone.collateralTolerance() == strategy.collateralTolerance()
+    assert clone.targetCollateralFactor() == strategy.targetCollateralFactor()
+
+    # initializer and clone factory are one-shot on clones
+    with brownie.reverts():
+        clone.initialize(vault, strategist, rewards, keeper, cWant, cBorrowed, delegatedVault, name, {"from": strategist})
+    with brownie.reverts():
+        clone.cloneStrategy(
+            vault, strategist, rewards, keeper, cWant, cBorrowed, delegatedVault, name, {"from": strategist}
+        )
+
+    # clone runs the strategy on its own state
+    vault.updateStrategyDebtRatio(strategy, 0, {"from": gov})
+    vault.addStrategy(clone, 10_000, 0, 2 ** 256 - 1, 1_000, {"from": gov})
+    clone.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    token.approve(vault.address, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    clone.harvest({"from": strategist})
+    assert pytest.approx(clone.estimatedTotalAssets(), rel=RELATIVE_APPROX) == amount
+    assert strategy.estimatedTotalAssets() == 0
@@ -37,8 +37,7 @@ def test_profitable_harvest_with_collateral_injection(
 
     cSupplied.approve(strategy, 2 ** 256 - 1, {"from": inverseGov})
 
-    # 10 yfi
-    strategy.setCSupplied("0xde2af899040536884e062D3a334F2dD36F34b4a4", {"from": inverseGov})
+    strategy.setCSupplied(cSupplied, {"from": inverseGov})
 
     print("before injection")
     util.stateOfStrat(strategy, token)
@@ -95,8 +94,7 @@ def test_change_debt_with_injection(
         inverseGov,
 ):
     cSupplied.approve(strategy, 2 ** 256 - 1, {"from": inverseGov})
-    # 10 yfi
-    strategy.setCSupplied("0xde2af899040536884e062D3a334F2dD36F34b4a4", {"from": inverseGov})
+    strategy.setCSupplied(cSupplied, {"from": inverseGov})
 
     print("before injection")
     util.stateOfStrat(strategy, token)
@@ -0,0 +1,32 @@
+import json
+
+from scripts.deploy import deploy_batch, load_manifest
+
+
+def test_batch_deploy(strategy, strategist, keeper, vault, cWant, cBorrowed, delegatedVault, name, tmp_path):
+    manifest = tmp_path / "strategies.json"
+    manifest.write_text(json.dumps({
+        "defaults": {"keeper": keeper.address, "borrow_limit": 1000 * 10 ** 18, "percent_reward_to_sell": 10},
+        "strategies": [
+            {"vault": vault.address, "cWant": cWant.address, "cBorrowed": cBorrowed.address,
+             "delegatedVault": delegatedVault.address, "name": f"{name} {i}"}
+            for i in range(3)
+        ] + [
+            {"vault": vault.address, "cWant": cWant.address, "cBorrowed": cBorrowed.address,
+             "delegatedVault": delegatedVault.address, "name": f"{name} clone", "original": strategy.address,
+             "percent_reward_to_sell": 50}
+        ],
+    }))
+
+    nonce = strategist.nonce
+    strategies = deploy_batch(strategist, load_manifest(manifest))
+
+    # 4 deploys and 12 setters, each stage on consecutive nonces
+    assert strategist.nonce == nonce + 16
+    assert [s.name() for s in strategies] == [f"{name} {i}" for i in range(3)] + [f"{name} clone"]
+    assert strategies[3].isOriginal() == False
+    for s in strategies:
+        assert s.vault() == vault
+        assert s.keeper() == keeper
+        assert s.borrowLimit() == 1000 * 10 ** 18
+    assert [s.percentRewardToSell() for s in strategies] == [10, 10, 10, 50]
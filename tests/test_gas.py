@@ -0,0 +1,169 @@
+import pytest
+from brownie import interface
+
+
+def strategy_calls(tx, strategy, to=None, fn=None):
+    return [
+        c for c in tx.subcalls
+        if c["from"] == strategy.address
+        and (to is None or c["to"] == to)
+        and (fn is None or c.get("function", "").startswith(fn))
+    ]
+
+
+def test_oracle_lookups(
+        token, vault, strategy, user, strategist, amount, cWant, chain, check_gas, RELATIVE_APPROX
+):
+    oracle = interface.ComptrollerInterface(cWant.comptroller()).oracle()
+
+    # Deposit to the vault
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18)
+    vault.deposit(amount, {"from": user})
+
+    # harvest loads prices once in prepareReturn and once in adjustPosition
+    tx = strategy.harvest({"from": strategist})
+    gas = {"harvest": tx.gas_used}
+    assert len(strategy_calls(tx, strategy, to=oracle)) <= 8
+    # synced once in prepareReturn, adjustPosition of the same harvest reuses it
+    assert len(strategy_calls(tx, strategy, fn="markets")) == 1
+    assert pytest.approx(strategy.estimatedTotalAssets(), rel=RELATIVE_APPROX) == amount
+
+    chain.sleep(3600 * 6)  # 6 hrs for pps to recover
+    chain.mine(1)
+
+    tx = strategy.tend({"from": strategist})
+    gas["tend"] = tx.gas_used
+    assert len(strategy_calls(tx, strategy, to=oracle)) <= 4
+    # collateral factor is synced once per tend and read from storage afterwards
+    assert len(strategy_calls(tx, strategy, fn="markets")) == 1
+
+    tx = vault.withdraw({"from": user})
+    gas["withdraw"] = tx.gas_used
+    assert len(strategy_calls(tx, strategy, to=oracle)) <= 4
+
+    check_gas("oracle-lookups", gas)
+
+
+def test_view_oracle_lookups(token, vault, strategy, user, strategist, amount, cWant, cSupplied, check_gas):
+    oracle = interface.ComptrollerInterface(cWant.comptroller()).oracle()
+    xInv = interface.CErc20Interface(strategy.xInv())
+
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18)
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+
+    # a single value view looks up the one price it converts with, and none for a balance it doesn't hold
+    held = lambda cToken: int(cToken.balanceOf(strategy) > 0)
+    assert held(cWant) and strategy.valueOfBorrowedOwed() > 0 and strategy.valueOfDelegated() > 0
+    lookups = {
+        "valueOfCWant": 1,
+        "valueOfBorrowedOwed": 1,
+        "valueOfDelegated": 1,
+        "valueOfCSupplied": held(cSupplied),
+        "valueOfxInv": held(xInv),
+        "valueOfTotalCollateral": 1 + held(cSupplied) + held(xInv),
+    }
+    gas = {}
+    for view, expected in lookups.items():
+        tx = getattr(strategy, view).transact({"from": user})
+        gas[view] = tx.gas_used
+        assert len(strategy_calls(tx, strategy, to=oracle)) == expected
+
+    check_gas("views", gas)
+
+
+def test_account_snapshots(
+        token, vault, strategy, user, strategist, amount, cWant, cBorrowed
+):
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18)
+    vault.deposit(amount, {"from": user})
+
+    tx = strategy.harvest({"from": strategist})
+    # balances are read through getAccountSnapshot only
+    assert len(strategy_calls(tx, strategy, fn="exchangeRateStored")) == 0
+    assert len(strategy_calls(tx, strategy, fn="borrowBalanceStored")) == 0
+
+    oracle = interface.PriceOracle(interface.ComptrollerInterface(cWant.comptroller()).oracle())
+    want_supplied = cWant.balanceOf(strategy) * cWant.exchangeRateStored() // 10 ** 18
+    assert strategy.valueOfCWant() == want_supplied * oracle.getUnderlyingPrice(cWant) // 10 ** 18
+    borrowed = cBorrowed.borrowBalanceStored(strategy)
+    assert strategy.valueOfBorrowedOwed() == borrowed * oracle.getUnderlyingPrice(cBorrowed) // 10 ** 18
+
+
+def test_config_storage_layout(strategy, strategist, gov, web3):
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    strategy.setPercentRewardToSell(25, {"from": strategist})
+    strategy.setCollateralTolerance(2 * 10 ** 16, {"from": gov})
+    strategy.syncCollateralFactor({"from": strategist})
+
+    collateral_factor = strategy.targetCollateralFactor() + 10 ** 17
+    packed = (
+        1000 * 10 ** 18
+        | (2 * 10 ** 16) << 120
+        | collateral_factor << 184
+        | 25 << 248
+    )
+
+    # all tunables live in a single slot
+    slots = [int.from_bytes(web3.eth.get_storage_at(strategy.address, i), "big") for i in range(64)]
+    assert slots.count(packed) == 1
+
+    # constants are not in storage
+    for addr in (strategy.xInv(), strategy.reward()):
+        assert int(addr, 16) not in slots
+
+    assert strategy.borrowLimit() == 1000 * 10 ** 18
+    assert strategy.percentRewardToSell() == 25
+    assert strategy.collateralTolerance() == 2 * 10 ** 16
+
+
+def test_position_snapshot(
+        token, vault, strategy, user, strategist, amount, check_gas
+):
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18)
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+
+    snapshot = strategy.positionSnapshot()
+    assert snapshot["targetCollateralFactor"] == strategy.targetCollateralFactor()
+    assert snapshot["balanceOfWant"] == strategy.balanceOfWant()
+    assert snapshot["valueOfCWant"] == strategy.valueOfCWant()
+    assert snapshot["valueOfTotalCollateral"] == strategy.valueOfTotalCollateral()
+    assert snapshot["valueOfBorrowedOwed"] == strategy.valueOfBorrowedOwed()
+    assert snapshot["valueOfDelegated"] == strategy.valueOfDelegated()
+    assert snapshot["estimatedTotalAssets"] == strategy.estimatedTotalAssets()
+    assert snapshot["delegatedAssets"] == strategy.delegatedAssets()
+    assert snapshot["vaultTotalAssets"] == vault.totalAssets()
+    assert snapshot["vaultTotalAssets"] - snapshot["vaultLooseBalance"] == vault.totalDebt()
+    assert snapshot["strategyTotalDebt"] == vault.strategies(strategy)["totalDebt"]
+    check_gas("views", {"positionSnapshot": strategy.positionSnapshot.estimate_gas()})
+
+
+def test_accrue_once_per_market(
+        token, vault, strategy, user, strategist, amount, cWant, cBorrowed, chain
+):
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18)
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+
+    chain.sleep(3600 * 6)  # 6 hrs for pps to recover
+    chain.mine(1)
+
+    # markets already accrued in this block are not accrued again
+    tx = strategy.harvest({"from": strategist})
+    assert len(strategy_calls(tx, strategy, to=cBorrowed, fn="accrueInterest")) == 1
+    assert len(strategy_calls(tx, strategy, to=cWant, fn="accrueInterest")) == 1
+    # every accrual site reached checks the block: selling both profits, the rebalance, and each deleverage, one
+    # for the redeemed lending profit and one when the rebalance repays instead of borrowing
+    deleverages = ("LendingProfitRedeemed" in tx.events) + ("Borrowed" not in tx.events)
+    assert len(strategy_calls(tx, strategy, to=cBorrowed, fn="accrualBlockNumber")) == 2 + deleverages
+    assert len(strategy_calls(tx, strategy, to=cWant, fn="accrualBlockNumber")) == 1
+
+    tx = strategy.tend({"from": strategist})
+    assert len(strategy_calls(tx, strategy, to=cBorrowed, fn="accrueInterest")) == 1
+    assert len(strategy_calls(tx, strategy, to=cWant, fn="accrueInterest")) == 0
@@ -0,0 +1,41 @@
+import pytest
+
+from mocks import set_borrowed_price
+
+SIZES = (10, 100)  # percent of `amount` deposited
+BORROW_LIMITS = (1, 1_000)  # in ETH, the first one binds
+DRIFTS = (-20, 0, 20)  # ETH price move in percent before the tend
+
+
+@pytest.mark.parametrize("drift", DRIFTS)
+@pytest.mark.parametrize("borrow_limit", BORROW_LIMITS)
+@pytest.mark.parametrize("size", SIZES)
+def test_gas_benchmark(
+        protocol, asset, token, vault, strategy, user, strategist, gov, amount, cSupplied, inverseGov, cSupply_amount,
+        gas_snapshot, size, borrow_limit, drift
+):
+    if not protocol:
+        pytest.skip("benchmarks run on the local mocks, where gas doesn't depend on the fork block")
+
+    deposit = amount * size // 100
+    token.approve(vault, deposit, {"from": user})
+    vault.deposit(deposit, {"from": user})
+    strategy.setBorrowLimit(borrow_limit * 10 ** 18, {"from": strategist})
+
+    gas = {"harvest": strategy.harvest({"from": strategist}).gas_used}
+
+    eth_price = protocol.oracle.getUnderlyingPrice(protocol.cBorrowed)
+    set_borrowed_price(protocol, eth_price * (100 + drift) // 100, user)
+    gas["tend"] = strategy.tend({"from": strategist}).gas_used
+
+    cSupplied.approve(strategy, 2 ** 256 - 1, {"from": inverseGov})
+    gas["supplyCollateral"] = strategy.supplyCollateral(cSupply_amount, {"from": inverseGov}).gas_used
+    gas["removeCollateral"] = strategy.removeCollateral(cSupply_amount // 2, {"from": inverseGov}).gas_used
+
+    gas["withdraw"] = vault.withdraw(vault.balanceOf(user) // 2, {"from": user}).gas_used
+
+    strategy.setEmergencyExit({"from": gov})
+    gas["emergencyExit"] = strategy.harvest({"from": strategist}).gas_used
+
+    case = f"{asset.id}-{size}pct-{borrow_limit}eth-{drift:+}pct"
+    gas_snapshot.verify({f"{case}:{entry}": used for entry, used in gas.items()})
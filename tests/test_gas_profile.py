@@ -0,0 +1,46 @@
+from scripts.gas_profile import profile, targets, transact
+
+
+def test_harvest_profile(token, vault, strategy, user, strategist, amount):
+    token.approve(vault, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    tx = transact(strategy, "harvest", strategist)
+
+    result = profile(tx, strategy, targets(strategy))
+
+    # every step is charged once, so the stacks add up to what the top frame spent
+    trace = tx.trace
+    assert result.total == trace[0]["gas"] - trace[-1]["gas"] + trace[-1]["gasCost"]
+    assert sum(result.targets.values()) == result.total
+    # the entry point is on every stack
+    assert max(result.functions.values()) == result.total
+
+    assert 0 < result.functions["Strategy._rebalance"] < result.total
+    assert result.functions["Strategy._usdToBase"] > 0
+    for target in ("oracle", "cWant", "cBorrowed", "delegatedVault"):
+        assert result.targets[target] > 0
+
+    lines = result.collapsed().splitlines()
+    assert len(lines) == len(result.stacks)
+    stack, gas = lines[0].rsplit(" ", 1)
+    assert stack.startswith("Strategy.harvest")
+    assert int(gas) >= 0
+
+    print(result.table())
+
+
+def test_withdraw_profile(token, vault, strategy, user, strategist, amount):
+    token.approve(vault, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+    tx = transact(strategy, "withdraw", user, vault.balanceOf(user) // 2)
+    assert tx.fn_name == "withdraw" and tx.receiver == vault.address
+
+    # the vault's own code is charged to the vault, the strategy's calls to their targets
+    result = profile(tx, strategy, targets(strategy))
+    assert result.targets["vault"] > 0
+    assert result.functions["Strategy._redeem"] > 0
+    assert result.functions["Strategy._freeUpCollateral"] > 0
+    assert sum(result.targets.values()) == result.total
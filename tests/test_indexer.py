@@ -0,0 +1,53 @@
+import pytest
+from brownie import chain
+
+from scripts.indexer import Indexer
+
+
+def test_position_events(token, vault, strategy, user, strategist, amount):
+    token.approve(vault, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+
+    tx = strategy.harvest({"from": strategist})
+    borrowed = tx.events["Borrowed"]
+    assert borrowed["amount"] > 0 and borrowed["delegated"] > 0
+
+    tx = vault.withdraw(vault.balanceOf(user) // 2, {"from": user})
+    repaid = tx.events["Repaid"]
+    assert repaid["amount"] > 0
+
+
+def test_indexer(token, vault, strategy, user, strategist, amount, tmp_path, RELATIVE_APPROX):
+    token.approve(vault, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    harvest = strategy.harvest({"from": strategist})
+    chain.mine(5)
+    withdraw = vault.withdraw(vault.balanceOf(user) // 2, {"from": user})
+
+    # small batches so the range is walked in several requests
+    indexer = Indexer([strategy], path=tmp_path / "events.db", batch_blocks=3, from_block=harvest.block_number)
+    assert indexer.sync() >= 3
+    assert indexer.indexed_to(strategy.address) == chain.height
+
+    rows = indexer.db.execute("SELECT block, tx, strategy, amount FROM borrowed").fetchall()
+    assert rows == [(harvest.block_number, harvest.txid, strategy.address, str(harvest.events["Borrowed"]["amount"]))]
+    # the collateral factor is derived from positionSnapshot at the end of the event's block
+    (collateral_factor,), = indexer.db.execute("SELECT collateral_factor FROM borrowed").fetchall()
+    assert int(collateral_factor) == pytest.approx(strategy.targetCollateralFactor(), rel=RELATIVE_APPROX)
+    assert indexer.db.execute("SELECT profit, loss FROM harvested").fetchall() == [
+        (str(harvest.events["Harvested"]["profit"]), str(harvest.events["Harvested"]["loss"]))
+    ]
+    (block, amount_repaid, collateral_factor), = indexer.db.execute(
+        "SELECT block, amount, collateral_factor FROM repaid"
+    ).fetchall()
+    assert block == withdraw.block_number
+    assert int(amount_repaid) == withdraw.events["Repaid"]["amount"]
+    assert 0 < int(collateral_factor) <= strategy.targetCollateralFactor() * (1 + RELATIVE_APPROX)
+
+    # a second sync resumes from the last block and stores nothing twice
+    assert indexer.sync() == 0
+    strategy.harvest({"from": strategist})
+    assert indexer.sync() >= 1
+    assert indexer.db.execute("SELECT COUNT(*) FROM harvested").fetchone() == (2,)
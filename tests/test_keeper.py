@@ -0,0 +1,65 @@
+import asyncio
+
+from brownie import chain, web3
+from brownie.network.transaction import Status
+
+from scripts.keeper import Keeper
+
+
+def test_keeper(
+        token, vault, strategy, strategist, keeper, gov, user, amount, multicall, clone_strategy
+):
+    vault.updateStrategyDebtRatio(strategy, 4_000, {"from": gov})
+    strategies = [strategy]
+    for _ in range(2):
+        clone = clone_strategy()
+        vault.addStrategy(clone, 3_000, 0, 2 ** 256 - 1, 1_000, {"from": gov})
+        strategies.append(clone)
+    for s in strategies:
+        s.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+        s.setDebtThreshold(100000 * 1e18, {"from": strategist})
+    token.approve(vault, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+
+    now = [0]
+    bot = Keeper(
+        keeper, strategies, multicall, interval=0, backoff=60, gas_price=lambda: max(web3.eth.gas_price, 10 ** 9),
+        clock=lambda: now[0],
+    )
+
+    # every strategy has credit waiting, all three harvests go out on consecutive nonces without waiting
+    nonce = keeper.nonce
+    sent = asyncio.run(bot.poll())
+    assert sorted(address for address, _, _ in sent) == sorted(s.address for s in strategies)
+    assert {action for _, action, _ in sent} == {"harvest"}
+    assert sorted(tx.nonce for _, _, tx in sent) == list(range(nonce, nonce + 3))
+    for _, _, tx in sent:
+        tx.wait(1)
+        assert tx.status == Status.Confirmed
+    assert all(s.estimatedTotalAssets() > 0 for s in strategies)
+
+    # nothing left to do right after
+    assert asyncio.run(bot.poll()) == []
+
+    # a reverted harvest backs that strategy off, the others carry on
+    failing = strategies[2]
+    failing.setKeeper(gov, {"from": strategist})
+    chain.sleep(86_400 + 1)
+    chain.mine()
+    # depending on gas estimation the send raises or the receipt reverts, either way it counts as a failure
+    sent = asyncio.run(bot.poll())
+    for _, _, tx in sent:
+        tx.wait(1)
+    assert {address for address, _, tx in sent if tx.status == Status.Confirmed} == {s.address for s in strategies[:2]}
+
+    failing.setKeeper(keeper, {"from": strategist})
+    assert asyncio.run(bot.poll()) == []
+    assert bot.jobs[failing.address].failures == 1
+
+    now[0] += 60
+    sent = asyncio.run(bot.poll())
+    assert [(address, action) for address, action, _ in sent] == [(failing.address, "harvest")]
+    sent[0][2].wait(1)
+    assert sent[0][2].status == Status.Confirmed
+    # the local counter left no gaps
+    assert keeper.nonce == sent[0][2].nonce + 1
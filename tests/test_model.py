@@ -0,0 +1,189 @@
+import pytest
+from dataclasses import replace
+
+from leverage_model import BLOCKS_PER_YEAR, Position, Scenario, liquidation_risk, rebalance, redeem, tend_trigger
+from leverage_model.sweep import Economics, Params, grid, pareto_frontier, setter_calls, sweep
+from mocks import set_borrowed_price
+from scripts.sweep import borrow_limits
+
+
+def position(strategy, protocol):
+    def underlying(cToken):
+        _, balance, _, rate = cToken.getAccountSnapshot(strategy)
+        return balance * rate // 10 ** 18
+
+    oracle = protocol.oracle
+    return Position(
+        want_balance=protocol.token.balanceOf(strategy),
+        cwant_balance=underlying(protocol.cWant),
+        csupplied_balance=underlying(protocol.cSupplied),
+        xinv_balance=underlying(protocol.xInv),
+        borrowed_owed=protocol.cBorrowed.borrowBalanceStored(strategy),
+        delegated_shares=protocol.delegatedVault.balanceOf(strategy),
+        price_per_share=protocol.delegatedVault.pricePerShare(),
+        want_price=oracle.getUnderlyingPrice(protocol.cWant),
+        borrowed_price=oracle.getUnderlyingPrice(protocol.cBorrowed),
+        supplied_price=oracle.getUnderlyingPrice(protocol.cSupplied),
+        xinv_price=oracle.getUnderlyingPrice(protocol.xInv),
+        collateral_factor=protocol.comptroller.markets(protocol.cBorrowed)[1],
+        borrow_limit=strategy.borrowLimit(),
+        want_cash=protocol.cWant.getCash(),
+        borrowed_cash=protocol.cBorrowed.getCash(),
+        eth_balance=strategy.balance() + protocol.weth.balanceOf(strategy),
+        collateral_tolerance=strategy.collateralTolerance(),
+        min_redeem_precision=strategy.minRedeemPrecision(),
+        vault_decimals=protocol.delegatedVault.decimals(),
+    )
+
+
+def assert_close(model, chain, rel=1e-6):
+    # the contract accrues a block or two of interest the model doesn't
+    assert int(model) == pytest.approx(chain, rel=rel, abs=10 ** 6)
+
+
+def test_model_matches_strategy(protocol, token, vault, strategy, user, strategist, amount, chain):
+    if not protocol:
+        pytest.skip("prices can only be moved on the local mocks")
+
+    token.approve(vault, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+
+    model = position(strategy, protocol)
+    assert model.estimated_total_assets == strategy.estimatedTotalAssets()
+    # the delegated share price hasn't moved since the harvest, so only the borrow rate counts
+    borrow_rate = protocol.cBorrowed.borrowRatePerBlock()
+    horizon = strategy.maxReportDelay() - (chain.time() - vault.strategies(strategy)["lastReport"])
+    for call_cost in (0, 10 ** 15, 10 ** 18):
+        call_cost_in_want = strategy.ethToWant(call_cost)
+        assert tend_trigger(model, call_cost_in_want, 0, borrow_rate, horizon) == strategy.tendTrigger(call_cost)
+
+    # eth up 20%, over the target so tend repays from delegatedVault
+    eth_price = model.borrowed_price
+    set_borrowed_price(protocol, eth_price * 12 // 10, user)
+    model = rebalance(position(strategy, protocol))
+    strategy.tend({"from": strategist})
+    actual = position(strategy, protocol)
+    assert_close(model.borrowed_owed, actual.borrowed_owed)
+    assert_close(model.delegated_shares, actual.delegated_shares)
+
+    # eth down 20% from the start, under the target so tend borrows more
+    set_borrowed_price(protocol, eth_price * 8 // 10, user)
+    model = rebalance(position(strategy, protocol))
+    strategy.tend({"from": strategist})
+    actual = position(strategy, protocol)
+    assert_close(model.borrowed_owed, actual.borrowed_owed)
+    assert_close(model.delegated_shares, actual.delegated_shares)
+
+    # withdraw half, the strategy redeems through _redeem
+    before = position(strategy, protocol)
+    balance_before = token.balanceOf(user)
+    vault.withdraw(vault.balanceOf(user) // 2, {"from": user})
+    withdrawn = token.balanceOf(user) - balance_before
+    model, short = redeem(before, withdrawn)
+    actual = position(strategy, protocol)
+    assert short == 0
+    assert_close(model.want_balance - withdrawn, actual.want_balance)
+    assert_close(model.cwant_balance, actual.cwant_balance)
+    assert_close(model.borrowed_owed, actual.borrowed_owed)
+    assert_close(model.delegated_shares, actual.delegated_shares)
+
+
+def test_model_vectorized(protocol, token, vault, strategy, user, strategist, amount):
+    if not protocol:
+        pytest.skip("compares against the local mocks")
+
+    token.approve(vault, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+
+    # one array evaluation of many eth prices agrees with the exact per-scenario model
+    model = position(strategy, protocol)
+    prices = [model.borrowed_price * step // 10 for step in range(5, 16)]
+    exact = [rebalance(replace(model, borrowed_price=price)).borrowed_owed for price in prices]
+    batch = rebalance(replace(model.to_float(), borrowed_price=[float(price) for price in prices]))
+    assert batch.borrowed_owed.shape == (len(prices),)
+    for single, vectorized in zip(exact, batch.borrowed_owed):
+        assert vectorized == pytest.approx(int(single), rel=1e-9)
+
+
+def synthetic_position():
+    return rebalance(
+        Position(
+            want_balance=0,
+            cwant_balance=100_000 * 10 ** 18,
+            csupplied_balance=0,
+            xinv_balance=0,
+            borrowed_owed=0,
+            delegated_shares=0,
+            price_per_share=10 ** 18,
+            want_price=10 ** 18,
+            borrowed_price=3_000 * 10 ** 18,
+            supplied_price=30_000 * 10 ** 18,
+            xinv_price=400 * 10 ** 18,
+            collateral_factor=6 * 10 ** 17,
+            borrow_limit=1_000 * 10 ** 18,
+            want_cash=10 ** 24,
+            borrowed_cash=10 ** 22,
+        )
+    )
+
+
+def test_liquidation_risk():
+    position = synthetic_position()
+    calm = liquidation_risk(position, Scenario(eth_volatility=1e-9), paths=200, batch_size=100, workers=1)
+    assert calm.probability == 0
+
+    # batches are seeded on their own, so the pool gives the same answer as a single process
+    tended = liquidation_risk(position, Scenario(), paths=400, batch_size=100, workers=1)
+    pooled = liquidation_risk(position, Scenario(), paths=400, batch_size=100, workers=2)
+    assert pooled.breached == tended.breached
+    assert (pooled.worst_collateral_factor == tended.worst_collateral_factor).all()
+    assert tended.mean_tends > 0
+
+    untended = liquidation_risk(position, Scenario(tend_interval_blocks=BLOCKS_PER_YEAR), paths=400, batch_size=100, workers=1)
+    assert untended.mean_tends == 0
+    assert untended.probability > tended.probability
+
+
+def test_parameter_sweep():
+    position = synthetic_position()
+    scenario = Scenario(blocks=BLOCKS_PER_YEAR // 12, borrow_rate_per_block=1e-8, price_per_share_growth_per_block=2e-8)
+    economics = Economics(reward_usd_per_block=0.01, gas_price_gwei=30)
+    candidates = grid([5 * 10 ** 16, 2 * 10 ** 17], [10 ** 16, 3 * 10 ** 16], [1_000 * 10 ** 18], [0, 100])
+    outcomes = sweep(position, candidates, scenario, economics, paths=100, workers=1)
+    assert [outcome.params for outcome in outcomes] == candidates
+
+    # every point runs the same paths, so a lower target can only be safer
+    risk = {(o.params.target_offset, o.params.collateral_tolerance, o.params.percent_reward_to_sell): o.liquidation_risk for o in outcomes}
+    for tolerance in (10 ** 16, 3 * 10 ** 16):
+        for percent in (0, 100):
+            assert risk[(2 * 10 ** 17, tolerance, percent)] <= risk[(5 * 10 ** 16, tolerance, percent)]
+
+    frontier = pareto_frontier(outcomes)
+    assert frontier
+    for kept in frontier:
+        assert not any(
+            o.net_apr > kept.net_apr and o.liquidation_risk < kept.liquidation_risk and o.gas_per_year < kept.gas_per_year
+            for o in outcomes
+        )
+
+    calls = setter_calls(Params(10 ** 17, 2 * 10 ** 16, 500 * 10 ** 18, 25))
+    assert calls == [
+        'strategy.setCollateralTolerance(20000000000000000, {"from": gov})',
+        'strategy.setBorrowLimit(500000000000000000000, {"from": strategist})',
+        'strategy.setPercentRewardToSell(25, {"from": strategist})',
+    ]
+
+
+def test_sweep_borrow_limits():
+    position = synthetic_position()
+    assert borrow_limits(position, 10 ** 24) == [500 * 10 ** 18, 1_000 * 10 ** 18, 2_000 * 10 ** 18]
+
+    # with no limit set yet the grid spans what the vault could borrow, $1M at a 0.6 factor and $3,000 ETH is 200 ETH
+    unset = replace(position, borrow_limit=0)
+    assert borrow_limits(unset, 10 ** 24) == [50 * 10 ** 18, 100 * 10 ** 18, 200 * 10 ** 18]
+    with pytest.raises(ValueError):
+        borrow_limits(unset, 0)
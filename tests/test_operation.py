@@ -2,6 +2,7 @@ import brownie
 import pytest
 import util
 from brownie import Contract, Wei
+from mocks import set_borrowed_price
 
 
 def test_immediate_operation(
@@ -232,6 +233,70 @@ def test_collateral_factor(
     util.stateOfVault(vault, strategy, token)
 
 
+def test_collateral_factor_sync(
+        token, vault, cBorrowed, strategy, user, strategist, amount, comptroller, comptroller_admin
+):
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 1e18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+    assert strategy.tendTrigger(0) == False
+
+    market_cf = comptroller.markets(cBorrowed)[1]
+    comptroller._setCollateralFactor(cBorrowed, market_cf - 5 * 10 ** 16, {"from": comptroller_admin})
+
+    # cached value is stale until the next tend or a permissionless sync
+    assert strategy.targetCollateralFactor() == market_cf - 10 ** 17
+    assert strategy.tendTrigger(0) == True
+    strategy.syncCollateralFactor({"from": user})
+    assert strategy.targetCollateralFactor() == market_cf - 15 * 10 ** 16
+
+    strategy.tend({"from": strategist})
+    assert strategy.tendTrigger(0) == False
+
+
+def test_collateral_factor_sync_on_withdraw(
+        token, vault, cBorrowed, strategy, user, strategist, amount, comptroller, comptroller_admin
+):
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 1e18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+
+    market_cf = comptroller.markets(cBorrowed)[1]
+    comptroller._setCollateralFactor(cBorrowed, market_cf - 5 * 10 ** 16, {"from": comptroller_admin})
+
+    # a withdrawal sizes its deleverage with the new factor, without waiting for a tend
+    vault.withdraw(vault.balanceOf(user) // 2, {"from": user})
+    assert strategy.targetCollateralFactor() == market_cf - 15 * 10 ** 16
+
+
+def test_large_withdrawal_single_tx(
+        token, vault, cBorrowed, strategy, user, strategist, amount, check_gas, RELATIVE_APPROX
+):
+    user_balance_before = token.balanceOf(user)
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+    assert cBorrowed.borrowBalanceStored(strategy) > 0
+
+    # 90% of the position is unwound by one planned deleverage, no follow-up harvest needed
+    tx = vault.withdraw(int(vault.balanceOf(user) * 0.9), {"from": user})
+    gas = {"withdraw": tx.gas_used}
+    assert (
+            pytest.approx(token.balanceOf(user), rel=RELATIVE_APPROX)
+            == user_balance_before - amount + int(amount * 0.9)
+    )
+
+    tx = vault.withdraw({"from": user})
+    gas["withdrawAll"] = tx.gas_used
+    assert pytest.approx(token.balanceOf(user), rel=RELATIVE_APPROX) == user_balance_before
+    assert cBorrowed.borrowBalanceStored(strategy) == 0
+
+    check_gas("large-withdrawal", gas)
+
+
 def test_borrow_limit(
         token, vault, cBorrowed, strategy, user, strategist, amount, RELATIVE_APPROX
 ):
@@ -336,3 +401,65 @@ def test_triggers(
 
     assert strategy.harvestTrigger(0) == False
     assert strategy.tendTrigger(0) == False
+
+
+def test_tend_trigger_call_cost(
+        token, vault, strategy, amount, user, strategist, cSupplied, inverseGov, cSupply_amount
+):
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+    assert strategy.tendTrigger(0) == False
+
+    # injected collateral drops the CF well below the band
+    cSupplied.approve(strategy, 2 ** 256 - 1, {"from": inverseGov})
+    strategy.setCSupplied(cSupplied, {"from": inverseGov})
+    strategy.supplyCollateral(cSupply_amount, {"from": inverseGov})
+    assert strategy.tendTrigger(0) == True
+
+    # a call that costs more than re-levering is worth is skipped
+    assert strategy.tendTrigger(10_000 * 10 ** 18) == False
+
+
+def test_tend_trigger_small_drift(protocol, token, vault, strategy, amount, user, strategist):
+    if not protocol:
+        pytest.skip("moves the ETH price, which only the mock oracle allows")
+
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+
+    # ETH 5% down leaves the CF just under the band, re-levering would earn the yield spread on a small amount
+    eth_price = protocol.oracle.getUnderlyingPrice(protocol.cBorrowed)
+    set_borrowed_price(protocol, eth_price * 95 // 100, user)
+    assert strategy.tendTrigger(0) == True
+
+    # a tend at 1M gas and 50 gwei earns less than it costs
+    assert strategy.tendTrigger(1_000_000 * 50 * 10 ** 9) == False
+
+
+def test_tend_trigger_under_levered_call_cost(protocol, token, vault, strategy, amount, user, strategist, chain):
+    if not protocol:
+        pytest.skip("moves the ETH price and the delegated share price, which only the mocks allow")
+
+    token.approve(vault.address, amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+
+    # the delegated vault reports a gain, the next harvest measures its yield into the checkpoint
+    chain.sleep(3600 * 6)
+    gain = protocol.weth.balanceOf(protocol.delegatedVault) // 100
+    protocol.weth.deposit({"from": user, "value": gain})
+    protocol.weth.transfer(protocol.delegatedVault, gain, {"from": user})
+    strategy.harvest({"from": strategist})
+
+    # ETH 5% down leaves the position under-levered while the share price hasn't moved since the checkpoint,
+    # re-levering is still priced at the measured yield and a call that costs something goes through
+    eth_price = protocol.oracle.getUnderlyingPrice(protocol.cBorrowed)
+    set_borrowed_price(protocol, eth_price * 95 // 100, user)
+    assert strategy.ethToWant(10 ** 9) > 0
+    assert strategy.tendTrigger(10 ** 9) == True
+    assert strategy.tendTrigger(10_000 * 10 ** 18) == False
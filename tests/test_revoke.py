@@ -77,3 +77,33 @@ def test_emergency_exit(
 
     util.stateOfVault(vault, strategy, token)
 
+
+def test_emergency_exit_flash_unwind(
+        token, vault, strategy, user, strategist, gov, amount, cWant, cBorrowed, weth, weth_whale,
+        MockFlashLender, chain
+):
+    # Deposit to the vault
+    token.approve(vault.address, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    strategy.setBorrowLimit(1000 * 1e18)
+    strategy.harvest()
+    assert cBorrowed.borrowBalanceStored(strategy) > 0
+
+    chain.sleep(3600 * 6)  # 6 hrs for pps to recover
+    chain.mine(1)
+
+    # 9 bps fee, funded with enough weth to cover the whole borrow
+    lender = MockFlashLender.deploy(9, {"from": gov})
+    weth.transfer(lender, 2 * cBorrowed.borrowBalanceStored(strategy), {"from": weth_whale})
+    strategy.setFlashLender(lender, {"from": gov})
+
+    strategy.setEmergencyExit({"from": strategist})
+    tx = strategy.harvest({"from": strategist})
+    print(f"flash unwind gas: {tx.gas_used}")
+    util.stateOfStrat(strategy, token)
+
+    # fully unwound in one transaction
+    assert cBorrowed.borrowBalanceStored(strategy) == 0
+    assert cWant.balanceOf(strategy) == 0
+    assert strategy.estimatedTotalAssets() == 0
+    assert pytest.approx(token.balanceOf(vault), rel=1e-2) == amount
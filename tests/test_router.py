@@ -18,7 +18,8 @@ def test_router_change(
         amount,
         RELATIVE_APPROX,
         chain,
-        gov
+        gov,
+        new_router,
 ):
     # Deposit to the vault
     token.approve(vault.address, amount, {"from": user})
@@ -39,7 +40,7 @@ def test_router_change(
     chain.mine(1)
 
     # change router to sushiswap
-    strategy.setRouter("0xd9e1cE17f2641f24aE83637ab66a2cca9C378B9F", {'from': gov})
+    strategy.setRouter(new_router, {'from': gov})
 
     strategy.harvest()
     weth.transfer(delegatedVault, Wei("20_000 ether"), {"from": weth_whale})  # simulate delegated vault interest
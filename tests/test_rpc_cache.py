@@ -0,0 +1,62 @@
+import json
+import threading
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scripts.rpc_cache import RpcCache
+
+
+def _serve(server):
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+
+def _post(url, payload):
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def test_rpc_cache_replays_pinned_reads(tmp_path):
+    upstream_calls = []
+
+    class Upstream(BaseHTTPRequestHandler):
+        def do_POST(self):
+            payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            upstream_calls.append(payload["method"])
+            body = json.dumps({"jsonrpc": "2.0", "id": payload["id"], "result": "0x2a"}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    upstream = ThreadingHTTPServer(("127.0.0.1", 0), Upstream)
+    cache = RpcCache(_serve(upstream), 100, tmp_path)
+    proxy = cache.serve(0)
+    url = _serve(proxy)
+
+    pinned = {"jsonrpc": "2.0", "id": 1, "method": "eth_getStorageAt", "params": ["0xabc", "0x0", "0x64"]}
+    assert _post(url, pinned)["result"] == "0x2a"
+    assert _post(url, pinned)["result"] == "0x2a"
+    assert _post(url, [pinned]) == [{"jsonrpc": "2.0", "id": 1, "result": "0x2a"}]
+    assert upstream_calls == ["eth_getStorageAt"]
+    assert (cache.hits, cache.misses) == (2, 1)
+
+    # latest and blocks past the pin can still change, they always go upstream
+    for tag in ("latest", "0x65"):
+        _post(url, {**pinned, "params": ["0xabc", "0x0", tag]})
+    _post(url, {"jsonrpc": "2.0", "id": 2, "method": "eth_blockNumber", "params": []})
+    assert len(upstream_calls) == 4
+
+    proxy.shutdown()
+    upstream.shutdown()
+
+    # a later run replays from disk without the upstream
+    offline = RpcCache(None, 100, tmp_path)
+    assert offline.request(pinned)["result"] == "0x2a"
+    assert "error" in offline.request({**pinned, "params": ["0xabc", "0x1", "0x64"]})
+    # and another pinned block starts empty
+    assert "error" in RpcCache(None, 99, tmp_path).request({**pinned, "params": ["0xabc", "0x0", "0x63"]})
@@ -0,0 +1,53 @@
+from scripts.state_reader import StateReader
+
+
+def test_state_reader(
+        token, vault, strategy, strategist, gov, user, amount, multicall, clone_strategy
+):
+    clones = []
+    for _ in range(2):
+        clone = clone_strategy()
+        vault.addStrategy(clone, 0, 0, 2 ** 256 - 1, 1_000, {"from": gov})
+        clones.append(clone)
+
+    strategy.setBorrowLimit(1000 * 10 ** 18, {"from": strategist})
+    token.approve(vault, amount, {"from": user})
+    vault.deposit(amount, {"from": user})
+    strategy.harvest({"from": strategist})
+
+    strategies = [strategy] + clones
+    reader = StateReader(multicall, strategies)
+    assert reader.vaults == [vault.address] * 3
+    assert reader.wants == [token.address] * 3
+
+    call_cost = 10 ** 15
+    states = reader.read(call_cost)
+    # a failed sub-call comes back as None, name it rather than failing on the comparisons below
+    failed = [
+        f"{state.address}.{field}" for state in states
+        for field in ("params", "position", "tend_trigger", "harvest_trigger") if getattr(state, field) is None
+    ]
+    assert not failed, f"sub-calls failed: {', '.join(failed)}"
+    vault_state = states[0].vault
+    assert vault_state.total_assets == vault.totalAssets()
+    assert vault_state.total_debt == vault.totalDebt()
+    assert vault_state.loose_balance == token.balanceOf(vault)
+    assert vault_state.price_per_share == vault.pricePerShare()
+
+    # one round trip gives what the getters give one by one
+    for state, s in zip(states, strategies):
+        assert state.address == s.address
+        assert state.vault == vault_state
+        assert tuple(state.params.__dict__.values()) == tuple(vault.strategies(s))
+        assert tuple(state.position.__dict__.values()) == tuple(s.positionSnapshot())
+        assert state.tend_trigger == s.tendTrigger(call_cost)
+        assert state.harvest_trigger == s.harvestTrigger(call_cost)
+    assert states[0].position.estimated_total_assets > 0
+    assert states[1].position.estimated_total_assets == 0
+
+    # a target that doesn't answer leaves the record empty instead of failing the batch
+    broken = StateReader(multicall, [strategy])
+    broken.strategies = [token.address]
+    state = broken.read()[0]
+    assert state.position is None
+    assert state.tend_trigger is None
@@ -1,31 +1,30 @@
-
-
 def stateOfStrat(strategy, token):
+    snapshot = strategy.positionSnapshot()
     print('\n-----State of Strat-----')
-    print('targetCF : ', strategy.targetCollateralFactor()/1e18)
-    print('balanceOfWant : ', strategy.balanceOfWant())
-    print('balanceOfReward: ', strategy.balanceOfReward())
-    print('balanceOfEth: ', strategy.balanceOfEth())
-    print('valueOfCWant: ', strategy.valueOfCWant()/1e18)
-    print('valueOfCSupplied (usd): ', strategy.valueOfCSupplied()/1e18)
-    print('valueOfxInv (usd): ', strategy.valueOfxInv()/1e18)
-    print('valueOfTotalCollateral (usd): ', strategy.valueOfTotalCollateral()/1e18)
-    print('valueOfBorrowedOwed (usd): ', strategy.valueOfBorrowedOwed()/1e18)
-    print('valueOfDelegated (usd): ', strategy.valueOfDelegated()/1e18)
-    print('estimatedTotalAssets (want): ', strategy.estimatedTotalAssets()/10**token.decimals())
-    print('delegatedAssets (want): ', strategy.delegatedAssets()/10**token.decimals())
+    print('targetCF : ', snapshot['targetCollateralFactor']/1e18)
+    print('balanceOfWant : ', snapshot['balanceOfWant'])
+    print('balanceOfReward: ', snapshot['balanceOfReward'])
+    print('balanceOfEth: ', snapshot['balanceOfEth'])
+    print('valueOfCWant: ', snapshot['valueOfCWant']/1e18)
+    print('valueOfCSupplied (usd): ', snapshot['valueOfCSupplied']/1e18)
+    print('valueOfxInv (usd): ', snapshot['valueOfxInv']/1e18)
+    print('valueOfTotalCollateral (usd): ', snapshot['valueOfTotalCollateral']/1e18)
+    print('valueOfBorrowedOwed (usd): ', snapshot['valueOfBorrowedOwed']/1e18)
+    print('valueOfDelegated (usd): ', snapshot['valueOfDelegated']/1e18)
+    print('estimatedTotalAssets (want): ', snapshot['estimatedTotalAssets']/10**token.decimals())
+    print('delegatedAssets (want): ', snapshot['delegatedAssets']/10**token.decimals())
     print('\n')
 
 def stateOfVault(vault, strategy, token):
-    vaultAssets = vault.totalAssets()/1e18
-    vaultDebt = vault.totalDebt()/1e18
-    vaultLoose = token.balanceOf(vault)/1e18
-    vaultPps = vault.pricePerShare()/1e18
+    snapshot = strategy.positionSnapshot()
+    vaultAssets = snapshot['vaultTotalAssets']/1e18
+    vaultLoose = snapshot['vaultLooseBalance']/1e18
+    vaultDebt = vaultAssets - vaultLoose
+    vaultPps = snapshot['vaultPricePerShare']/1e18
 
-    strState = vault.strategies(strategy)
-    stratDebt = strState[6]/1e18
-    stratReturns = strState[7]/1e18
-    stratLosses = strState[8]/1e18
+    stratDebt = snapshot['strategyTotalDebt']/1e18
+    stratReturns = snapshot['strategyTotalGain']/1e18
+    stratLosses = snapshot['strategyTotalLoss']/1e18
 
     print('\n-----State of Vault-----')
     print(f"Vault assets: {vaultAssets:.5f}")
@@ -35,4 +34,4 @@ def stateOfVault(vault, strategy, token):
     print(f"Strategy Debt: {stratDebt:.5f}")
     print(f"Strategy Returns: {stratReturns:.5f}")
     print(f"Strategy Losses: {stratLosses:.5f}")
-    print('\n')
\ No newline at end of file
+    print('\n')